@@ -1,34 +1,102 @@
+from startup import startup_timer  # first, so import time is measured
 import os
 import json
+import time
+import threading
+import click
+from datetime import datetime
 from flask import (
-    Flask, render_template, request, redirect, url_for, session, flash, g,
-    send_from_directory
+    Flask, Blueprint, current_app, render_template, request, redirect, url_for, session, flash,
+    jsonify, make_response, abort, Response,
+    stream_with_context
+)
+from models import (
+    db, row_counts, bootstrap_schema, tag_slug, project_tags,
+    Project, Tag, Certificate, Skill, SvgIcon, Todo, TodoDailyStat, Job, Resume
 )
-from models import db, Project, Certificate, Skill, Todo # --- IMPORT TODO ---
 import config
+from cache import page_cache, cached_page
+from fragments import fragment_cache
+from svg_sprite import skill_sprite
+from media import media_store, parse_variants, VARIANT_FORMATS
+from assets import assets
+from engine import configure_engine, pool_stats
+from metrics import request_metrics
+from jobs import job_queue
+from events import todo_events
+from resume import resumes, BUNDLED_RESUME
+from roadmap import velocity_stats, format_duration, STATS_WINDOWS
+from search import search, matching_ids, rebuild_search_index, PUBLIC_KINDS
+from query_plans import hot_query, check_query_plans
 from functools import wraps
-from sqlalchemy import or_ # --- IMPORT OR_ ---
+from sqlalchemy import or_, select, tuple_, union_all # --- IMPORT OR_ ---
+from sqlalchemy.exc import IntegrityError, OperationalError, SQLAlchemyError
+from sqlalchemy.orm import load_only, aliased
+from werkzeug.utils import secure_filename
 
-# --- App Initialization ---
-app = Flask(__name__)
-app.config.from_object(config)
+startup_timer.mark('imports')
 
-try:
-    os.makedirs(app.instance_path)
-except OSError:
-    pass
+# --- CREATE TABLES ONCE PER WORKER ---
+# The schema is checked (and upgraded if needed) once per process. After that
+# requests only look at an in-memory flag instead of reflecting the database.
+_schema_lock = threading.Lock()
+_schema_state = {'version': None}
 
-db.init_app(app)
+def ensure_schema():
+    with _schema_lock:
+        if _schema_state['version'] is None:
+            print("--- ENSURING DATABASE TABLES EXIST ---")
+            _schema_state['version'] = bootstrap_schema()
+            print(f"--- DATABASE SCHEMA READY (v{_schema_state['version']}) ---")
+    return _schema_state['version']
 
-# --- CREATE TABLES ON STARTUP ---
-@app.before_request
 def create_tables():
-    if not getattr(g, 'db_initialized', False):
-        with app.app_context():
-            print("--- ENSURING DATABASE TABLES EXIST ---")
-            db.create_all() 
-            print("--- DATABASE TABLES CHECKED ---")
-        g.db_initialized = True
+    if _schema_state['version'] is None:
+        ensure_schema()
+
+# --- App Setup ---
+# Every route, CLI command and template helper below is registered on the
+# `site` blueprint; create_app() builds an app, binds the extensions to it
+# and registers the blueprint. The module-level `app`, built after the
+# routes, is the one gunicorn and `flask --app app` use. Admin-only and seed
+# modules (data_io, seed, freeze, fonts, Pillow) are imported where used.
+bp = Blueprint('site', __name__, cli_group=None)
+
+def create_app(config_object=config):
+    app = Flask(__name__)
+    app.config.from_object(config_object)
+    os.makedirs(app.instance_path, exist_ok=True)
+
+    configure_engine(app)
+    db.init_app(app)
+    pool_stats.init_app(app, db)
+    request_metrics.init_app(app, pool_stats.engine, pool_stats)
+    startup_timer.init_app(app, request_metrics)
+    page_cache.init_app(app)
+    fragment_cache.init_app(app)
+    row_counts.init_app(app)
+    skill_sprite.init_app(app)
+    media_store.init_app(app)
+    resumes.init_app(app)
+    assets.init_app(app)
+    app.before_request(create_tables)
+    # Registered after create_tables so the job table exists before workers poll
+    job_queue.init_app(app)
+    todo_events.init_app(app)
+    app.register_blueprint(bp)
+    return app
+
+def _after_fork():
+    # Runs in each worker forked from a preloaded master (gunicorn --preload)
+    pool_stats.after_fork()
+    request_metrics.reset()
+    job_queue.after_fork()
+    startup_timer.after_fork()
+
+os.register_at_fork(after_in_child=_after_fork)
+
+# Number of completed tasks shown on the dashboard before "load more"
+RECENT_DONE = 10
 
 # --- Admin Authentication Helper ---
 def login_required(f):
@@ -36,16 +104,17 @@ def login_required(f):
     def decorated_function(*args, **kwargs):
         if 'logged_in' not in session:
             flash('Please log in to access this page.', 'danger')
-            return redirect(url_for('admin_login'))
+            return redirect(url_for('site.admin_login'))
         return f(*args, **kwargs)
     return decorated_function
 
 # --- Context Processors ---
-@app.context_processor
+@bp.app_context_processor
 def inject_global_vars():
     try:
-        project_count = db.session.query(Project).count()
-        skill_count = db.session.query(Skill).count() 
+        counts = row_counts.get()
+        project_count = counts['Project']
+        skill_count = counts['Skill']
     except Exception as e:
         project_count = 0
         skill_count = 0
@@ -55,112 +124,190 @@ def inject_global_vars():
         skill_count=skill_count
     )
     
-# ---  DATABASE INIT FUNCTION ---
-def initialize_database():
-    try:
-        print("Dropping all tables...")
-        db.drop_all()
-        print("Creating all tables...")
-        db.create_all()
+def _content_changed():
+    # Bulk writes skip ORM events, so drop every derived cache by hand
+    page_cache.clear()
+    skill_sprite.invalidate()
+    row_counts.invalidate()
+    job_queue.enqueue('warm_cache', delay=WARM_DELAY_SECONDS)
 
-        # --- Seed Projects ---
-        PROJECTS_JSON_PATH = os.path.join(app.root_path, 'data', 'projects.json')
-        try:
-            with open(PROJECTS_JSON_PATH, 'r') as f:
-                projects_seed = json.load(f)
-            print(f"Seeding {len(projects_seed)} projects...")
-            for p in projects_seed:
-                new_project = Project(title=p.get('title'), role=p.get('role'), tech=p.get('tech'), description=p.get('description'), image=p.get('image'))
-                db.session.add(new_project)
-        except Exception as e:
-            print(f"Could not seed projects: {e}")
+def _content_written():
+    # Drop cached pages now; rebuilding them happens off the request
+    page_cache.clear()
+    job_queue.enqueue('warm_cache', delay=WARM_DELAY_SECONDS)
 
-        # --- Seed Skills ---
-        SKILLS_JSON_PATH = os.path.join(app.root_path, 'data', 'skills.json')
-        try:
-            with open(SKILLS_JSON_PATH, 'r') as f:
-                skills_seed = json.load(f)
-            print(f"Seeding skills...")
-            for category in skills_seed:
-                cat_name = category.get('category')
-                for skill in category.get('skills', []):
-                    new_skill = Skill(category=cat_name, name=skill.get('name'), svg=skill.get('svg'))
-                    db.session.add(new_skill)
-        except Exception as e:
-            print(f"Could not seed skills: {e}")
-            
-        # --- Seed Default Tasks ---
-        DEFAULT_TASKS = [
-            {"task": "Review and update all project descriptions in the portfolio admin panel.", "category": "Portfolio"},
-            {"task": "Start research for a new 'Deep Learning' project (e.g., StyleGAN or NLP Transformer).", "category": "Project"},
-            {"task": "Learn one new MLOps concept (e.g., Kubeflow, MLflow).", "category": "Learning"},
-            {"task": "Update 'About Me' page and check all links.", "category": "Portfolio"},
-            {"task": "Write 500 words for a blog post about the 'Brain Tumor AI' project.", "category": "Project"},
-            {"task": "Learn one new Data Engineering concept (e.g., dbt models, Airflow DAGs).", "category": "Learning"},
-            {"task": "Add 2-3 new 'Beginner' projects to the portfolio.", "category": "Portfolio"},
-            {"task": "Complete a tutorial on 'Microsoft Fabric'.", "category": "Learning"},
-            {"task": "Refine the styling on the portfolio's 'Skills' page.", "category": "Portfolio"},
-            {"task": "Begin coding the new 'Deep Learning' project.", "category": "Project"},
-            {"task": "Learn advanced 'XAI' (Explainable AI) techniques (LIME/SHAP).", "category": "Learning"},
-            {"task": "Add a new 'Certificate' to the admin panel.", "category": "Portfolio"},
-            {"task": "Refactor the 'Emotion Detection' project's code for clarity.", "category": "Project"},
-            {"task": "Find and add 3 new 'Data Analyst' projects.", "category": "Portfolio"},
-            {"task": "Study one new cloud service on AWS (e.g., SageMaker).", "category": "Learning"},
-            {"task": "Halfway check: Review all portfolio text for typos.", "category": "Portfolio"},
-            {"task": "Implement a new feature on the 'AI Resume Analyzer' project.", "category": "Project"},
-            {"task": "Learn one new 'Generative AI' concept (e.g., Diffusion models).", "category": "Learning"},
-            {"task": "Add 2 new skills (with SVGs) to the admin panel.", "category": "Portfolio"},
-            {"task": "Finalize and deploy the 'Deep Learning' project.", "category": "Project"},
-            {"task": "Write the 'Project Detail' page for the new project.", "category": "Portfolio"},
-            {"task": "Learn a new Python library (e.g., 'Polars' for dataframes).", "category": "Learning"},
-            {"task": "Start research for the *next* new project (e.g., a 'Data Engineering' pipeline).", "category": "Project"},
-            {"task": "Add a 'To-Do' list feature to the portfolio admin panel.", "category": "Portfolio"},
-            {"task": "Learn Docker and containerize one of your Flask projects.", "category": "Learning"},
-            {"task": "Begin coding the new 'Data Engineering' pipeline project.", "category": "Project"},
-            {"task": "Learn how to write unit tests for a Flask app (pytest).", "category": "Learning"},
-            {"task": "Update the 'Download Resume' PDF to the latest version.", "category": "Portfolio"},
-            {"task": "Complete and deploy the 'Data Engineering' project.", "category": "Project"},
-            {"task": "Plan the next 30 days of tasks.", "category": "Planning"}
-        ]
-        try:
-            print(f"Seeding {len(DEFAULT_TASKS)} default tasks...")
-            for i, task_data in enumerate(DEFAULT_TASKS):
-                new_task = Todo(
-                    task=task_data.get('task'),
-                    category=task_data.get('category'),
-                    status="Active" if i == 0 else "Pending" 
-                )
-                db.session.add(new_task)
-        except Exception as e:
-            print(f"Could not seed default tasks: {e}")
-        
-        db.session.commit()
-        print("Database has been initialized and seeded successfully!")
+# ---  DATABASE INIT FUNCTION ---
+def initialize_database(reset=False):
+    from seed import seed_database
+    try:
+        stats = seed_database(current_app.root_path, reset)
+        _content_changed()
+        print(f"Database has been initialized and seeded successfully! {stats}")
         return True
     except Exception as e:
         print(f"An error occurred during DB initialization: {e}")
         db.session.rollback()
         return False
 
+# --- BACKGROUND JOBS ---
+# Public pages rebuilt by warm_cache after admin writes. The short delay
+# folds a burst of edits into one rebuild.
+WARM_ENDPOINTS = ('site.index', 'site.about', 'site.projects', 'site.skills',
+                  'site.certificates', 'site.contact')
+WARM_DELAY_SECONDS = 2
+
+@job_queue.task('reseed')
+def _reseed_job(job):
+    job.progress(5, 'Seeding projects, skills and tasks')
+    if not initialize_database():
+        raise RuntimeError('Database initialization failed. Check logs.')
+
+def _warm_pages(progress=None):
+    # Renders through the page cache of the calling process
+    with current_app.test_request_context():
+        urls = [url_for(endpoint) for endpoint in WARM_ENDPOINTS]
+    client = current_app.test_client()
+    for i, url in enumerate(urls):
+        if progress:
+            progress(i * 100 // len(urls), f'Rendering {url}')
+        status = client.get(url).status_code
+        if status >= 500:
+            raise RuntimeError(f'{url} returned {status}')
+
+@job_queue.task('warm_cache')
+def _warm_cache_job(job):
+    # Other gunicorn workers refill their caches on their next request
+    _warm_pages(job.progress)
+
 
 # --- PUBLIC ROUTES ---
 
-@app.route('/')
+@bp.route('/')
+@cached_page
 def index():
     return render_template('index.html')
 
-@app.route('/about')
+@bp.route('/about')
+@cached_page
 def about():
     return render_template('about.html')
 
-@app.route('/projects')
+# --- Keyset Pagination ---
+# Listings are ordered newest-first by id and paged with `?after=<last id>`,
+# so every page is an index range scan no matter how deep the reader scrolls.
+def _keyset_page(query, model):
+    size = current_app.config['LISTING_PAGE_SIZE']
+    after = request.args.get('after', type=int)
+    if after:
+        query = query.filter(model.id < after)
+    rows = query.order_by(model.id.desc()).limit(size + 1).all()
+    next_cursor = rows[size - 1].id if len(rows) > size else None
+    return rows[:size], next_cursor
+
+def _next_page_links(page_endpoint, api_endpoint, cursor):
+    if cursor is None:
+        return {'next_url': None, 'next_api': None, 'link': None}
+    args = {k: v for k, v in request.args.items() if k not in ('after', 'fragment')}
+    link_args = dict(request.args.items(), after=cursor)
+    return {
+        'next_url': url_for(page_endpoint, **args, after=cursor),
+        'next_api': url_for(api_endpoint, **args, after=cursor, fragment=1),
+        'link': f'<{url_for(request.endpoint, **link_args)}>; rel="next"',
+    }
+
+def _with_next_link(response, links):
+    response = make_response(response)
+    if links['link']:
+        response.headers['Link'] = links['link']
+    return response
+
+# --- Project Filtering ---
+def _project_filters():
+    tech = tag_slug(request.args.get('tech', ''))
+    role = request.args.get('role', '').strip()
+    return {
+        'tech': '' if tech == 'all' else tech,
+        'role': '' if role == 'All' else role,
+        'q': request.args.get('q', '').strip(),
+    }
+
+def _filter_projects(query, filters, skip=None):
+    # `skip` leaves one dimension out so its facet counts reflect the others
+    if filters['tech'] and skip != 'tech':
+        query = query.filter(Project.tags.any(Tag.slug == filters['tech']))
+    if filters['role'] and skip != 'role':
+        query = query.filter(Project.role == filters['role'])
+    matches = matching_ids('project', filters['q'])
+    if matches is not None:
+        query = query.filter(Project.id.in_(matches))
+    return query
+
+def _project_facets(filters):
+    tech_ids = _filter_projects(db.session.query(Project.id), filters, skip='tech')
+    tag_count = db.func.count(project_tags.c.project_id)
+    tech_rows = (
+        db.session.query(Tag.name, Tag.slug, tag_count)
+        .join(project_tags, project_tags.c.tag_id == Tag.id)
+        .filter(project_tags.c.project_id.in_(tech_ids))
+        .group_by(Tag.id, Tag.name, Tag.slug)
+        .order_by(tag_count.desc(), Tag.name)
+        .all()
+    )
+    role_rows = (
+        _filter_projects(db.session.query(Project.role, db.func.count(Project.id)), filters, skip='role')
+        .group_by(Project.role)
+        .order_by(Project.role)
+        .all()
+    )
+    return {
+        'tech': [{'name': name, 'slug': slug, 'count': count} for name, slug, count in tech_rows],
+        'role': [{'name': role, 'count': count} for role, count in role_rows],
+    }
+
+@bp.route('/projects')
+@cached_page
 def projects():
-    all_projects = Project.query.order_by(Project.id.desc()).all()
-    return render_template('projects.html', projects=all_projects)
+    filters = _project_filters()
+    page, cursor = _keyset_page(_filter_projects(Project.query, filters), Project)
+    links = _next_page_links('site.projects', 'site.api_projects', cursor)
+    return _with_next_link(render_template(
+        'projects.html',
+        projects=page,
+        filters=filters,
+        facets=_project_facets(filters),
+        is_filtered=any(filters.values()),
+        next_url=links['next_url'],
+        next_api=links['next_api']
+    ), links)
 
-@app.route('/skills')
+@bp.route('/api/projects')
+@cached_page
+def api_projects():
+    filters = _project_filters()
+    matching = _filter_projects(Project.query, filters)
+    page, cursor = _keyset_page(matching, Project)
+    links = _next_page_links('site.projects', 'site.api_projects', cursor)
+    payload = {
+        'total': matching.count(),
+        'filters': filters,
+        'facets': _project_facets(filters),
+        'projects': [p.to_dict() for p in page],
+        'next': cursor,
+        'next_url': links['next_url'],
+        'next_api': links['next_api'],
+    }
+    # The projects page asks for pre-rendered cards so it can swap them in
+    if request.args.get('fragment'):
+        payload['html'] = render_template(
+            '_project_cards.html', projects=page, is_filtered=any(filters.values())
+        )
+    return _with_next_link(jsonify(payload), links)
+
+@bp.route('/skills')
+@cached_page
 def skills():
-    skills_data_from_db = Skill.query.all()
+    # Only the columns the page needs; icons come from the shared sprite
+    skills_data_from_db = db.session.query(Skill.category, Skill.name, Skill.icon_id).order_by(Skill.id).all()
     
     skills_data = {}
     for skill in skills_data_from_db:
@@ -168,7 +315,7 @@ def skills():
             skills_data[skill.category] = []
         skills_data[skill.category].append({
             "name": skill.name,
-            "svg": skill.svg
+            "icon_id": skill.icon_id
         })
     
     skills_list = []
@@ -178,135 +325,587 @@ def skills():
             "skills": skills_list_items
         })
         
-    return render_template('skills.html', skills_data=skills_list)
+    return render_template('skills.html', skills_data=skills_list, sprite_url=_skill_sprite_url())
+
+# --- Skill Icon Sprite ---
+def _load_skill_icons():
+    used = db.session.query(Skill.icon_id).filter(Skill.icon_id.isnot(None))
+    return db.session.query(SvgIcon.id, SvgIcon.symbol).filter(SvgIcon.id.in_(used)).order_by(SvgIcon.id).all()
 
-@app.route('/certificates')
+def _skill_sprite_url():
+    fingerprint, _ = skill_sprite.get(_load_skill_icons)
+    return url_for('site.skill_sprite_sheet', fingerprint=fingerprint)
+
+@bp.route('/sprites/skills.<fingerprint>.svg')
+def skill_sprite_sheet(fingerprint):
+    current, body = skill_sprite.get(_load_skill_icons)
+    response = make_response(body)
+    response.mimetype = 'image/svg+xml'
+    response.set_etag(current)
+    if fingerprint == current:
+        # The URL changes whenever the content does, so it can be cached forever
+        response.headers['Cache-Control'] = 'public, max-age=31536000, immutable'
+    else:
+        # A stale page asked for an old sprite; serve the latest briefly
+        response.headers['Cache-Control'] = 'public, max-age=60'
+    return response.make_conditional(request)
+
+# --- FINGERPRINTED STATIC ASSETS ---
+@bp.route('/static/dist/<path:filename>')
+def dist_asset(filename):
+    return assets.send(filename)
+
+@bp.route('/certificates')
+@cached_page
 def certificates():
-    all_certificates = Certificate.query.order_by(Certificate.id.desc()).all()
-    return render_template('certificates.html', certificates=all_certificates)
+    page, cursor = _keyset_page(Certificate.query, Certificate)
+    links = _next_page_links('site.certificates', 'site.api_certificates', cursor)
+    return _with_next_link(render_template(
+        'certificates.html',
+        certificates=page,
+        next_url=links['next_url'],
+        next_api=links['next_api']
+    ), links)
+
+@bp.route('/api/certificates')
+@cached_page
+def api_certificates():
+    page, cursor = _keyset_page(Certificate.query, Certificate)
+    links = _next_page_links('site.certificates', 'site.api_certificates', cursor)
+    payload = {
+        'certificates': [
+            {'id': c.id, 'title': c.title, 'provider': c.provider, 'icon': c.icon} for c in page
+        ],
+        'next': cursor,
+        'next_url': links['next_url'],
+        'next_api': links['next_api'],
+    }
+    if request.args.get('fragment'):
+        payload['html'] = render_template('_certificate_cards.html', certificates=page)
+    return _with_next_link(jsonify(payload), links)
 
-@app.route('/contact')
+@bp.route('/contact')
+@cached_page
 def contact():
     return render_template('contact.html')
 
-@app.route('/download-resume')
+# --- RESUME ---
+# /download-resume is the link that gets shared; it redirects to the current
+# version's /resume/<hash>.pdf (see resume.py). Neither touches the database.
+@bp.route('/download-resume')
 def download_resume():
-    try:
-        return send_from_directory(
-            app.config['DATA_DIR'],
-            'RayyanKauchali_Resume-1.pdf',
-            as_attachment=True
-        )
-    except FileNotFoundError:
+    current = resumes.current()
+    if current is None:
         flash("Resume file not found on server.", "danger")
-        return redirect(request.referrer or url_for('index'))
+        return redirect(request.referrer or url_for('site.index'))
+    response = redirect(url_for('site.resume_file', name=current[0]))
+    # Short-lived, so a new upload reaches shared links within a minute
+    response.headers['Cache-Control'] = 'public, max-age=60'
+    return response
+
+@bp.route('/resume/<name>')
+def resume_file(name):
+    download_name = resumes.download_name(name)
+    if download_name is None or not os.path.exists(os.path.join(media_store.documents_dir, name)):
+        abort(404)
+    return media_store.send(media_store.documents_dir, name, download_name=download_name)
+
+# --- SEARCH ---
+# /search renders results server-side; as you type, the page streams them
+# from /api/search (one JSON object per line) and renders each as it lands.
+SEARCH_LIMIT = 20
+
+def _search_kinds():
+    return PUBLIC_KINDS + ('todo',) if session.get('logged_in') else PUBLIC_KINDS
+
+def _search_result_url(hit):
+    if hit['kind'] == 'project':
+        return url_for('site.projects', q=str(hit['title'].striptags()))
+    if hit['kind'] == 'todo':
+        return url_for('site.edit_todo', id=hit['id'])
+    return url_for('site.skills' if hit['kind'] == 'skill' else 'site.certificates')
+
+def _search_hits(query, limit):
+    for hit in search(query, _search_kinds(), limit):
+        hit['url'] = _search_result_url(hit)
+        yield hit
+
+@bp.route('/search')
+def search_page():
+    query = request.args.get('q', '').strip()
+    return render_template('search.html', query=query, results=list(_search_hits(query, SEARCH_LIMIT)))
+
+@bp.route('/api/search')
+def api_search():
+    query = request.args.get('q', '').strip()
+    limit = max(1, min(request.args.get('limit', SEARCH_LIMIT, type=int), 50))
+
+    def generate():
+        for hit in _search_hits(query, limit):
+            yield json.dumps(hit) + '\n'
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype='application/x-ndjson',
+        # Admins also see todos; let proxies pass lines through unbuffered
+        headers={'Cache-Control': 'private, no-cache', 'X-Accel-Buffering': 'no'}
+    )
 
 # --- ADMIN ROUTES ---
 
-@app.route('/admin/login', methods=['GET', 'POST'])
+@bp.route('/admin/login', methods=['GET', 'POST'])
 def admin_login():
     if request.method == 'POST':
         password = request.form.get('password')
-        if password == app.config['ADMIN_PASSWORD']:
+        if password == current_app.config['ADMIN_PASSWORD']:
             session['logged_in'] = True
             session.permanent = True
             flash('Login successful!', 'success')
-            return redirect(url_for('admin_dashboard'))
+            return redirect(url_for('site.admin_dashboard'))
         else:
             flash('Incorrect password.', 'danger')
     return render_template('admin_login.html')
 
-@app.route('/admin/logout')
+@bp.route('/admin/logout')
 def admin_logout():
     session.pop('logged_in', None)
     flash('You have been logged out.', 'info')
-    return redirect(url_for('index'))
+    return redirect(url_for('site.index'))
+
+# --- Fetch all open Todo tasks plus the latest Done ones in one query ---
+# Open tasks come off ix_todo_status_id in (status, id) order and the latest
+# RECENT_DONE off ix_todo_status_completed_at, newest first, so neither half
+# sorts or reads the rest of the Done history. UNION ALL doesn't keep the
+# subqueries' order, so rows are split by status and sorted in Python.
+OPEN_STATUSES = ('Active', 'Pending', 'Paused')
 
-@app.route('/admin')
+@hot_query('dashboard todos')
+def _dashboard_todos_query():
+    open_todos = select(Todo).where(Todo.status.in_(OPEN_STATUSES)).subquery()
+    recent_done = (
+        select(Todo).where(Todo.status == 'Done', Todo.completed_at.isnot(None))
+        .order_by(Todo.completed_at.desc(), Todo.id.desc())
+        .limit(RECENT_DONE).subquery()
+    )
+    return select(Todo).from_statement(union_all(select(open_todos), select(recent_done)))
+
+@bp.route('/admin')
 @login_required
 def admin_dashboard():
-    projects = Project.query.order_by(Project.id).all()
     certificates = Certificate.query.order_by(Certificate.id).all()
-    skills = Skill.query.order_by(Skill.category, Skill.id).all()
     
-    # --- NEW: Fetch all Todo tasks, split by status ---
-    todos_active = Todo.query.filter_by(status='Active').order_by(Todo.id.asc()).all()
-    todos_pending = Todo.query.filter_by(status='Pending').order_by(Todo.id.asc()).all()
-    todos_paused = Todo.query.filter_by(status='Paused').order_by(Todo.id.asc()).all()
-    todos_done = Todo.query.filter_by(status='Done').order_by(Todo.completed_at.desc()).limit(10).all()
+    todos = {'Active': [], 'Pending': [], 'Paused': [], 'Done': []}
+    for task in db.session.scalars(_dashboard_todos_query()):
+        todos.setdefault(task.status, []).append(task)
+    for status in OPEN_STATUSES:
+        todos[status].sort(key=lambda t: t.id)
+    todos['Done'].sort(key=lambda t: (t.completed_at, t.id), reverse=True)
+
+    done_more_url = None
+    if len(todos['Done']) == RECENT_DONE:
+        last = todos['Done'][-1]
+        done_more_url = url_for('site.admin_section', section='done', after=last.id, after_done=last.completed_at.isoformat())
+    elif _admin_undated_done_query(limit=1).first():
+        done_more_url = url_for('site.admin_section', section='done', undated=1)
 
     # Check if DB is empty to show setup link
-    db_is_empty = (len(projects) == 0 and len(skills) == 0 and len(todos_active) == 0)
+    counts = row_counts.get()
+    db_is_empty = (counts['Project'] == 0 and counts['Skill'] == 0 and len(todos['Active']) == 0)
     
     return render_template(
         'admin_dashboard.html',
-        projects=projects,
         certificates=certificates,
-        skills=skills,
-        todos_active=todos_active,
-        todos_pending=todos_pending,
-        todos_paused=todos_paused,
-        todos_done=todos_done,
-        db_is_empty=db_is_empty
+        todos_active=todos['Active'],
+        todos_pending=todos['Pending'],
+        todos_paused=todos['Paused'],
+        todos_done=todos['Done'],
+        done_more_url=done_more_url,
+        db_is_empty=db_is_empty,
+        resumes=Resume.query.order_by(Resume.uploaded_at.desc(), Resume.id.desc()).limit(10).all(),
+        todo_event_id=todo_events.latest_id()
     )
 
-@app.route('/admin/first-time-setup-run-once')
+# --- Dashboard sections loaded on demand ---
+# Projects, skills and the full Done history can be large, so the dashboard
+# only ships a placeholder and the browser fetches them a page at a time.
+def _admin_page_size():
+    return current_app.config['ADMIN_PAGE_SIZE']
+
+def _admin_projects_page():
+    query = Project.query.options(load_only(Project.id, Project.title, Project.role))
+    after = request.args.get('after', type=int)
+    if after:
+        query = query.filter(Project.id > after)
+    rows = query.order_by(Project.id).limit(_admin_page_size() + 1).all()
+    more = len(rows) > _admin_page_size()
+    rows = rows[:_admin_page_size()]
+    return rows, ({'after': rows[-1].id} if more else None)
+
+# Next pages compare (key, id) row values: planners turn those into an index
+# range seek, while the equivalent OR walks the index from the first row
+@hot_query('admin skills, next page', seek=True, after=1, after_category='Data')
+@hot_query('admin skills, first page')
+def _admin_skills_query(after=None, after_category=None):
+    # Skill bodies are never needed for the list, only name and category
+    query = Skill.query.options(load_only(Skill.id, Skill.name, Skill.category))
+    if after and after_category is not None:
+        query = query.filter(tuple_(Skill.category, Skill.id) > (after_category, after))
+    return query.order_by(Skill.category, Skill.id).limit(_admin_page_size() + 1)
+
+def _admin_skills_page():
+    rows = _admin_skills_query(request.args.get('after', type=int), request.args.get('after_category')).all()
+    more = len(rows) > _admin_page_size()
+    rows = rows[:_admin_page_size()]
+    return rows, ({'after': rows[-1].id, 'after_category': rows[-1].category} if more else None)
+
+@hot_query('admin done, next page', seek=True, after=1, after_done=datetime(2025, 1, 1))
+@hot_query('admin done, first page')
+def _admin_done_query(after=None, after_done=None):
+    query = Todo.query.filter(Todo.status == 'Done', Todo.completed_at.isnot(None))
+    if after and after_done:
+        query = query.filter(tuple_(Todo.completed_at, Todo.id) < (after_done, after))
+    return query.order_by(Todo.completed_at.desc(), Todo.id.desc()).limit(_admin_page_size() + 1)
+
+# Done tasks without a completion time (imports allow them) come after the
+# dated history, newest id first
+@hot_query('admin done, undated next page', seek=True, after=1)
+@hot_query('admin done, undated')
+def _admin_undated_done_query(after=None, limit=None):
+    query = Todo.query.filter(Todo.status == 'Done', Todo.completed_at.is_(None))
+    if after:
+        query = query.filter(Todo.id < after)
+    return query.order_by(Todo.id.desc()).limit(limit or _admin_page_size() + 1)
+
+def _admin_done_page():
+    after = request.args.get('after', type=int)
+    after_done = request.args.get('after_done')
+    try:
+        after_done = datetime.fromisoformat(after_done) if after_done else None
+    except ValueError:
+        abort(400)
+    undated = request.args.get('undated') == '1'
+    size = _admin_page_size()
+    rows = [] if undated else _admin_done_query(after, after_done).all()
+    if len(rows) <= size:
+        rows += _admin_undated_done_query(after if undated else None, size + 1 - len(rows)).all()
+    more = len(rows) > size
+    rows = rows[:size]
+    if not more:
+        return rows, None
+    last = rows[-1]
+    if last.completed_at is None:
+        return rows, {'after': last.id, 'undated': 1}
+    return rows, {'after': last.id, 'after_done': last.completed_at.isoformat()}
+
+ADMIN_SECTIONS = {
+    'projects': (_admin_projects_page, '_admin_project_rows.html'),
+    'skills': (_admin_skills_page, '_admin_skill_rows.html'),
+    'done': (_admin_done_page, '_admin_done_rows.html'),
+}
+
+@bp.route('/admin/section/<section>')
+@login_required
+def admin_section(section):
+    if section not in ADMIN_SECTIONS:
+        abort(404)
+    load_page, template = ADMIN_SECTIONS[section]
+    rows, cursor = load_page()
+    next_url = url_for('site.admin_section', section=section, **cursor) if cursor else None
+    return render_template(template, rows=rows, next_url=next_url, first_page=not request.args.get('after'))
+
+@bp.route('/admin/first-time-setup-run-once')
 @login_required
 def first_time_setup():
-    with app.app_context():
-        if initialize_database():
-            flash('SUCCESS: Database has been initialized and seeded!', 'success')
-        else:
-            flash('ERROR: Database initialization failed. Check logs.', 'danger')
-    return redirect(url_for('admin_dashboard'))
+    # Seeding runs on a job worker; the status page shows its progress
+    job = job_queue.enqueue('reseed')
+    flash('Database seeding has been queued.', 'success')
+    return redirect(url_for('site.admin_jobs', highlight=job.id))
+
+@bp.route('/admin/jobs')
+@login_required
+def admin_jobs():
+    jobs = Job.query.order_by(Job.id.desc()).limit(50).all()
+    active = any(job.status in ('queued', 'running') for job in jobs)
+    return render_template('admin_jobs.html', jobs=jobs, active=active,
+                           highlight=request.args.get('highlight', type=int))
+
+@bp.route('/admin/jobs/<int:id>')
+@login_required
+def admin_job_status(id):
+    return jsonify(Job.query.get_or_404(id).to_dict())
+
+# --- ROADMAP STATS ---
+def _stats_window():
+    days = request.args.get('days', 30, type=int)
+    return days if days in STATS_WINDOWS else 30
+
+@bp.route('/admin/roadmap/stats')
+@login_required
+def roadmap_stats():
+    stats = velocity_stats(_stats_window())
+    busiest = max((d['completed'] for d in stats['per_day']), default=0)
+    return render_template('roadmap_stats.html', stats=stats, busiest=busiest, windows=STATS_WINDOWS)
+
+@bp.route('/admin/roadmap/stats.json')
+@login_required
+def roadmap_stats_json():
+    return jsonify(velocity_stats(_stats_window()))
+
+bp.add_app_template_filter(format_duration, 'duration')
+
+# --- METRICS ---
+@bp.route('/metrics')
+def metrics():
+    token = current_app.config.get('METRICS_TOKEN')
+    authorized = session.get('logged_in') or (
+        token and request.headers.get('Authorization') == f'Bearer {token}')
+    if not authorized:
+        abort(403)
+    response = make_response(request_metrics.render())
+    response.mimetype = 'text/plain'
+    response.headers['Content-Type'] = 'text/plain; version=0.0.4; charset=utf-8'
+    response.headers['Cache-Control'] = 'no-store'
+    return response
+
+# --- DATABASE POOL STATS ---
+@bp.route('/admin/db/pool')
+@login_required
+def admin_pool_stats():
+    return jsonify(pool_stats.snapshot())
+
+# --- BULK DATA IMPORT / EXPORT ---
+@bp.route('/admin/data/export')
+@login_required
+def export_data():
+    from data_io import export_ndjson
+    return Response(
+        stream_with_context(export_ndjson()),
+        mimetype='application/x-ndjson',
+        headers={'Content-Disposition': 'attachment; filename="portfolio-data.ndjson"'}
+    )
+
+@bp.route('/admin/data/import', methods=['POST'])
+@login_required
+def import_data():
+    from data_io import import_ndjson
+    # Accepts a multipart upload ("file") or a raw NDJSON request body
+    upload = request.files.get('file')
+    stream = upload.stream if upload else request.stream
+    batch_size = request.args.get('batch_size', type=int) or current_app.config['IMPORT_BATCH_SIZE']
+    try:
+        stats = import_ndjson(stream, batch_size=batch_size)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except SQLAlchemyError as e:
+        return jsonify({'error': f"Database rejected the import: {getattr(e, 'orig', None) or e}"}), 409
+    finally:
+        _content_changed()  # earlier batches may already be committed
+    return jsonify({'imported': stats})
+
+# --- PROJECT IMAGES ---
+def _apply_image_upload(project):
+    # Returns True when a new image was stored and variants need building
+    upload = request.files.get('image_file')
+    if not upload or not upload.filename:
+        return False
+    filename, width, height = media_store.save_upload(upload)
+    if filename == project.image_file:
+        return False
+    project.image_file = filename
+    project.image_width = width
+    project.image_height = height
+    project.image_variants = None
+    return True
+
+@job_queue.task('image_variants')
+def _build_image_variants(job, project_id):
+    project = db.session.get(Project, project_id)
+    if project is None or not project.image_file:
+        return
+    filename = project.image_file
+    job.progress(10, f'Resizing {filename}')
+    variants = media_store.generate_variants(filename)
+    # Only record them if the project still uses this image
+    Project.query.filter_by(id=project_id, image_file=filename).update({'image_variants': variants})
+    db.session.commit()
+    _content_written()
+
+@bp.app_template_global()
+def project_image(project):
+    if not project.image_file:
+        return {'src': project.image, 'sources': [], 'width': None, 'height': None}
+    formats, widths = parse_variants(project.image_variants)
+    sources = []
+    for ext, _, mime, _ in VARIANT_FORMATS:
+        if ext in formats:
+            srcset = ', '.join(
+                f"{url_for('site.media_file', name=media_store.variant_name(project.image_file, w, ext))} {w}w"
+                for w in widths
+            )
+            sources.append({'type': mime, 'srcset': srcset})
+    return {
+        'src': url_for('site.media_file', name=project.image_file),
+        'sources': sources,
+        'width': project.image_width,
+        'height': project.image_height,
+    }
+
+@bp.route('/media/<name>')
+def media_file(name):
+    folder = media_store.find(name)
+    if folder is None:
+        abort(404)
+    return media_store.send(folder, name)
+
+# --- LIVE ADMIN UPDATES ---
+# Project, skill and certificate forms post in the background too (see
+# static/js/admin.js). `Accept: application/json` requests get the message
+# and the changed row, rendered with the list's own row template, plus the id
+# of the row it sits before. Plain form posts still flash and redirect.
+ADMIN_ROWS = {
+    'projects': (Project, '_admin_project_rows.html', ()),
+    'skills': (Skill, '_admin_skill_rows.html', ('category',)),
+    'certificates': (Certificate, '_admin_certificate_rows.html', ()),
+}
+
+def _admin_row(section, row):
+    model, template, keys = ADMIN_ROWS[section]
+    # Lists are ordered by (keys..., id), like their section queries
+    columns = [getattr(model, key) for key in keys] + [model.id]
+    position = tuple_(*columns) > tuple(getattr(row, c.key) for c in columns)
+    following = db.session.query(model.id).filter(position).order_by(*columns).limit(1).scalar()
+    return {'list': section, 'id': row.id, 'before': following,
+            'html': render_template(template, rows=[row])}
+
+def _admin_response(message, category, section, changes=(), status=200):
+    if _wants_json():
+        return jsonify({'message': message, 'category': category, 'changes': list(changes)}), status
+    flash(message, category)
+    return redirect(url_for('site.admin_dashboard') + '#' + section)
 
 # --- ADD ITEMS ---
-@app.route('/admin/add/project', methods=['POST'])
+@bp.route('/admin/add/project', methods=['POST'])
 @login_required
 def add_project():
-    # ... (existing code, no changes)
     try:
-        new_project = Project(title=request.form.get('title'), role=request.form.get('role'), tech=request.form.get('tech'), description=request.form.get('description'), image=request.form.get('image'))
+        new_project = Project(title=request.form.get('title'), role=request.form.get('role'), description=request.form.get('description'), image=request.form.get('image'))
+        uploaded = _apply_image_upload(new_project)
         db.session.add(new_project)
+        new_project.set_tech(request.form.get('tech'))
         db.session.commit()
-        flash('Project added successfully!', 'success')
+        _content_written()
+        if uploaded:
+            job_queue.enqueue('image_variants', project_id=new_project.id)
+        return _admin_response('Project added successfully!', 'success', 'projects',
+                               [_admin_row('projects', new_project)])
     except Exception as e:
         db.session.rollback()
-        flash(f'Error adding project: {e}', 'danger')
-    return redirect(url_for('admin_dashboard'))
+        return _admin_response(f'Error adding project: {e}', 'danger', 'projects', status=400)
 
-@app.route('/admin/add/certificate', methods=['POST'])
+@bp.route('/admin/add/certificate', methods=['POST'])
 @login_required
 def add_certificate():
-    # ... (existing code, no changes)
     try:
         new_certificate = Certificate(title=request.form.get('title'), provider=request.form.get('provider'), icon=request.form.get('icon'))
         db.session.add(new_certificate)
         db.session.commit()
-        flash('Certificate added successfully!', 'success')
+        _content_written()
+        return _admin_response('Certificate added successfully!', 'success', 'certificates',
+                               [_admin_row('certificates', new_certificate)])
     except Exception as e:
         db.session.rollback()
-        flash(f'Error adding certificate: {e}', 'danger')
-    return redirect(url_for('admin_dashboard') + '#certificates')
+        return _admin_response(f'Error adding certificate: {e}', 'danger', 'certificates', status=400)
 
-@app.route('/admin/add/skill', methods=['POST'])
+# --- UPLOAD RESUME ---
+@bp.route('/admin/resume', methods=['POST'])
+@login_required
+def upload_resume():
+    upload = request.files.get('resume')
+    if not upload or not upload.filename:
+        flash('Choose a PDF to upload.', 'danger')
+        return redirect(url_for('site.admin_dashboard') + '#resume')
+    try:
+        data = upload.read(media_store.max_bytes + 1)
+        resume = resumes.store(data, secure_filename(upload.filename) or BUNDLED_RESUME)
+        flash(f'Resume uploaded. /download-resume now serves {resume.download_name}.', 'success')
+    except Exception as e:
+        db.session.rollback()
+        flash(f'Error uploading resume: {e}', 'danger')
+    return redirect(url_for('site.admin_dashboard') + '#resume')
+
+@bp.route('/admin/add/skill', methods=['POST'])
 @login_required
 def add_skill():
-    # ... (existing code, no changes)
     try:
-        new_skill = Skill(category=request.form.get('category'), name=request.form.get('name'), svg=request.form.get('svg'))
+        new_skill = Skill(category=request.form.get('category'), name=request.form.get('name'))
+        new_skill.set_svg(request.form.get('svg'))
         db.session.add(new_skill)
         db.session.commit()
-        flash('Skill added successfully!', 'success')
+        skill_sprite.invalidate()
+        _content_written()
+        return _admin_response('Skill added successfully!', 'success', 'skills',
+                               [_admin_row('skills', new_skill)])
     except Exception as e:
         db.session.rollback()
-        flash(f'Error adding skill: {e}', 'danger')
-    return redirect(url_for('admin_dashboard') + '#skills')
+        return _admin_response(f'Error adding skill: {e}', 'danger', 'skills', status=400)
+
+# --- LIVE TODO UPDATES ---
+# Todo actions answer `Accept: application/json` requests with just the rows
+# they changed, rendered with _admin_todo_rows.html, instead of redirecting
+# to a full dashboard render. The same changes go to every other open
+# dashboard through /admin/todo/events. Plain form posts still redirect.
+def _wants_json():
+    return request.accept_mimetypes.best == 'application/json'
+
+def _todo_statuses(ids):
+    # id -> status for `ids` and whatever holds the active slot: every row
+    # a transition can touch
+    rows = db.session.query(Todo.id, Todo.status).filter(
+        or_(Todo.id.in_(list(ids)), Todo.status.in_(('Active', 'Paused')))
+    ).all()
+    return dict(rows)
+
+def _todo_changes(before, ids=()):
+    # Rows whose status differs from the `before` snapshot, plus `ids`
+    # (edited in place); rows that no longer exist come back as deletions
+    after = _todo_statuses(set(before) | set(ids))
+    changed = {i for i in set(before) | set(after) if before.get(i) != after.get(i)} | set(ids)
+    tasks = {task.id: task for task in Todo.query.filter(Todo.id.in_(changed))} if changed else {}
+    return [
+        {'id': i, 'status': tasks[i].status, 'html': render_template('_admin_todo_rows.html', rows=[tasks[i]])}
+        if i in tasks else {'id': i, 'deleted': True}
+        for i in sorted(changed)
+    ]
+
+def _todo_response(message, category, changes=(), status=200):
+    todo_events.publish(list(changes))
+    if _wants_json():
+        return jsonify({'message': message, 'category': category, 'changes': list(changes)}), status
+    flash(message, category)
+    return redirect(url_for('site.admin_dashboard') + '#roadmap')
+
+@bp.route('/admin/todo/events')
+@login_required
+def todo_event_stream():
+    # EventSource sends Last-Event-ID when it reconnects; the dashboard
+    # passes the newest event id it was rendered with
+    cursor = todo_events.parse_cursor(request.headers.get('Last-Event-ID'))
+    if cursor is None:
+        after = request.args.get('after', type=int)
+        cursor = (after if after is not None else todo_events.latest_id()), ()
+    after, gaps = cursor
+    hold = bool(request.environ.get('wsgi.multithread'))
+    return Response(
+        stream_with_context(todo_events.stream(after, hold, gaps)),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
 
 # --- NEW: ADD TODO ---
-@app.route('/admin/add/todo', methods=['POST'])
+@bp.route('/admin/add/todo', methods=['POST'])
 @login_required
 def add_todo():
+    before = _todo_statuses([])
     try:
         new_todo = Todo(
             task=request.form.get('task'),
@@ -315,38 +914,44 @@ def add_todo():
         )
         db.session.add(new_todo)
         db.session.commit()
-        flash('To-Do task added successfully!', 'success')
     except Exception as e:
         db.session.rollback()
-        flash(f'Error adding task: {e}', 'danger')
-    return redirect(url_for('admin_dashboard') + '#roadmap')
+        return _todo_response(f'Error adding task: {e}', 'danger', status=400)
+    return _todo_response('To-Do task added successfully!', 'success', _todo_changes(before, [new_todo.id]))
 
 # --- EDIT ITEMS ---
 
-@app.route('/admin/edit/project/<int:id>', methods=['GET', 'POST'])
+@bp.route('/admin/edit/project/<int:id>', methods=['GET', 'POST'])
 @login_required
 def edit_project(id):
-    # ... (existing code, no changes)
     project = Project.query.get_or_404(id)
     if request.method == 'POST':
         try:
             project.title = request.form.get('title')
             project.role = request.form.get('role')
-            project.tech = request.form.get('tech')
+            project.set_tech(request.form.get('tech'))
             project.description = request.form.get('description')
+            if request.form.get('image') and request.form.get('image') != project.image:
+                # A new external URL replaces any uploaded image
+                project.image_file = None
             project.image = request.form.get('image')
+            uploaded = _apply_image_upload(project)
             db.session.commit()
-            flash('Project updated successfully!', 'success')
-            return redirect(url_for('admin_dashboard'))
+            _content_written()
+            if uploaded:
+                job_queue.enqueue('image_variants', project_id=project.id)
+            return _admin_response('Project updated successfully!', 'success', 'projects',
+                                   [_admin_row('projects', project)])
         except Exception as e:
             db.session.rollback()
+            if _wants_json():
+                return _admin_response(f'Error updating project: {e}', 'danger', 'projects', status=400)
             flash(f'Error updating project: {e}', 'danger')
     return render_template('edit_project.html', project=project)
 
-@app.route('/admin/edit/certificate/<int:id>', methods=['GET', 'POST'])
+@bp.route('/admin/edit/certificate/<int:id>', methods=['GET', 'POST'])
 @login_required
 def edit_certificate(id):
-    # ... (existing code, no changes)
     certificate = Certificate.query.get_or_404(id)
     if request.method == 'POST':
         try:
@@ -354,136 +959,425 @@ def edit_certificate(id):
             certificate.provider = request.form.get('provider')
             certificate.icon = request.form.get('icon')
             db.session.commit()
-            flash('Certificate updated successfully!', 'success')
-            return redirect(url_for('admin_dashboard') + '#certificates')
+            _content_written()
+            return _admin_response('Certificate updated successfully!', 'success', 'certificates',
+                                   [_admin_row('certificates', certificate)])
         except Exception as e:
             db.session.rollback()
+            if _wants_json():
+                return _admin_response(f'Error updating certificate: {e}', 'danger', 'certificates', status=400)
             flash(f'Error updating certificate: {e}', 'danger')
     return render_template('edit_certificate.html', certificate=certificate)
 
-@app.route('/admin/edit/skill/<int:id>', methods=['GET', 'POST'])
+@bp.route('/admin/edit/skill/<int:id>', methods=['GET', 'POST'])
 @login_required
 def edit_skill(id):
-    # ... (existing code, no changes)
     skill = Skill.query.get_or_404(id)
     if request.method == 'POST':
         try:
             skill.category = request.form.get('category')
             skill.name = request.form.get('name')
-            skill.svg = request.form.get('svg')
+            # The stored icon is a hash, so only replace it when new markup is sent
+            if request.form.get('svg'):
+                skill.set_svg(request.form.get('svg'))
             db.session.commit()
-            flash('Skill updated successfully!', 'success')
-            return redirect(url_for('admin_dashboard') + '#skills')
+            skill_sprite.invalidate()
+            _content_written()
+            return _admin_response('Skill updated successfully!', 'success', 'skills',
+                                   [_admin_row('skills', skill)])
         except Exception as e:
             db.session.rollback()
+            if _wants_json():
+                return _admin_response(f'Error updating skill: {e}', 'danger', 'skills', status=400)
             flash(f'Error updating skill: {e}', 'danger')
     return render_template('edit_skill.html', skill=skill)
 
 # --- NEW: EDIT TODO ---
-@app.route('/admin/edit/todo/<int:id>', methods=['GET', 'POST'])
+@bp.route('/admin/edit/todo/<int:id>', methods=['GET', 'POST'])
 @login_required
 def edit_todo(id):
     task = Todo.query.get_or_404(id)
     if request.method == 'POST':
+        before = _todo_statuses([id])
         try:
+            was_done = task.status == 'Done'
+            if was_done:
+                # Uncount it; it's counted again below if it stays Done
+                TodoDailyStat.record([task.id], -1)
             task.task = request.form.get('task')
             task.category = request.form.get('category')
-            task.status = request.form.get('status')
+            status = request.form.get('status')
+            if was_done and status != 'Done':
+                # Reopen it before any transition below
+                task.status = 'Pending'
+                task.completed_at = None
+            if status == 'Active' and task.status != 'Active':
+                # Go through the transition so the old active task is demoted
+                db.session.flush()
+                if not _activate(task.id):
+                    raise ValueError('the task could not be activated')
+            elif status == 'Done' and not was_done:
+                # Stamps completed_at, counts it and moves the queue along
+                db.session.flush()
+                _complete(task.id)
+            else:
+                task.status = status
+            if was_done:
+                db.session.flush()
+                TodoDailyStat.record([task.id])
             db.session.commit()
-            flash('Task updated successfully!', 'success')
-            return redirect(url_for('admin_dashboard') + '#roadmap')
+            return _todo_response('Task updated successfully!', 'success', _todo_changes(before, [id]))
         except Exception as e:
             db.session.rollback()
+            if _wants_json():
+                return _todo_response(f'Error updating task: {e}', 'danger', status=400)
             flash(f'Error updating task: {e}', 'danger')
     return render_template('edit_todo.html', task=task)
 
 # --- DELETE ITEMS ---
 
-@app.route('/admin/delete/project/<int:id>', methods=['POST'])
+@bp.route('/admin/delete/project/<int:id>', methods=['POST'])
 @login_required
 def delete_project(id):
-    # ... (existing code, no changes)
     project = Project.query.get_or_404(id)
     db.session.delete(project)
     db.session.commit()
-    flash('Project deleted.', 'success')
-    return redirect(url_for('admin_dashboard'))
+    _content_written()
+    return _admin_response('Project deleted.', 'success', 'projects',
+                           [{'list': 'projects', 'id': id, 'deleted': True}])
 
-@app.route('/admin/delete/certificate/<int:id>', methods=['POST'])
+@bp.route('/admin/delete/certificate/<int:id>', methods=['POST'])
 @login_required
 def delete_certificate(id):
-    # ... (existing code, no changes)
     certificate = Certificate.query.get_or_404(id)
     db.session.delete(certificate)
     db.session.commit()
-    flash('Certificate deleted.', 'success')
-    return redirect(url_for('admin_dashboard') + '#certificates')
+    _content_written()
+    return _admin_response('Certificate deleted.', 'success', 'certificates',
+                           [{'list': 'certificates', 'id': id, 'deleted': True}])
 
-@app.route('/admin/delete/skill/<int:id>', methods=['POST'])
+@bp.route('/admin/delete/skill/<int:id>', methods=['POST'])
 @login_required
 def delete_skill(id):
-    # ... (existing code, no changes)
     skill = Skill.query.get_or_404(id)
     db.session.delete(skill)
     db.session.commit()
-    flash('Skill deleted.', 'success')
-    return redirect(url_for('admin_dashboard') + '#skills')
+    skill_sprite.invalidate()
+    _content_written()
+    return _admin_response('Skill deleted.', 'success', 'skills',
+                           [{'list': 'skills', 'id': id, 'deleted': True}])
 
 # --- NEW: DELETE TODO ---
-@app.route('/admin/delete/todo/<int:id>', methods=['POST'])
+@bp.route('/admin/delete/todo/<int:id>', methods=['POST'])
 @login_required
 def delete_todo(id):
     task = Todo.query.get_or_404(id)
+    before = _todo_statuses([id])
+    TodoDailyStat.record([task.id], -1)
     db.session.delete(task)
     db.session.commit()
-    flash('Task deleted.', 'success')
-    return redirect(url_for('admin_dashboard') + '#roadmap')
+    return _todo_response('Task deleted.', 'success', _todo_changes(before, [id]))
 
 # --- NEW: UPDATE TODO STATUS ---
 
-def _set_active_task(task_to_activate):
-    # Find any other active/paused task and set it to pending
-    other_task = Todo.query.filter(or_(Todo.status == 'Active', Todo.status == 'Paused')).first()
-    if other_task:
-        other_task.status = 'Pending'
-    # Set the new task to active
-    task_to_activate.status = 'Active'
+# Every transition is a handful of conditional UPDATEs run in one
+# transaction, so concurrent requests from different workers can't interleave
+# a read and a write. The partial unique index on status='Active' (SQLite and
+# Postgres) rejects a second Active task; the loser simply retries.
+TRANSITION_RETRIES = 3
 
-@app.route('/admin/todo/set_active/<int:id>', methods=['POST'])
+def _run_transition(apply):
+    for attempt in range(TRANSITION_RETRIES):
+        try:
+            result = apply()
+            db.session.commit()
+            return result
+        except (IntegrityError, OperationalError):
+            db.session.rollback()
+            if attempt == TRANSITION_RETRIES - 1:
+                raise
+
+def _activate(task_id):
+    # Claim the task first, so a missing or Done one demotes nothing; then
+    # demote whatever holds the active slot and promote the task
+    claimed = Todo.query.filter(
+        Todo.id == task_id, Todo.status != 'Done'
+    ).update({'status': 'Pending'}, synchronize_session=False)
+    if not claimed:
+        return 0
+    Todo.query.filter(
+        Todo.status.in_(('Active', 'Paused')), Todo.id != task_id
+    ).update({'status': 'Pending'}, synchronize_session=False)
+    return Todo.query.filter(
+        Todo.id == task_id
+    ).update({'status': 'Active'}, synchronize_session=False)
+
+def _activate_next_pending():
+    pending = aliased(Todo)
+    next_id = (
+        db.select(pending.id).where(pending.status == 'Pending')
+        .order_by(pending.id.asc()).limit(1).scalar_subquery()
+    )
+    return Todo.query.filter(
+        Todo.id == next_id, Todo.status == 'Pending'
+    ).update({'status': 'Active'}, synchronize_session=False)
+
+def _pause(task_id):
+    return Todo.query.filter(
+        Todo.id == task_id, Todo.status == 'Active'
+    ).update({'status': 'Paused'}, synchronize_session=False)
+
+def _complete(task_id):
+    done = Todo.query.filter(
+        Todo.id == task_id, Todo.status != 'Done'
+    ).update({'status': 'Done', 'completed_at': db.func.now()}, synchronize_session=False)
+    if not done:
+        return False
+    TodoDailyStat.record([task_id])
+    Todo.query.filter(
+        Todo.status.in_(('Active', 'Paused'))
+    ).update({'status': 'Pending'}, synchronize_session=False)
+    _activate_next_pending()
+    return True
+
+def _apply_activate(task_id):
+    if not _activate(task_id):
+        db.session.rollback()
+        return False
+    return True
+
+@hot_query('active task')
+def _current_active_task_query():
+    return Todo.query.filter_by(status='Active').order_by(Todo.id.asc()).limit(1)
+
+def _current_active_task():
+    return _current_active_task_query().first()
+
+@bp.route('/admin/todo/set_active/<int:id>', methods=['POST'])
 @login_required
 def set_active_task(id):
     task = Todo.query.get_or_404(id)
-    _set_active_task(task)
-    db.session.commit()
-    flash(f"Task '{task.task[:30]}...' set to Active.", 'success')
-    return redirect(url_for('admin_dashboard') + '#roadmap')
+    before = _todo_statuses([id])
+    if _run_transition(lambda: _apply_activate(id)):
+        return _todo_response(f"Task '{task.task[:30]}...' set to Active.", 'success', _todo_changes(before))
+    return _todo_response("Completed tasks can't be made active again.", 'danger')
 
-@app.route('/admin/todo/set_pause/<int:id>', methods=['POST'])
+@bp.route('/admin/todo/set_pause/<int:id>', methods=['POST'])
 @login_required
 def set_pause_task(id):
     task = Todo.query.get_or_404(id)
-    task.status = 'Paused'
-    db.session.commit()
-    flash(f"Task '{task.task[:30]}...' has been paused.", 'info')
-    return redirect(url_for('admin_dashboard') + '#roadmap')
+    before = _todo_statuses([id])
+    if _run_transition(lambda: _pause(id)):
+        return _todo_response(f"Task '{task.task[:30]}...' has been paused.", 'info', _todo_changes(before))
+    return _todo_response("Only the active task can be paused.", 'info')
 
-@app.route('/admin/todo/set_complete/<int:id>', methods=['POST'])
+@bp.route('/admin/todo/set_complete/<int:id>', methods=['POST'])
 @login_required
 def set_complete_task(id):
-    task = Todo.query.get_or_404(id)
-    task.status = 'Done'
-    task.completed_at = db.func.now()
-    
-    # Find the next task in the "Pending" list
-    next_task = Todo.query.filter_by(status='Pending').order_by(Todo.id.asc()).first()
+    Todo.query.get_or_404(id)
+    before = _todo_statuses([id])
+    if not _run_transition(lambda: _complete(id)):
+        return _todo_response("Task was already completed.", 'info')
+
+    next_task = _current_active_task()
     if next_task:
-        _set_active_task(next_task)
-        flash(f"Task completed! Next task: '{next_task.task[:30]}...'", 'success')
+        message = f"Task completed! Next task: '{next_task.task[:30]}...'"
     else:
-        flash("Task completed! No more pending tasks.", 'success')
-        
-    db.session.commit()
-    return redirect(url_for('admin_dashboard') + '#roadmap')
+        message = "Task completed! No more pending tasks."
+    return _todo_response(message, 'success', _todo_changes(before))
+
+# --- Bulk transitions ---
+# POST {"transitions": [{"id": 3, "action": "activate"}, ...]} applies the
+# steps in order inside one transaction: either all of them land or none.
+BULK_ACTIONS = {
+    'activate': _activate,
+    'pause': _pause,
+    'complete': _complete,
+    'pending': lambda task_id: Todo.query.filter(
+        Todo.id == task_id, Todo.status != 'Done'
+    ).update({'status': 'Pending'}, synchronize_session=False),
+}
+
+@bp.route('/admin/todo/bulk', methods=['POST'])
+@login_required
+def bulk_todo_transitions():
+    payload = request.get_json(silent=True) or {}
+    steps = payload.get('transitions') or []
+    if not isinstance(steps, list) or not all(
+        isinstance(step, dict) and step.get('action') in BULK_ACTIONS and isinstance(step.get('id'), int)
+        for step in steps
+    ):
+        return jsonify({'error': f"Expected a list of {{id, action}} with action in {sorted(BULK_ACTIONS)}"}), 400
+
+    before = _todo_statuses(step['id'] for step in steps)
+
+    def apply():
+        return [
+            {'id': step['id'], 'action': step['action'], 'applied': bool(BULK_ACTIONS[step['action']](step['id']))}
+            for step in steps
+        ]
+
+    try:
+        results = _run_transition(apply)
+    except (IntegrityError, OperationalError) as e:
+        return jsonify({'error': f'Could not apply transitions: {e.orig}'}), 409
+
+    changes = _todo_changes(before)
+    todo_events.publish(changes)
+    active = _current_active_task()
+    return jsonify({'results': results, 'active': active.id if active else None, 'changes': changes})
+
+
+# --- CLI COMMANDS ---
+@bp.cli.command('export-site')
+@click.argument('out_dir', default='build')
+@click.option('--changed', multiple=True, type=click.Choice(['project', 'skill', 'certificate']),
+              help='Only re-export pages that depend on this model (repeatable).')
+def export_site_command(out_dir, changed):
+    """Render the public site to OUT_DIR as precompressed static files."""
+    from freeze import export_site
+    export_site(current_app._get_current_object(), out_dir, list(changed) or None)
+
+
+@bp.cli.command('export-data')
+@click.argument('output', type=click.File('w', encoding='utf-8'), default='-')
+def export_data_command(output):
+    """Stream projects, skills, certificates and todos as NDJSON."""
+    from data_io import export_ndjson
+    for line in export_ndjson():
+        output.write(line)
+
+@bp.cli.command('import-data')
+@click.argument('source', type=click.File('r', encoding='utf-8'))
+@click.option('--batch-size', default=None, type=int, help='Rows per transaction.')
+def import_data_command(source, batch_size):
+    """Upsert NDJSON records from SOURCE without dropping any data."""
+    from data_io import import_ndjson
+    ensure_schema()
+    try:
+        stats = import_ndjson(source, batch_size=batch_size or current_app.config['IMPORT_BATCH_SIZE'])
+    finally:
+        _content_changed()
+    for kind, counts in stats.items():
+        print(f"{kind}: {counts['inserted']} inserted, {counts['updated']} updated, {counts['skipped']} skipped")
+
+@bp.cli.command('run-jobs')
+@click.option('--threads', default=None, type=int, help='Worker threads (default JOB_THREADS).')
+@click.option('--once', is_flag=True, help='Run the jobs that are due, then exit.')
+def run_jobs_command(threads, once):
+    """Process background jobs (reseeds, image variants, cache warming)."""
+    job_queue.autostart = False  # warm_cache requests must not spawn more workers
+    ensure_schema()
+    if once:
+        print(f"Ran {job_queue.run_pending()} job(s)")
+        return
+    job_queue.start(threads)
+    print(f"Job worker running with {threads or job_queue.threads} thread(s)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        job_queue.stop(timeout=30)
+
+@bp.cli.command('backfill-roadmap-stats')
+def backfill_roadmap_stats_command():
+    """Rebuild the roadmap velocity rollups from the full todo history."""
+    ensure_schema()
+    started = time.perf_counter()
+    try:
+        counted = TodoDailyStat.rebuild()
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    print(f"Counted {counted} completed task(s) into {TodoDailyStat.query.count()} rollup row(s) "
+          f"in {time.perf_counter() - started:.2f}s")
+
+@bp.cli.command('reindex-search')
+def reindex_search_command():
+    """Rebuild the full-text search index from every searchable row."""
+    ensure_schema()
+    started = time.perf_counter()
+    try:
+        indexed = rebuild_search_index()
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    print(f"Indexed {indexed} row(s) in {time.perf_counter() - started:.2f}s")
+
+@bp.cli.command('check-query-plans')
+@click.option('--verbose', is_flag=True, help='Print every plan, not just the failing ones.')
+def check_query_plans_command(verbose):
+    """EXPLAIN the hot queries and fail if any needs a full scan or a sort."""
+    ensure_schema()
+    failed = 0
+    for name, (plan, problems) in check_query_plans().items():
+        print(f"{'FAIL' if problems else 'ok'}: {name}" + (f" ({'; '.join(problems)})" if problems else ''))
+        if problems or verbose:
+            for line in plan:
+                print(f"    {line}")
+        failed += bool(problems)
+    if failed:
+        raise click.ClickException(f"{failed} query plan(s) regressed")
+
+@bp.cli.command('build-assets')
+@click.option('--clean', is_flag=True, help='Delete fingerprinted files from earlier builds.')
+def build_assets_command(clean):
+    """Minify and fingerprint CSS/JS/fonts and per-page critical CSS into static/dist."""
+    from assets import build_assets
+    manifest = build_assets(current_app.static_folder, clean=clean, template_dir=os.path.join(current_app.root_path, current_app.template_folder))
+    assets.load()
+    for path, name in sorted(manifest.items()):
+        size = os.path.getsize(os.path.join(assets.dist_dir, name))
+        print(f"{path} -> {name} ({size} bytes)")
+
+@bp.cli.command('build-fonts')
+@click.option('--inter', 'inter_dir', required=True, type=click.Path(exists=True, file_okay=False),
+              help='Folder containing the Inter release (Inter-Regular.woff2, ...).')
+@click.option('--fontawesome', 'fa_dir', required=True, type=click.Path(exists=True, file_okay=False),
+              help='Folder containing Font Awesome Free (css/all.css and webfonts/).')
+def build_fonts_command(inter_dir, fa_dir):
+    """Subset Inter and the Font Awesome icons in use into static/fonts."""
+    from fonts import find_icons, build_inter, build_icons
+    try:
+        certificate_icons = [icon for (icon,) in db.session.query(Certificate.icon)]
+    except OperationalError:
+        certificate_icons = []  # no database yet
+    icons = find_icons(current_app.root_path, certificate_icons)
+    sizes = build_inter(inter_dir, current_app.static_folder)
+    sizes.update(build_icons(fa_dir, current_app.static_folder, icons))
+    for name, size in sorted(sizes.items()):
+        print(f"fonts/{name}: {size} bytes")
+    print(f"Icons: {', '.join(sorted(n for names in icons.values() for n in names))}")
+
+
+# --- PRELOAD WARM-UP ---
+startup_timer.mark('routes')
+
+app = create_app()
+startup_timer.mark('create_app')
+
+def warm_up():
+    # Called once in the gunicorn master (see gunicorn.conf.py) so every
+    # forked worker starts with the schema checked, templates compiled and
+    # public pages cached, all shared copy-on-write
+    autostart, job_queue.autostart = job_queue.autostart, False
+    startup_timer.reported = True  # the warm-up requests aren't a first response
+    try:
+        with app.app_context():
+            ensure_schema()
+            for name in app.jinja_env.list_templates(extensions=('html',)):
+                app.jinja_env.get_template(name)
+            _warm_pages()
+    except Exception as e:
+        print(f"Warm-up skipped: {e}")
+    finally:
+        job_queue.autostart = autostart
+        pool_stats.engine.dispose()  # no connections may cross the fork
+        request_metrics.reset()  # nor traffic
+        startup_timer.reported = False
+    startup_timer.mark('warm-up')
 
 
 # --- Run the App ---
@@ -0,0 +1,428 @@
+import os
+import re
+import gzip
+import json
+import hashlib
+import mimetypes
+import posixpath
+from flask import request, url_for, send_from_directory, abort
+from markupsafe import Markup
+from jinja2 import pass_context
+from werkzeug.security import safe_join
+
+try:
+    import brotli
+except ImportError:  # Brotli is optional, gzip is always available
+    brotli = None
+
+
+# --- Static Asset Pipeline ---
+# `flask build-assets` minifies the stylesheets and scripts (inlining CSS
+# @imports), names every file after a hash of its content and writes
+# .gz/.br siblings into static/dist/. Templates link through asset_url(),
+# which looks names up in the manifest, so a deploy only changes the URL of
+# files that actually changed and everything can be cached forever.
+
+ENTRY_POINTS = ('css/main.css', 'css/admin.css', 'js/app.js', 'js/admin.js')
+# Copied as-is (fingerprinted, not minified); referenced from the CSS
+COPIED = {'fonts': ('.woff2',)}
+DIST_DIR = 'dist'
+MANIFEST_NAME = 'manifest.json'
+COMPRESSIBLE = ('.css', '.js', '.svg')
+IMMUTABLE = 'public, max-age=31536000, immutable'
+# Public pages that get their own inlined critical CSS (see below)
+CRITICAL_PAGES = ('index.html', 'about.html', 'projects.html', 'skills.html',
+                  'certificates.html', 'contact.html')
+CRITICAL_SOURCE = 'css/main.css'
+# Scripts whose classList/className changes on load must be styled up front
+STATE_SCRIPTS = ('js/app.js',)
+# Sent as Link: rel=preload (and 103 Early Hints where the server can)
+PRELOADS = (
+    ('css/main.css', 'style', None),
+    ('fonts/inter-400.woff2', 'font', 'font/woff2'),
+    ('js/app.js', 'script', None),
+)
+
+
+# --- Minifiers ---
+# Deliberately conservative: whitespace and comments only, nothing that
+# needs a real parser. Strings are never touched.
+_CSS_STRING_RE = re.compile(r'("(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\')')
+_CSS_COMMENT_RE = re.compile(_CSS_STRING_RE.pattern + r'|/\*.*?\*/', re.S)
+
+def _squeeze_css(chunk):
+    chunk = re.sub(r'\s+', ' ', chunk)
+    chunk = re.sub(r'\s*([{};,>])\s*', r'\1', chunk)
+    return re.sub(r':\s+', ':', chunk)
+
+def minify_css(text):
+    # Comments go first so they can't leave whitespace behind
+    text = _CSS_COMMENT_RE.sub(lambda m: m.group(1) or '', text)
+    parts = _CSS_STRING_RE.split(text)
+    # split() with a group alternates code, string, code, ...
+    out = [part if i % 2 else _squeeze_css(part) for i, part in enumerate(parts)]
+    return ''.join(out).replace(';}', '}').strip()
+
+def minify_js(text):
+    # Line breaks are kept so automatic semicolon insertion is unaffected
+    lines, in_comment = [], False
+    for line in text.splitlines():
+        stripped = line.strip()
+        if in_comment:
+            in_comment = '*/' not in stripped
+            continue
+        if stripped.startswith('/*') and ('*/' not in stripped or stripped.endswith('*/')):
+            in_comment = '*/' not in stripped
+            continue
+        if stripped and not stripped.startswith('//'):
+            lines.append(stripped)
+    return '\n'.join(lines) + '\n'
+
+
+# --- CSS References ---
+_IMPORT_RE = re.compile(r'@import\s+(?:url\(\s*)?["\']?([^"\')\s;]+)["\']?\s*\)?\s*;')
+_URL_RE = re.compile(r'url\(\s*(["\']?)([^"\')]+)\1\s*\)')
+
+def _is_local(ref):
+    return not re.match(r'^(?:[a-z]+:|//|#)', ref)
+
+def _rebase_urls(text, from_path, to_path):
+    # Keep url() references valid when a file is inlined into another folder
+    from_dir, to_dir = posixpath.dirname(from_path), posixpath.dirname(to_path)
+    if from_dir == to_dir:
+        return text
+    def repl(match):
+        ref = match.group(2)
+        if not _is_local(ref):
+            return match.group(0)
+        target = posixpath.normpath(posixpath.join(from_dir, ref))
+        return f'url({match.group(1)}{posixpath.relpath(target, to_dir or ".")}{match.group(1)})'
+    return _URL_RE.sub(repl, text)
+
+def _inline_imports(static_dir, path, seen=()):
+    with open(os.path.join(static_dir, path), encoding='utf-8') as f:
+        text = f.read()
+    def repl(match):
+        ref = match.group(1)
+        if not _is_local(ref):
+            return match.group(0)
+        target = posixpath.normpath(posixpath.join(posixpath.dirname(path), ref))
+        if target in seen:
+            return ''
+        inlined = _inline_imports(static_dir, target, seen + (path,))
+        return _rebase_urls(inlined, target, path)
+    return _IMPORT_RE.sub(repl, text)
+
+def _fingerprint_urls(text, path, manifest):
+    # Point url() references at the fingerprinted copies in dist/
+    base = posixpath.dirname(path)
+    def repl(match):
+        ref = match.group(2)
+        if not _is_local(ref):
+            return match.group(0)
+        target = posixpath.normpath(posixpath.join(base, ref.split('?')[0]))
+        if target not in manifest:
+            return match.group(0)
+        return f'url({match.group(1)}{posixpath.relpath(manifest[target], base or ".")}{match.group(1)})'
+    return _URL_RE.sub(repl, text)
+
+
+# --- Critical CSS ---
+# For each public page, keep only the rules whose selectors can match the
+# page's own markup (base.html, the page and its includes, plus classes
+# app.js sets on load). That subset is inlined in <head> and the full
+# stylesheet loads without blocking the first paint. The pages are a single
+# section each, so "above the fold" is the whole template here.
+_JINJA_RE = re.compile(r'{%.*?%}|{{.*?}}|{#.*?#}', re.S)
+_TEMPLATE_REF_RE = re.compile(r'{%-?\s*(?:include|extends)\s+["\']([^"\']+)["\']')
+_TAG_RE = re.compile(r'<([a-zA-Z][\w-]*)')
+_ATTR_RE = re.compile(r'\b(class|id)\s*=\s*"([^"]*)"')
+_SCRIPT_CLASS_RE = re.compile(r'(?:classList\.(?:add|toggle)\(\s*|className\s*=\s*)["\']([\w\s-]+)["\']')
+_PSEUDO_RE = re.compile(r'::?[\w-]+(?:\([^)]*\))?')
+_ATTR_SELECTOR_RE = re.compile(r'\[[^\]]*\]')
+
+def _template_source(template_dir, name, seen=()):
+    if name in seen:
+        return ''
+    with open(os.path.join(template_dir, name), encoding='utf-8') as f:
+        text = f.read()
+    refs = _TEMPLATE_REF_RE.findall(text)
+    return text + ''.join(_template_source(template_dir, ref, seen + (name,)) for ref in refs)
+
+def page_vocabulary(template_dir, name, script_text=''):
+    # (tags, classes, ids) the page can render. Jinja tags are blanked out,
+    # so classes inside {% if %} branches count as used.
+    markup = _JINJA_RE.sub(' ', _template_source(template_dir, name))
+    tags = {tag.lower() for tag in _TAG_RE.findall(markup)}
+    classes, ids = set(), set()
+    for attr, value in _ATTR_RE.findall(markup):
+        (classes if attr == 'class' else ids).update(value.split())
+    for value in _SCRIPT_CLASS_RE.findall(script_text):
+        classes.update(value.split())
+    return tags, classes, ids
+
+def _css_blocks(text):
+    # Splits minified CSS into top-level (prelude, body) pairs
+    blocks, depth, start, head_end, quote = [], 0, 0, 0, None
+    for i, ch in enumerate(text):
+        if quote:
+            if ch == quote and text[i - 1] != '\\':
+                quote = None
+        elif ch in '"\'':
+            quote = ch
+        elif ch == ';' and depth == 0:
+            start = i + 1
+        elif ch == '{':
+            if depth == 0:
+                head_end = i
+            depth += 1
+        elif ch == '}':
+            depth -= 1
+            if depth == 0:
+                blocks.append((text[start:head_end].strip(), text[head_end + 1:i]))
+                start = i + 1
+    return blocks
+
+def _split_selectors(prelude):
+    parts, depth, current = [], 0, ''
+    for ch in prelude:
+        depth += (ch == '(') - (ch == ')')
+        if ch == ',' and depth == 0:
+            parts.append(current)
+            current = ''
+        else:
+            current += ch
+    return parts + [current]
+
+def _selector_matches(selector, vocabulary):
+    # Pseudo-classes and attribute tests are ignored, so this errs on the
+    # side of keeping a rule
+    tags, classes, ids = vocabulary
+    simple = _ATTR_SELECTOR_RE.sub('', _PSEUDO_RE.sub('', selector))
+    for compound in re.split(r'[\s>+~]+', simple.strip()):
+        tag = re.match(r'[a-zA-Z][\w-]*', compound)
+        if tag and tag.group(0).lower() not in tags:
+            return False
+        if any(name not in classes for name in re.findall(r'\.([\w-]+)', compound)):
+            return False
+        if any(name not in ids for name in re.findall(r'#([\w-]+)', compound)):
+            return False
+    return True
+
+def _critical_rules(text, vocabulary):
+    kept, keyframes = [], []
+    for prelude, body in _css_blocks(text):
+        if prelude.startswith(('@media', '@supports')):
+            inner = _critical_rules(body, vocabulary)
+            if inner:
+                kept.append(f'{prelude}{{{inner}}}')
+        elif prelude.startswith('@keyframes'):
+            keyframes.append((prelude.split()[1], f'{prelude}{{{body}}}'))
+        elif prelude.startswith('@'):
+            kept.append(f'{prelude}{{{body}}}')  # @font-face etc.; fonts load only when used
+        else:
+            selectors = [sel for sel in _split_selectors(prelude) if _selector_matches(sel, vocabulary)]
+            if selectors:
+                kept.append(f"{','.join(selectors)}{{{body}}}")
+    css = ''.join(kept)
+    return css + ''.join(rule for name, rule in keyframes if re.search(rf'\b{re.escape(name)}\b', css))
+
+def critical_css(stylesheet, vocabulary):
+    return _critical_rules(minify_css(stylesheet), vocabulary)
+
+
+# --- Build ---
+def _hashed_name(path, data):
+    stem, ext = posixpath.splitext(path)
+    return f'{stem}.{hashlib.sha256(data).hexdigest()[:12]}{ext}'
+
+def _emit(dist_dir, path, data, manifest):
+    name = _hashed_name(path, data)
+    target = os.path.join(dist_dir, name)
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    with open(target, 'wb') as f:
+        f.write(data)
+    if name.endswith(COMPRESSIBLE):
+        siblings = [('.gz', gzip.compress(data, compresslevel=9, mtime=0))]
+        if brotli:
+            siblings.append(('.br', brotli.compress(data)))
+        for suffix, body in siblings:
+            if len(body) < len(data):
+                with open(target + suffix, 'wb') as f:
+                    f.write(body)
+    manifest[path] = name
+    return name
+
+def build_assets(static_dir, clean=False, template_dir=None):
+    # Returns {logical path: fingerprinted path} and writes it to the manifest
+    dist_dir = os.path.join(static_dir, DIST_DIR)
+    manifest = {}
+    stylesheets = {}
+
+    for folder, extensions in COPIED.items():
+        source_dir = os.path.join(static_dir, folder)
+        if not os.path.isdir(source_dir):
+            continue
+        for name in sorted(os.listdir(source_dir)):
+            if name.endswith(extensions):
+                with open(os.path.join(source_dir, name), 'rb') as f:
+                    _emit(dist_dir, f'{folder}/{name}', f.read(), manifest)
+
+    for path in ENTRY_POINTS:
+        if path.endswith('.css'):
+            text = minify_css(_fingerprint_urls(_inline_imports(static_dir, path), path, manifest))
+            stylesheets[path] = text
+        else:
+            with open(os.path.join(static_dir, path), encoding='utf-8') as f:
+                text = minify_js(f.read())
+        _emit(dist_dir, path, text.encode('utf-8'), manifest)
+
+    if template_dir and CRITICAL_SOURCE in stylesheets:
+        script_text = ''
+        for path in STATE_SCRIPTS:
+            with open(os.path.join(static_dir, path), encoding='utf-8') as f:
+                script_text += f.read()
+        for page in CRITICAL_PAGES:
+            vocabulary = page_vocabulary(template_dir, page, script_text)
+            text = critical_css(stylesheets[CRITICAL_SOURCE], vocabulary)
+            # Same folder depth as css/, so the url() references stay valid
+            _emit(dist_dir, f'critical/{posixpath.splitext(page)[0]}.css', text.encode('utf-8'), manifest)
+
+    with open(os.path.join(dist_dir, MANIFEST_NAME), 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
+    if clean:
+        # Old fingerprints are kept by default so pages rendered by workers
+        # that haven't restarted yet still find their files
+        keep = {MANIFEST_NAME} | set(manifest.values())
+        for root, _, files in os.walk(dist_dir):
+            for name in files:
+                rel = os.path.relpath(os.path.join(root, name), dist_dir).replace(os.sep, '/')
+                if rel not in keep and rel.rsplit('.', 1)[0] not in keep:
+                    os.remove(os.path.join(root, name))
+    return manifest
+
+
+# --- Lookup and Serving ---
+class AssetManifest:
+    def __init__(self):
+        self.static_dir = None
+        self.entries = {}
+        self._dev_versions = {}
+        self._critical = {}
+
+    def init_app(self, app):
+        self.static_dir = app.static_folder
+        self.load()
+        app.add_template_global(self.url, 'asset_url')
+        app.add_template_global(self.critical_for, 'critical_css')
+        app.before_request(self._send_early_hints)
+        app.after_request(self._add_preload_header)
+        app.extensions['assets'] = self
+
+    @property
+    def dist_dir(self):
+        return os.path.join(self.static_dir, DIST_DIR)
+
+    def load(self):
+        try:
+            with open(os.path.join(self.dist_dir, MANIFEST_NAME)) as f:
+                self.entries = json.load(f)
+        except (OSError, ValueError):
+            self.entries = {}
+        self._critical = {}
+
+    def _dev_version(self, path):
+        # Without a build, bust browser caches with a hash of the source
+        full_path = os.path.join(self.static_dir, path)
+        try:
+            mtime = os.stat(full_path).st_mtime_ns
+        except OSError:
+            return None
+        cached = self._dev_versions.get(path)
+        if cached is None or cached[0] != mtime:
+            with open(full_path, 'rb') as f:
+                cached = (mtime, hashlib.sha256(f.read()).hexdigest()[:8])
+            self._dev_versions[path] = cached
+        return cached[1]
+
+    def url(self, path):
+        name = self.entries.get(path)
+        if name:
+            return url_for('site.dist_asset', filename=name)
+        if path not in ENTRY_POINTS:
+            # Must match the plain url() references inside the CSS
+            return url_for('static', filename=path)
+        return url_for('static', filename=path, v=self._dev_version(path))
+
+    # --- Critical CSS and Preloads ---
+    def critical(self, template):
+        # The page's critical rules for an inline <style>, or None without a build
+        if template not in self._critical:
+            name = self.entries.get(f'critical/{posixpath.splitext(template or "")[0]}.css')
+            css = None
+            if name:
+                with open(os.path.join(self.dist_dir, name), encoding='utf-8') as f:
+                    text = f.read()
+                # Relative url()s would resolve against the page, not the file
+                base = posixpath.dirname(name)
+                def absolute(match):
+                    ref = match.group(2)
+                    if not _is_local(ref):
+                        return match.group(0)
+                    target = posixpath.normpath(posixpath.join(base, ref))
+                    return f"url({url_for('site.dist_asset', filename=target)})"
+                css = Markup(_URL_RE.sub(absolute, text).replace('</', '<\\/'))
+            self._critical[template] = css
+        return self._critical[template]
+
+    @pass_context
+    def critical_for(self, context):
+        # In base.html the context is named after the page that extends it
+        return self.critical(context.name)
+
+    def preload_links(self):
+        links = []
+        for path, kind, mimetype in PRELOADS:
+            link = f'<{self.url(path)}>; rel=preload; as={kind}'
+            if mimetype:
+                link += f'; type={mimetype}'
+            if kind == 'font':
+                link += '; crossorigin'
+            links.append(link)
+        return links
+
+    def _wants_html(self):
+        return request.method == 'GET' and 'text/html' in request.headers.get('Accept', '')
+
+    def _send_early_hints(self):
+        # Recent gunicorn releases pass a 103 Early Hints callback; other servers don't
+        send = request.environ.get('wsgi.early_hints')
+        if send is not None and self._wants_html():
+            send([('Link', ', '.join(self.preload_links()))])
+
+    def _add_preload_header(self, response):
+        if response.status_code == 200 and response.mimetype == 'text/html':
+            response.headers.add('Link', ', '.join(self.preload_links()))
+        return response
+
+    def send(self, filename):
+        # Serve a fingerprinted file, preferring a precompressed sibling
+        if safe_join(self.dist_dir, filename) is None:
+            abort(404)
+        mimetype = mimetypes.guess_type(filename)[0]
+        accepted = request.accept_encodings
+        response = None
+        for encoding, suffix in (('br', '.br'), ('gzip', '.gz')):
+            if accepted[encoding] and os.path.isfile(safe_join(self.dist_dir, filename + suffix)):
+                response = send_from_directory(self.dist_dir, filename + suffix, mimetype=mimetype)
+                response.headers['Content-Encoding'] = encoding
+                break
+        if response is None:
+            response = send_from_directory(self.dist_dir, filename, mimetype=mimetype)
+        response.headers['Cache-Control'] = IMMUTABLE
+        response.vary.add('Accept-Encoding')
+        return response
+
+
+assets = AssetManifest()
@@ -0,0 +1,620 @@
+import os
+import sys
+import json
+import time
+import random
+import socket
+import argparse
+import platform
+import tempfile
+import threading
+import subprocess
+import http.client
+from datetime import datetime, timedelta, timezone
+from html.parser import HTMLParser
+from urllib.parse import urlencode
+
+
+# --- Benchmark Suite ---
+# Seeds synthetic datasets, drives the public and admin routes and reports
+# throughput and p50/p95/p99 per route as JSON that later runs can be
+# compared against:
+#
+#   python benchmark.py --scales 10,1000 --out before.json
+#   python benchmark.py --scales 10,1000 --baseline before.json
+#
+# Each (backend, scale) pair gets a fresh database. Modes:
+#   client    Flask test client in one process (no network, no WSGI server)
+#   gunicorn  a real gunicorn on localhost, driven by --concurrency threads,
+#             once per --worker-classes entry (sync, gthread, gevent)
+#   paint     estimated first contentful paint of the public pages on a
+#             throttled connection (see "First Paint" below)
+# Postgres runs are added with --postgres postgresql://... (a scratch
+# database: its tables are dropped and re-created for every scale).
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ADMIN_PASSWORD = 'benchmark-password'
+
+TECH = ['Python', 'Flask', 'SQL', 'PostgreSQL', 'Pandas', 'NumPy', 'scikit-learn', 'PyTorch',
+        'TensorFlow', 'Spark', 'Airflow', 'dbt', 'Docker', 'Kubernetes', 'AWS', 'GCP', 'Azure',
+        'JavaScript', 'React', 'D3.js', 'Tableau', 'Power BI', 'Kafka', 'Redis', 'FastAPI',
+        'Go', 'Rust', 'Java', 'Scala', 'R']
+ROLES = ['Data Scientist', 'Data Engineer', 'ML Engineer', 'Analyst', 'Full Stack']
+SKILL_CATEGORIES = ['Languages', 'Frameworks', 'Databases', 'Cloud', 'ML', 'Tools', 'Visualisation', 'DevOps']
+TODO_CATEGORIES = ['Learning', 'Portfolio', 'Career', 'Admin']
+
+# name, path (may use {placeholders} filled from the dataset), needs admin, method
+SCENARIOS = [
+    ('index', '/', False, 'GET'),
+    ('about', '/about', False, 'GET'),
+    ('projects', '/projects', False, 'GET'),
+    ('projects_filtered', '/projects?tech=python', False, 'GET'),
+    ('projects_page_2', '/projects?after={project_cursor}', False, 'GET'),
+    ('api_projects', '/api/projects', False, 'GET'),
+    ('api_projects_fragment', '/api/projects?fragment=1', False, 'GET'),
+    ('skills', '/skills', False, 'GET'),
+    ('skill_sprite', '{sprite_url}', False, 'GET'),
+    ('certificates', '/certificates', False, 'GET'),
+    ('api_certificates', '/api/certificates', False, 'GET'),
+    ('contact', '/contact', False, 'GET'),
+    ('search', '/search?q=python', False, 'GET'),
+    ('api_search', '/api/search?q=pyth', False, 'GET'),
+    ('download_resume', '/download-resume', False, 'GET'),
+    ('resume_file', '{resume_url}', False, 'GET'),
+    ('admin_login', '/admin/login', False, 'GET'),
+    ('admin_dashboard', '/admin', True, 'GET'),
+    ('admin_section_projects', '/admin/section/projects', True, 'GET'),
+    ('admin_section_skills', '/admin/section/skills', True, 'GET'),
+    ('admin_section_done', '/admin/section/done', True, 'GET'),
+    ('admin_edit_todo', '/admin/edit/todo/{todo_id}', True, 'GET'),
+    ('admin_edit_project', '/admin/edit/project/{project_id}', True, 'GET'),
+    ('admin_edit_skill', '/admin/edit/skill/{skill_id}', True, 'GET'),
+    ('admin_edit_certificate', '/admin/edit/certificate/{certificate_id}', True, 'GET'),
+    ('admin_pool_stats', '/admin/db/pool', True, 'GET'),
+    ('admin_jobs', '/admin/jobs', True, 'GET'),
+    ('roadmap_stats', '/admin/roadmap/stats?days=365', True, 'GET'),
+    ('roadmap_stats_json', '/admin/roadmap/stats.json?days=365', True, 'GET'),
+    ('admin_export_data', '/admin/data/export', True, 'GET'),
+    ('metrics', '/metrics', True, 'GET'),
+    # Streams aren't held open while benchmarking (see _env): the poll cost
+    ('todo_events', '/admin/todo/events', True, 'GET'),
+    ('todo_set_active', '/admin/todo/set_active/{todo_id}', True, 'POST'),
+]
+# Slow by design (streams every row); measured with fewer requests
+REQUEST_CAPS = {'admin_export_data': 10}
+# GET endpoints deliberately left out; anything else missing from SCENARIOS
+# is reported so new routes don't silently go unmeasured
+NOT_BENCHMARKED = {
+    'static', 'site.dist_asset', 'site.media_file', 'site.admin_logout',
+    'site.first_time_setup', 'site.admin_job_status',
+}
+
+
+# --- Synthetic Data ---
+def _svg(i):
+    return (f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 24 24">'
+            f'<circle cx="12" cy="12" r="{4 + i % 8}"/></svg>')
+
+def synthetic_records(scale, seed=42):
+    rng = random.Random(seed)
+    for i in range(scale):
+        yield {'type': 'certificate', 'title': f'Certificate {i:06d}',
+               'provider': rng.choice(['Google', 'AWS', 'Microsoft', 'Coursera']),
+               'icon': rng.choice(['fab fa-google', 'fab fa-aws', 'fab fa-microsoft', 'fas fa-award'])}
+    for i in range(scale):
+        yield {'type': 'project', 'title': f'Project {i:06d}', 'role': rng.choice(ROLES),
+               'tech': ', '.join(rng.sample(TECH, rng.randint(3, 6))),
+               'description': ' '.join(rng.choice(TECH).lower() for _ in range(30)),
+               'image': f'https://placehold.co/600x400?text=Project+{i}'}
+    for i in range(scale):
+        # 16 distinct icons, as real skill lists reuse a handful of logos
+        yield {'type': 'skill', 'category': rng.choice(SKILL_CATEGORIES),
+               'name': f'Skill {i:06d}', 'svg': _svg(i % 16)}
+    now = datetime.now(timezone.utc).replace(tzinfo=None, microsecond=0)
+    for i in range(scale):
+        status = 'Active' if i == 0 else rng.choice(['Pending', 'Pending', 'Done'])
+        # A year of history; tasks take minutes to months (log-normal)
+        completed_at = now - timedelta(days=rng.uniform(0, 365))
+        created_at = completed_at - timedelta(hours=rng.lognormvariate(3, 1.5))
+        yield {'type': 'todo', 'task': f'Task {i:06d}', 'category': rng.choice(TODO_CATEGORIES),
+               'status': status, 'created_at': created_at.isoformat(),
+               'completed_at': completed_at.isoformat() if status == 'Done' else None}
+
+
+# --- Child Processes ---
+def _env(database_url, page_cache, media_dir):
+    env = dict(os.environ)
+    env.update(DATABASE_URL=database_url, ADMIN_PASSWORD=ADMIN_PASSWORD,
+               PAGE_CACHE_ENABLED='1' if page_cache else '0', MEDIA_DIR=media_dir,
+               SLOW_REQUEST_MS='100000', SLOW_QUERY_MS='100000',
+               # Background cache warming would compete with the measured requests
+               JOB_RUNNER='none',
+               # A held event stream would tie up a client thread for the whole run
+               TODO_EVENTS_HOLD_SECONDS='0')
+    return env
+
+def _load_app():
+    sys.path.insert(0, HERE)
+    import app as portfolio
+    return portfolio
+
+def seed_command(args):
+    portfolio = _load_app()
+    from models import db
+    from data_io import import_records
+    with portfolio.app.app_context():
+        db.drop_all()
+        portfolio.ensure_schema()
+        import_records(synthetic_records(args.scale), batch_size=2000)
+        portfolio._content_changed()
+
+def _dataset_params(portfolio):
+    from flask import url_for
+    from models import Project, Skill, Certificate, Todo
+    from resume import resumes
+    with portfolio.app.test_request_context():
+        projects = Project.query.order_by(Project.id).limit(portfolio.app.config['LISTING_PAGE_SIZE']).all()
+        pending = Todo.query.filter_by(status='Pending').order_by(Todo.id).first()
+        skill = Skill.query.order_by(Skill.id).first()
+        certificate = Certificate.query.order_by(Certificate.id).first()
+        return {
+            'project_cursor': projects[-1].id if projects else 0,
+            'project_id': projects[0].id if projects else 1,
+            'skill_id': skill.id if skill else 1,
+            'certificate_id': certificate.id if certificate else 1,
+            'todo_id': pending.id if pending else 1,
+            'sprite_url': portfolio._skill_sprite_url(),
+            'resume_url': url_for('site.resume_file', name=resumes.current()[0]),
+        }
+
+def _stats(latencies, errors, elapsed):
+    latencies = sorted(latencies)
+    def pct(p):
+        return round(latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000, 3) if latencies else None
+    return {
+        'requests': len(latencies) + errors,
+        'errors': errors,
+        'rps': round((len(latencies) + errors) / elapsed, 1) if elapsed else None,
+        'mean_ms': round(sum(latencies) / len(latencies) * 1000, 3) if latencies else None,
+        'p50_ms': pct(0.50),
+        'p95_ms': pct(0.95),
+        'p99_ms': pct(0.99),
+    }
+
+def client_command(args):
+    # Runs inside a child process so every dataset gets a fresh app import
+    portfolio = _load_app()
+    app = portfolio.app
+    params = _dataset_params(portfolio)
+    covered = {rule.endpoint for rule in app.url_map.iter_rules() if 'GET' in rule.methods} - NOT_BENCHMARKED
+    results, routes_hit = {}, set()
+
+    public, admin = app.test_client(), app.test_client()
+    with admin.session_transaction() as session:
+        session['logged_in'] = True
+
+    for name, path, needs_admin, method in SCENARIOS:
+        client = admin if needs_admin else public
+        url = path.format(**params)
+        call = client.post if method == 'POST' else client.get
+        for _ in range(args.warmup):
+            call(url).close()
+        latencies, errors = [], 0
+        started = time.perf_counter()
+        for _ in range(min(args.requests, REQUEST_CAPS.get(name, args.requests))):
+            t0 = time.perf_counter()
+            response = call(url)
+            response.get_data()
+            elapsed = time.perf_counter() - t0
+            if response.status_code >= 400:
+                errors += 1
+            else:
+                latencies.append(elapsed)
+            response.close()
+        results[name] = _stats(latencies, errors, time.perf_counter() - started)
+        with app.test_request_context(url.split('?')[0], method=method):
+            from flask import request
+            routes_hit.add(request.url_rule.endpoint if request.url_rule else None)
+
+    with open(args.result, 'w') as f:
+        json.dump({'routes': results, 'unmeasured': sorted(covered - routes_hit)}, f)
+
+
+# --- Gunicorn Mode ---
+def _free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+def _request(port, method, url, cookie=None, body=None):
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+    headers = {'Accept-Encoding': 'gzip, br'}
+    if cookie:
+        headers['Cookie'] = cookie
+    if body is not None:
+        headers['Content-Type'] = 'application/x-www-form-urlencoded'
+    try:
+        conn.request(method, url, body=body, headers=headers)
+        response = conn.getresponse()
+        response.read()
+        return response
+    finally:
+        conn.close()
+
+def _login(port):
+    response = _request(port, 'POST', '/admin/login', body=urlencode({'password': ADMIN_PASSWORD}))
+    cookie = response.getheader('Set-Cookie', '').split(';')[0]
+    if not cookie:
+        raise RuntimeError('Could not log in to the benchmark server')
+    return cookie
+
+def gunicorn_run(env, params, args):
+    port = _free_port()
+    command = [sys.executable, '-m', 'gunicorn', '-w', str(args.workers),
+               '-b', f'127.0.0.1:{port}', '--log-level', 'warning'] + args.gunicorn_arg + ['app:app']
+    server = subprocess.Popen(command, cwd=HERE, env=env, stdout=subprocess.DEVNULL)
+    try:
+        deadline = time.time() + 30
+        while True:
+            try:
+                _request(port, 'GET', '/about')
+                break
+            except OSError:
+                if time.time() > deadline or server.poll() is not None:
+                    raise RuntimeError('gunicorn did not start')
+                time.sleep(0.2)
+        cookie = _login(port)
+        results = {}
+        for name, path, needs_admin, method in SCENARIOS:
+            url = path.format(**params)
+            for _ in range(args.warmup):
+                _request(port, method, url, cookie if needs_admin else None)
+            latencies, errors, lock = [], [0], threading.Lock()
+            total = min(args.requests, REQUEST_CAPS.get(name, args.requests))
+            per_thread = max(1, total // args.concurrency)
+
+            def worker():
+                local, failed = [], 0
+                for _ in range(per_thread):
+                    t0 = time.perf_counter()
+                    try:
+                        status = _request(port, method, url, cookie if needs_admin else None).status
+                    except OSError:
+                        status = 599
+                    if status >= 400:
+                        failed += 1
+                    else:
+                        local.append(time.perf_counter() - t0)
+                with lock:
+                    latencies.extend(local)
+                    errors[0] += failed
+
+            threads = [threading.Thread(target=worker) for _ in range(args.concurrency)]
+            started = time.perf_counter()
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            results[name] = _stats(latencies, errors[0], time.perf_counter() - started)
+        return results
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+
+# --- First Paint ---
+# A headless check without a browser: each public page is fetched the way a
+# navigation would be (over a raw socket, so 103 Early Hints are visible),
+# its <head> is scanned for render-blocking stylesheets and scripts, and
+# first contentful paint is estimated on a throttled link (Lighthouse's
+# mobile profile by default):
+#   html      RTT + server time + HTML bytes / bandwidth
+#   blocking  fetches start once known -- after one RTT when announced by
+#             103 Early Hints, else when the <head> has arrived -- and take
+#             another RTT plus their (shared) bytes / bandwidth
+#   FCP is the later of the two. Fonts use font-display: swap, so they
+#   never block it.
+PAINT_PAGES = ['/', '/about', '/projects', '/skills', '/certificates', '/contact']
+
+class _HeadScanner(HTMLParser):
+    def __init__(self):
+        super().__init__()
+        self.blocking, self.inline_css = [], 0
+        self._in_head, self._in_style, self._noscript = True, False, 0
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == 'body':
+            self._in_head = False
+        elif tag == 'noscript':
+            self._noscript += 1
+        elif tag == 'style':
+            self._in_style = True
+        elif not self._in_head or self._noscript:
+            return
+        elif tag == 'link' and attrs.get('rel') == 'stylesheet':
+            self.blocking.append(attrs['href'])
+        elif tag == 'script' and attrs.get('src') and not {'async', 'defer'} & set(attrs) \
+                and attrs.get('type') != 'module':
+            self.blocking.append(attrs['src'])
+
+    def handle_endtag(self, tag):
+        if tag == 'noscript':
+            self._noscript -= 1
+        elif tag == 'style':
+            self._in_style = False
+
+    def handle_data(self, data):
+        if self._in_style and self._in_head:
+            self.inline_css += len(data.encode('utf-8'))
+
+def _decode(body, encoding):
+    if encoding == 'br':
+        import brotli
+        return brotli.decompress(body)
+    if encoding == 'gzip':
+        import gzip
+        return gzip.decompress(body)
+    return body
+
+def _navigate(port, path):
+    # Returns (early hint links, headers, compressed body, seconds)
+    started = time.perf_counter()
+    with socket.create_connection(('127.0.0.1', port), timeout=30) as sock:
+        sock.sendall(f'GET {path} HTTP/1.1\r\nHost: localhost\r\nAccept: text/html\r\n'
+                     f'Accept-Encoding: br, gzip\r\nConnection: close\r\n\r\n'.encode())
+        data = b''
+        while chunk := sock.recv(65536):
+            data += chunk
+    elapsed = time.perf_counter() - started
+    hints = []
+    while True:
+        head, data = data.split(b'\r\n\r\n', 1)
+        lines = head.decode('latin-1').split('\r\n')
+        headers = {}
+        for line in lines[1:]:
+            name, value = line.split(':', 1)
+            headers.setdefault(name.strip().lower(), []).append(value.strip())
+        if lines[0].split()[1] != '103':
+            return hints, headers, data, elapsed
+        hints += [link for value in headers.get('link', []) for link in value.split(', ')]
+
+def _transfer_size(port, url):
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+    try:
+        conn.request('GET', url, headers={'Accept-Encoding': 'br, gzip'})
+        return len(conn.getresponse().read())
+    finally:
+        conn.close()
+
+def paint_run(env, args):
+    rtt, bytes_per_ms = args.rtt_ms, args.kbps * 1000 / 8 / 1000
+    port = _free_port()
+    command = [sys.executable, '-m', 'gunicorn', '-w', str(args.workers),
+               '-b', f'127.0.0.1:{port}', '--log-level', 'warning'] + args.gunicorn_arg + ['app:app']
+    server = subprocess.Popen(command, cwd=HERE, env=env, stdout=subprocess.DEVNULL)
+    try:
+        deadline = time.time() + 30
+        while True:
+            try:
+                _request(port, 'GET', '/about')
+                break
+            except OSError:
+                if time.time() > deadline or server.poll() is not None:
+                    raise RuntimeError('gunicorn did not start')
+                time.sleep(0.2)
+        results = {}
+        for path in PAINT_PAGES:
+            samples, errors = [], 0
+            for _ in range(args.warmup + min(args.requests, 50)):
+                hints, headers, body, elapsed = _navigate(port, path)
+                html = _decode(body, (headers.get('content-encoding') or [''])[0]).decode('utf-8')
+                scanner = _HeadScanner()
+                scanner.feed(html[:html.find('</head>') + 7])
+                hinted = {link.split('>')[0].lstrip('<') for link in hints}
+                blocking_bytes = sum(_transfer_size(port, url) for url in scanner.blocking)
+                server_ms = elapsed * 1000
+                html_done = rtt + server_ms + len(body) / bytes_per_ms
+                head_arrived = rtt + server_ms + len(body) * html.find('</head>') / len(html) / bytes_per_ms
+                fcp = html_done
+                if scanner.blocking:
+                    start = rtt if hinted >= set(scanner.blocking) else head_arrived
+                    fcp = max(fcp, start + rtt + blocking_bytes / bytes_per_ms)
+                samples.append(fcp / 1000)
+            samples = samples[args.warmup:]
+            stats = _stats(samples, errors, 0)
+            stats.update(rps=None, html_bytes=len(body), inline_css_bytes=scanner.inline_css,
+                         blocking_requests=len(scanner.blocking), blocking_bytes=blocking_bytes,
+                         early_hints=bool(hints))
+            results[path] = stats
+        return results
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+
+# --- Orchestration ---
+def _child(args, database_url, media_dir, *extra):
+    env = _env(database_url, not args.no_page_cache, media_dir)
+    subprocess.run([sys.executable, os.path.abspath(__file__)] + list(extra),
+                   cwd=HERE, env=env, check=True, stdout=subprocess.DEVNULL)
+    return env
+
+def run_suite(args):
+    backends = [('sqlite', None)]
+    if args.postgres:
+        backends.append(('postgresql', args.postgres))
+    runs = []
+    with tempfile.TemporaryDirectory() as tmp:
+        media_dir = os.path.join(tmp, 'media')
+        for backend, url in backends:
+            for scale in args.scales:
+                database_url = url or 'sqlite:///' + os.path.join(tmp, f'bench-{scale}.db')
+                print(f"Seeding {backend} with {scale} rows per table...", file=sys.stderr)
+                started = time.perf_counter()
+                env = _child(args, database_url, media_dir, 'seed', '--scale', str(scale))
+                seed_seconds = round(time.perf_counter() - started, 2)
+
+                for mode in args.modes:
+                    print(f"  {mode} run...", file=sys.stderr)
+                    if mode == 'client':
+                        result_path = os.path.join(tmp, 'client.json')
+                        _child(args, database_url, media_dir, 'client', '--result', result_path,
+                               '--requests', str(args.requests), '--warmup', str(args.warmup))
+                        with open(result_path) as f:
+                            result = json.load(f)
+                        routes = result['routes']
+                        for endpoint in result['unmeasured']:
+                            print(f"  note: no scenario for endpoint {endpoint!r}", file=sys.stderr)
+                    elif mode == 'paint':
+                        routes = paint_run(env, args)
+                    else:
+                        params_path = os.path.join(tmp, 'params.json')
+                        _child(args, database_url, media_dir, 'params', '--result', params_path)
+                        with open(params_path) as f:
+                            params = json.load(f)
+                        for worker_class in args.worker_classes:
+                            print(f"    {worker_class} workers...", file=sys.stderr)
+                            routes = gunicorn_run(dict(env, WEB_WORKER_CLASS=worker_class), params, args)
+                            runs.append({'backend': backend, 'scale': scale, 'mode': mode,
+                                         'worker_class': worker_class,
+                                         'seed_seconds': seed_seconds, 'routes': routes})
+                        continue
+                    runs.append({'backend': backend, 'scale': scale, 'mode': mode,
+                                 'seed_seconds': seed_seconds, 'routes': routes})
+    return runs
+
+def params_command(args):
+    portfolio = _load_app()
+    with open(args.result, 'w') as f:
+        json.dump(_dataset_params(portfolio), f)
+
+def _git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=HERE, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+# --- Reporting and Comparison ---
+def _mode(run):
+    # Runs from before worker classes were compared used sync workers
+    if run['mode'] == 'gunicorn':
+        return f"gunicorn-{run.get('worker_class', 'sync')}"
+    return run['mode']
+
+def _key(run, route):
+    return f"{run['backend']}/{run['scale']}/{_mode(run)}/{route}"
+
+def print_report(runs, out=sys.stdout):
+    for run in runs:
+        print(f"\n{run['backend']} x{run['scale']} ({_mode(run)}), seeded in {run['seed_seconds']}s", file=out)
+        if run['mode'] == 'paint':
+            print(f"  {'page':<26}{'FCP p50':>9}{'FCP p95':>10}{'html B':>9}{'inline B':>10}"
+                  f"{'blocking':>10}{'blocking B':>12}{'103':>5}", file=out)
+            for route, s in run['routes'].items():
+                print(f"  {route:<26}{s['p50_ms']:>9.0f}{s['p95_ms']:>10.0f}{s['html_bytes']:>9}"
+                      f"{s['inline_css_bytes']:>10}{s['blocking_requests']:>10}{s['blocking_bytes']:>12}"
+                      f"{'yes' if s['early_hints'] else 'no':>5}", file=out)
+            continue
+        print(f"  {'route':<26}{'rps':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errors':>8}", file=out)
+        for route, s in run['routes'].items():
+            print(f"  {route:<26}{s['rps'] or 0:>9}{s['p50_ms'] or 0:>10}{s['p95_ms'] or 0:>10}"
+                  f"{s['p99_ms'] or 0:>10}{s['errors']:>8}", file=out)
+
+def compare(runs, baseline, tolerance, min_ms):
+    # Returns a list of human-readable regressions (empty when all is well)
+    old = {_key(run, route): s for run in baseline['runs'] for route, s in run['routes'].items()}
+    problems = []
+    for run in runs:
+        for route, new in run['routes'].items():
+            key = _key(run, route)
+            before = old.get(key)
+            if before is None:
+                continue
+            if new['errors'] > before['errors']:
+                problems.append(f"{key}: errors {before['errors']} -> {new['errors']}")
+            if before['p95_ms'] and new['p95_ms']:
+                limit = before['p95_ms'] * (1 + tolerance)
+                if new['p95_ms'] > limit and new['p95_ms'] - before['p95_ms'] > min_ms:
+                    problems.append(f"{key}: p95 {before['p95_ms']} -> {new['p95_ms']} ms")
+            if before['rps'] and new['rps'] and new['rps'] < before['rps'] * (1 - tolerance):
+                problems.append(f"{key}: throughput {before['rps']} -> {new['rps']} req/s")
+    return problems
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the portfolio app.')
+    sub = parser.add_subparsers(dest='command')
+    # Internal sub-commands, run in child processes
+    seed = sub.add_parser('seed')
+    seed.add_argument('--scale', type=int, required=True)
+    client = sub.add_parser('client')
+    client.add_argument('--result', required=True)
+    client.add_argument('--requests', type=int, default=200)
+    client.add_argument('--warmup', type=int, default=5)
+    params = sub.add_parser('params')
+    params.add_argument('--result', required=True)
+
+    parser.add_argument('--scales', default='10,1000,50000',
+                        type=lambda v: [int(s) for s in v.split(',')], help='Rows per table, comma separated.')
+    parser.add_argument('--modes', default='client,gunicorn', type=lambda v: v.split(','))
+    parser.add_argument('--postgres', help='URL of a scratch Postgres database to benchmark as well.')
+    parser.add_argument('--requests', type=int, default=200, help='Requests per route.')
+    parser.add_argument('--warmup', type=int, default=5, help='Unmeasured requests per route.')
+    parser.add_argument('--concurrency', type=int, default=8, help='Client threads in gunicorn mode.')
+    parser.add_argument('--workers', type=int, default=2, help='gunicorn worker processes.')
+    parser.add_argument('--worker-classes', default='gthread', type=lambda v: v.split(','),
+                        help='gunicorn worker classes to compare (sync, gthread, gevent).')
+    parser.add_argument('--gunicorn-arg', action='append', default=[], help='Extra gunicorn argument (repeatable).')
+    parser.add_argument('--no-page-cache', action='store_true', help='Measure uncached renders.')
+    parser.add_argument('--rtt-ms', type=float, default=150, help='Round trip time for the paint estimate.')
+    parser.add_argument('--kbps', type=float, default=1638.4, help='Bandwidth (kbit/s) for the paint estimate.')
+    parser.add_argument('--out', default='bench_results.json')
+    parser.add_argument('--baseline', help='Earlier results to compare against.')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='Allowed relative slowdown.')
+    parser.add_argument('--min-ms', type=float, default=1.0, help='Ignore p95 changes smaller than this.')
+    args = parser.parse_args(argv)
+
+    if args.command == 'seed':
+        return seed_command(args)
+    if args.command == 'client':
+        return client_command(args)
+    if args.command == 'params':
+        return params_command(args)
+
+    runs = run_suite(args)
+    result = {
+        'meta': {
+            'revision': _git_revision(),
+            'created_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'requests_per_route': args.requests,
+            'concurrency': args.concurrency,
+            'workers': args.workers,
+            'worker_classes': args.worker_classes,
+            'page_cache': not args.no_page_cache,
+        },
+        'runs': runs,
+    }
+    with open(args.out, 'w') as f:
+        json.dump(result, f, indent=2)
+    print_report(runs)
+    print(f"\nWrote {args.out}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            problems = compare(runs, json.load(f), args.tolerance, args.min_ms)
+        if problems:
+            print(f"\n{len(problems)} regression(s) against {args.baseline}:")
+            for problem in problems:
+                print(f"  {problem}")
+            return 1
+        print(f"\nNo regressions against {args.baseline}.")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,178 @@
+import os
+import gzip
+import hashlib
+import threading
+from functools import wraps
+from flask import request, session, make_response
+
+try:
+    import brotli
+except ImportError:  # Brotli is optional, gzip is always available
+    brotli = None
+
+# Response headers worth replaying from the cache (e.g. pagination links)
+CACHED_HEADERS = ('Link',)
+
+
+# --- Cross-Worker Version Stamp ---
+# Each gunicorn worker keeps its own in-memory caches. A tiny file in the
+# instance folder acts as the shared "something changed" signal: bumping it
+# rewrites the file, and every worker compares the file's mtime on lookup
+# (a single stat() call) to decide whether its local copy is stale.
+#
+# `generation` counts the changes this process has seen. Threaded and gevent
+# workers build copies while other requests run, so a copy is only kept if
+# the generation is still the one read before loading its data; otherwise a
+# render that started before an admin write could store stale data after the
+# cache was dropped.
+class VersionStamp:
+    def __init__(self, name):
+        self.name = name
+        self.path = None
+        self.generation = 0
+        self._seen = None
+
+    def init_app(self, app):
+        self.path = os.path.join(app.instance_path, f'{self.name}.stamp')
+        if not os.path.exists(self.path):
+            self.bump()
+
+    def read(self):
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except (OSError, TypeError):
+            return None
+
+    def changed(self):
+        # True on first use and whenever any worker bumped the stamp since
+        current = self.read()
+        if current != self._seen:
+            self._seen = current
+            self.generation += 1
+            return True
+        return False
+
+    def bump(self):
+        self.generation += 1
+        if self.path is None:
+            return
+        try:
+            with open(self.path, 'w') as f:
+                f.write(os.urandom(8).hex())
+            # Force a fresh mtime even on filesystems with coarse timestamps
+            st = os.stat(self.path)
+            os.utime(self.path, ns=(st.st_atime_ns, st.st_mtime_ns + 1))
+        except OSError as e:
+            print(f"Could not bump {self.name} stamp: {e}")
+
+
+# --- Full-Response Page Cache ---
+class PageCache:
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+        self.stamp = VersionStamp('page_cache')
+        self.enabled = True
+        self.max_entries = 512
+
+    def init_app(self, app):
+        self.stamp.init_app(app)
+        self.enabled = app.config.get('PAGE_CACHE_ENABLED', True)
+        self.max_entries = app.config.get('PAGE_CACHE_MAX_ENTRIES', 512)
+        app.extensions['page_cache'] = self
+
+    def _sync(self):
+        if self.stamp.changed():
+            with self._lock:
+                self._entries.clear()
+
+    def get(self, key):
+        self._sync()
+        return self._entries.get(key)
+
+    def generation(self):
+        # Read before rendering and pass to set()
+        self._sync()
+        return self.stamp.generation
+
+    def set(self, key, body, mimetype, headers=(), generation=None):
+        etag = hashlib.sha256(body).hexdigest()[:32]
+        entry = {
+            'mimetype': mimetype,
+            'headers': list(headers),
+            'etag': etag,
+            'identity': body,
+            'gzip': gzip.compress(body, compresslevel=9, mtime=0),
+            'br': brotli.compress(body) if brotli else None,
+        }
+        with self._lock:
+            if generation is not None and generation != self.stamp.generation:
+                return entry  # the cache was dropped while this was rendering
+            # Filter/search query strings make the key space open-ended, so
+            # evict the oldest entries instead of growing without bound
+            while len(self._entries) >= self.max_entries:
+                self._entries.pop(next(iter(self._entries)))
+            self._entries[key] = entry
+        return entry
+
+    def clear(self):
+        # Tell every other worker to drop their copies, then drop this one's.
+        # Bumping first also turns away renders that are still in flight.
+        self.stamp.bump()
+        with self._lock:
+            self._entries.clear()
+
+
+page_cache = PageCache()
+
+
+def _pick_encoding(entry):
+    accepted = request.accept_encodings
+    if entry['br'] is not None and accepted['br']:
+        return 'br'
+    if accepted['gzip']:
+        return 'gzip'
+    return 'identity'
+
+
+def _serve(entry):
+    encoding = _pick_encoding(entry)
+    # Each encoding is a different byte sequence, so it gets its own strong ETag
+    etag = entry['etag'] if encoding == 'identity' else f"{entry['etag']}-{encoding}"
+
+    if request.if_none_match.contains(etag):
+        response = make_response('', 304)
+    else:
+        response = make_response(entry[encoding])
+        response.mimetype = entry['mimetype']
+        if encoding != 'identity':
+            response.headers['Content-Encoding'] = encoding
+
+    for name, value in entry['headers']:
+        response.headers.add(name, value)
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    response.vary.update(('Accept-Encoding', 'Cookie'))
+    return response
+
+
+def cached_page(view):
+    # Serve public GET pages from memory. Admins always get a fresh render
+    # because the layout shows logged-in-only links.
+    @wraps(view)
+    def decorated_function(*args, **kwargs):
+        if (not page_cache.enabled or request.method != 'GET'
+                or session.get('logged_in')):
+            return view(*args, **kwargs)
+
+        key = request.full_path
+        entry = page_cache.get(key)
+        if entry is None:
+            generation = page_cache.generation()
+            response = make_response(view(*args, **kwargs))
+            if response.status_code != 200 or response.direct_passthrough:
+                return response
+            headers = [(k, v) for k, v in response.headers if k in CACHED_HEADERS]
+            entry = page_cache.set(key, response.get_data(), response.mimetype, headers, generation)
+        return _serve(entry)
+    return decorated_function
@@ -11,8 +11,95 @@ ADMIN_PASSWORD = os.environ.get('ADMIN_PASSWORD', 'your_local_default_password')
 # Check if a DATABASE_URL is set in the environment (for Render)
 if os.environ.get('DATABASE_URL'):
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL')
+    # Render hands out postgres:// URLs, which SQLAlchemy no longer accepts;
+    # pin the driver to psycopg2 (what requirements.txt installs)
+    for scheme in ('postgres://', 'postgresql://'):
+        if SQLALCHEMY_DATABASE_URI.startswith(scheme):
+            SQLALCHEMY_DATABASE_URI = 'postgresql+psycopg2://' + SQLALCHEMY_DATABASE_URI[len(scheme):]
 else:
     # Fallback to local SQLite database if no DATABASE_URL is found
     SQLALCHEMY_DATABASE_URI = 'sqlite:///' + os.path.join(BASE_DIR, 'instance', 'portfolio.db')
 
-SQLALCHEMY_TRACK_MODIFICATIONS = False
\ No newline at end of file
+SQLALCHEMY_TRACK_MODIFICATIONS = False
+
+# --- DATABASE ENGINE ---
+# Engine profile: 'postgresql', 'sqlite' or 'none' (SQLAlchemy defaults).
+# Picked from the database URL when unset; see engine.py.
+DB_PROFILE = os.environ.get('DB_PROFILE')
+# Per worker process, so keep pool size x workers under the server's limit
+DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', '5'))
+DB_MAX_OVERFLOW = int(os.environ.get('DB_MAX_OVERFLOW', '5'))
+DB_POOL_TIMEOUT = int(os.environ.get('DB_POOL_TIMEOUT', '10'))
+DB_POOL_RECYCLE = int(os.environ.get('DB_POOL_RECYCLE', '1800'))
+DB_CONNECT_TIMEOUT = int(os.environ.get('DB_CONNECT_TIMEOUT', '5'))
+DB_STATEMENT_TIMEOUT_MS = int(os.environ.get('DB_STATEMENT_TIMEOUT_MS', '15000'))
+
+SQLITE_BUSY_TIMEOUT_MS = int(os.environ.get('SQLITE_BUSY_TIMEOUT_MS', '5000'))
+SQLITE_CACHE_SIZE_KB = int(os.environ.get('SQLITE_CACHE_SIZE_KB', '16000'))
+SQLITE_MMAP_SIZE = int(os.environ.get('SQLITE_MMAP_SIZE', str(256 * 1024 * 1024)))
+
+# --- WEB SERVER ---
+# gunicorn worker class: 'sync', 'gthread' or 'gevent'. Threads (gthread) and
+# connections (gevent) per worker default to what its DB pool can serve; see
+# worker_profile() in engine.py and gunicorn.conf.py.
+WEB_WORKER_CLASS = os.environ.get('WEB_WORKER_CLASS', 'gthread')
+WEB_CONCURRENCY = int(os.environ.get('WEB_CONCURRENCY', '1'))
+WEB_THREADS = int(os.environ.get('WEB_THREADS', '0'))
+WEB_WORKER_CONNECTIONS = int(os.environ.get('WEB_WORKER_CONNECTIONS', '0'))
+
+# --- LISTINGS ---
+# Number of projects/certificates per keyset page
+LISTING_PAGE_SIZE = int(os.environ.get('LISTING_PAGE_SIZE', '24'))
+
+# Rows per page for the lazily loaded admin dashboard sections
+ADMIN_PAGE_SIZE = int(os.environ.get('ADMIN_PAGE_SIZE', '50'))
+
+# Rows per transaction for NDJSON imports
+IMPORT_BATCH_SIZE = int(os.environ.get('IMPORT_BATCH_SIZE', '1000'))
+
+# --- MEDIA ---
+# Uploaded project images, their resized variants and resume versions
+MEDIA_DIR = os.environ.get('MEDIA_DIR') or os.path.join(BASE_DIR, 'instance', 'media')
+MEDIA_MAX_BYTES = int(os.environ.get('MEDIA_MAX_BYTES', str(8 * 1024 * 1024)))
+# Internal nginx location mapped to MEDIA_DIR (e.g. "/_media/"). When set,
+# /media and /resume files are sent by nginx via X-Accel-Redirect.
+MEDIA_ACCEL_REDIRECT = os.environ.get('MEDIA_ACCEL_REDIRECT')
+
+# --- BACKGROUND JOBS ---
+# "thread" runs job workers inside each web process; set JOB_RUNNER=none on
+# the web dyno when a separate `flask run-jobs` process is running
+JOB_RUNNER = os.environ.get('JOB_RUNNER', 'thread')
+JOB_THREADS = int(os.environ.get('JOB_THREADS', '1'))
+JOB_POLL_SECONDS = float(os.environ.get('JOB_POLL_SECONDS', '2'))
+JOB_MAX_ATTEMPTS = int(os.environ.get('JOB_MAX_ATTEMPTS', '3'))
+
+# --- METRICS ---
+# /metrics is open to logged-in admins, or to scrapers sending
+# "Authorization: Bearer <METRICS_TOKEN>" when a token is set
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN')
+METRICS_FLUSH_SECONDS = int(os.environ.get('METRICS_FLUSH_SECONDS', '5'))
+# Requests/queries slower than this are printed to the log
+SLOW_REQUEST_MS = int(os.environ.get('SLOW_REQUEST_MS', '500'))
+SLOW_QUERY_MS = int(os.environ.get('SLOW_QUERY_MS', '100'))
+# Time to first response a process should stay under (see startup.py)
+STARTUP_BUDGET_MS = int(os.environ.get('STARTUP_BUDGET_MS', '1500'))
+
+# --- PAGE CACHE ---
+PAGE_CACHE_ENABLED = os.environ.get('PAGE_CACHE_ENABLED', '1') == '1'
+PAGE_CACHE_MAX_ENTRIES = int(os.environ.get('PAGE_CACHE_MAX_ENTRIES', '512'))
+
+# --- TEMPLATES ---
+# Compiled template bytecode, shared by all workers and kept across restarts
+# (defaults to instance/jinja_cache)
+JINJA_BYTECODE_CACHE_DIR = os.environ.get('JINJA_BYTECODE_CACHE_DIR')
+# {% cache %} fragments (nav, footer, asset links) kept per worker
+FRAGMENT_CACHE_ENABLED = os.environ.get('FRAGMENT_CACHE_ENABLED', '1') == '1'
+FRAGMENT_CACHE_MAX_ENTRIES = int(os.environ.get('FRAGMENT_CACHE_MAX_ENTRIES', '1024'))
+
+# --- LIVE DASHBOARD ---
+# Todo changes kept for dashboards catching up after a reconnect
+TODO_EVENTS_KEEP = int(os.environ.get('TODO_EVENTS_KEEP', '500'))
+# How long /admin/todo/events stays open on threaded/async workers; sync
+# workers answer at once and the browser reconnects after TODO_EVENTS_RETRY_MS
+TODO_EVENTS_HOLD_SECONDS = int(os.environ.get('TODO_EVENTS_HOLD_SECONDS', '55'))
+TODO_EVENTS_RETRY_MS = int(os.environ.get('TODO_EVENTS_RETRY_MS', '3000'))
@@ -0,0 +1,289 @@
+import json
+from collections import OrderedDict
+from datetime import datetime
+from sqlalchemy import insert, update
+from sqlalchemy.exc import SQLAlchemyError
+from models import (
+    db, Project, Tag, Skill, SvgIcon, Certificate, Todo, TodoDailyStat, project_tags,
+    split_tech, tag_slug
+)
+from svg_sprite import minify_svg
+from search import reindex_ids
+
+
+# --- NDJSON Import / Export ---
+# One JSON object per line, each with a "type" of project, skill, certificate
+# or todo. Rows are matched on a natural key instead of their id, so a file
+# exported from one database can be loaded into another (or re-loaded into
+# the same one) without duplicating anything or dropping tables.
+
+NATURAL_KEYS = {
+    'certificate': ('title', 'provider'),
+    'project': ('title',),
+    'skill': ('category', 'name'),
+    'todo': ('task',),
+}
+
+FIELDS = {
+    'certificate': ('title', 'provider', 'icon'),
+    'project': ('title', 'role', 'tech', 'description', 'image'),
+    'skill': ('category', 'name', 'svg'),
+    'todo': ('task', 'category', 'status', 'created_at', 'completed_at'),
+}
+
+# NOT NULL columns with no default; a record missing one can't be inserted
+REQUIRED = {
+    'certificate': ('title', 'provider'),
+    'project': ('title', 'role', 'description'),
+    'skill': ('category', 'name'),
+    'todo': ('task',),
+}
+
+MODELS = {
+    'certificate': Certificate,
+    'project': Project,
+    'skill': Skill,
+    'todo': Todo,
+}
+
+TODO_STATUSES = ('Active', 'Pending', 'Paused', 'Done')
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+# --- Export ---
+def _symbol_to_svg(symbol):
+    return (symbol.replace('<symbol', '<svg xmlns="http://www.w3.org/2000/svg"', 1)
+                  .replace('</symbol>', '</svg>'))
+
+def _iso(value):
+    return value.isoformat() if value else None
+
+def iter_records(batch_size=DEFAULT_BATCH_SIZE):
+    # yield_per keeps memory flat no matter how large the tables are
+    for c in Certificate.query.order_by(Certificate.id).yield_per(batch_size):
+        yield {'type': 'certificate', 'title': c.title, 'provider': c.provider, 'icon': c.icon}
+
+    for p in Project.query.order_by(Project.id).yield_per(batch_size):
+        yield {'type': 'project', 'title': p.title, 'role': p.role, 'tech': p.tech,
+               'description': p.description, 'image': p.image}
+
+    skills = (
+        db.session.query(Skill.category, Skill.name, Skill.svg, SvgIcon.symbol)
+        .outerjoin(SvgIcon, SvgIcon.id == Skill.icon_id)
+        .order_by(Skill.id)
+        .yield_per(batch_size)
+    )
+    for category, name, svg, symbol in skills:
+        yield {'type': 'skill', 'category': category, 'name': name,
+               'svg': _symbol_to_svg(symbol) if symbol else svg}
+
+    for t in Todo.query.order_by(Todo.id).yield_per(batch_size):
+        yield {'type': 'todo', 'task': t.task, 'category': t.category, 'status': t.status,
+               'created_at': _iso(t.created_at), 'completed_at': _iso(t.completed_at)}
+
+def export_ndjson(batch_size=DEFAULT_BATCH_SIZE):
+    for record in iter_records(batch_size):
+        yield json.dumps(record, ensure_ascii=False) + '\n'
+
+
+# --- Import ---
+class NdjsonImporter:
+    # on_conflict maps a record type to 'update' (overwrite the matching row)
+    # or 'skip' (keep it as is); anything not listed defaults to 'update'.
+    def __init__(self, batch_size=DEFAULT_BATCH_SIZE, on_conflict=None):
+        self.batch_size = batch_size
+        self.on_conflict = on_conflict or {}
+        self.buffers = {kind: OrderedDict() for kind in MODELS}
+        self.stats = {kind: {'inserted': 0, 'updated': 0, 'skipped': 0} for kind in MODELS}
+        self._active_claimed = False
+
+    # --- Parsing ---
+    def _prepare(self, record, line_no):
+        kind = record.get('type') if isinstance(record, dict) else None
+        if kind not in MODELS:
+            raise ValueError(f"Line {line_no}: unknown or missing type {kind!r}")
+        row = {field: record[field] for field in FIELDS[kind] if field in record}
+        key = tuple(row.get(field) for field in NATURAL_KEYS[kind])
+        if not all(key):
+            raise ValueError(f"Line {line_no}: {kind} needs {', '.join(NATURAL_KEYS[kind])}")
+        missing = [field for field in REQUIRED[kind] if row.get(field) is None]
+        if missing:
+            raise ValueError(f"Line {line_no}: {kind} is missing {', '.join(missing)}")
+
+        if kind == 'todo':
+            row['status'] = row.get('status') or 'Pending'
+            if row['status'] not in TODO_STATUSES:
+                raise ValueError(f"Line {line_no}: unknown todo status {row['status']!r}")
+            for field in ('created_at', 'completed_at'):
+                if field in row:
+                    try:
+                        row[field] = _parse_datetime(row[field])
+                    except ValueError:
+                        raise ValueError(f"Line {line_no}: bad {field} {row[field]!r}")
+            if row.get('created_at') is None:
+                row.pop('created_at', None)  # let the server default fill it
+        return kind, key, row
+
+    def add(self, record, line_no=0):
+        kind, key, row = self._prepare(record, line_no)
+        buffer = self.buffers[kind]
+        buffer.pop(key, None)  # the last occurrence of a key wins
+        buffer[key] = row
+        if len(buffer) >= self.batch_size:
+            self.flush(kind)
+
+    def finish(self):
+        for kind in MODELS:
+            self.flush(kind)
+        self.refresh_rollups()
+        return self.stats
+
+    def refresh_rollups(self):
+        # Imported rows bypass the per-completion rollup updates. Also called
+        # when an import fails part way, as earlier batches are committed.
+        todos = self.stats['todo']
+        if todos['inserted'] or todos['updated']:
+            try:
+                TodoDailyStat.rebuild()
+                db.session.commit()
+            except Exception:
+                db.session.rollback()
+                raise
+
+    # --- Writing ---
+    def flush(self, kind):
+        rows = self.buffers[kind]
+        if not rows:
+            return
+        self.buffers[kind] = OrderedDict()
+        try:
+            self._write(kind, rows)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+    def _existing_ids(self, kind, keys):
+        model = MODELS[kind]
+        columns = [getattr(model, field) for field in NATURAL_KEYS[kind]]
+        # Narrow on the first key column in SQL, match the full key in Python
+        query = db.session.query(model.id, *columns).filter(columns[0].in_({k[0] for k in keys}))
+        wanted = set(keys)
+        return {tuple(r[1:]): r[0] for r in query.all() if tuple(r[1:]) in wanted}
+
+    def _write(self, kind, rows):
+        model = MODELS[kind]
+        existing = self._existing_ids(kind, rows.keys())
+        mode = self.on_conflict.get(kind, 'update')
+
+        if kind == 'skill':
+            self._store_skill_icons(rows.values())
+        if kind == 'todo':
+            self._claim_active_slot(rows, existing)
+
+        inserts = [row for key, row in rows.items() if key not in existing]
+        updates = []
+        if mode == 'update':
+            updates = [dict(row, id=existing[key]) for key, row in rows.items() if key in existing]
+        else:
+            self.stats[kind]['skipped'] += len(rows) - len(inserts)
+
+        if inserts:
+            db.session.execute(insert(model), inserts)
+        if updates:
+            db.session.execute(update(model), updates)
+        self.stats[kind]['inserted'] += len(inserts)
+        self.stats[kind]['updated'] += len(updates)
+        if inserts or updates:
+            # Core inserts/updates skip the ORM hook that maintains search
+            written = [key for key, row in rows.items() if key not in existing or mode == 'update']
+            reindex_ids(kind, self._existing_ids(kind, written).values())
+
+        if kind == 'project':
+            changed = {row['title']: row.get('tech') for row in inserts + updates if 'tech' in row}
+            if changed:
+                ids = self._existing_ids('project', [(title,) for title in changed])
+                _sync_project_tags({ids[(title,)]: tech for title, tech in changed.items()})
+
+    def _store_skill_icons(self, rows):
+        icons = {}
+        for row in rows:
+            if 'svg' not in row:
+                continue
+            if row['svg'] and row['svg'].strip():
+                icon_id, symbol = minify_svg(row['svg'])
+                icons[icon_id] = symbol
+                row['icon_id'] = icon_id
+            else:
+                row['icon_id'] = None
+            row['svg'] = None
+        if icons:
+            known = {i for (i,) in db.session.query(SvgIcon.id).filter(SvgIcon.id.in_(icons))}
+            missing = [{'id': i, 'symbol': s} for i, s in icons.items() if i not in known]
+            if missing:
+                db.session.execute(insert(SvgIcon), missing)
+
+    def _claim_active_slot(self, rows, existing):
+        # Only one task may be Active. The first Active record in the import
+        # takes the slot from whatever holds it now; later ones are queued.
+        for key, row in rows.items():
+            if row['status'] != 'Active':
+                continue
+            if self._active_claimed:
+                row['status'] = 'Pending'
+                continue
+            self._active_claimed = True
+            Todo.query.filter(
+                Todo.status.in_(('Active', 'Paused')), Todo.id != existing.get(key, -1)
+            ).update({'status': 'Pending'}, synchronize_session=False)
+
+
+def _parse_datetime(value):
+    if not value:
+        return None
+    if isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(value)
+
+def _sync_project_tags(project_techs):
+    # project_techs: {project_id: tech string}
+    db.session.execute(project_tags.delete().where(project_tags.c.project_id.in_(list(project_techs))))
+    tags = Tag.for_names([name for tech in project_techs.values() for name in split_tech(tech)])
+    db.session.flush()
+    slug_ids = {tag.slug: tag.id for tag in tags}
+    links = []
+    for project_id, tech in project_techs.items():
+        tag_ids = {slug_ids[tag_slug(name)] for name in split_tech(tech) if tag_slug(name) in slug_ids}
+        links += [{'project_id': project_id, 'tag_id': tag_id} for tag_id in tag_ids]
+    if links:
+        db.session.execute(project_tags.insert(), links)
+
+def _decode(line):
+    return line.decode('utf-8') if isinstance(line, bytes) else line
+
+def import_ndjson(lines, batch_size=DEFAULT_BATCH_SIZE, on_conflict=None):
+    # `lines` can be any iterable of str/bytes (an open file, a request
+    # stream); it is consumed one line at a time and never held in memory.
+    importer = NdjsonImporter(batch_size=batch_size, on_conflict=on_conflict)
+    try:
+        for line_no, line in enumerate(lines, start=1):
+            line = _decode(line).strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Line {line_no}: invalid JSON ({e.msg})")
+            importer.add(record, line_no)
+        return importer.finish()
+    except (ValueError, SQLAlchemyError):
+        importer.refresh_rollups()
+        raise
+
+def import_records(records, batch_size=DEFAULT_BATCH_SIZE, on_conflict=None):
+    # Same as import_ndjson but for already-parsed dicts (e.g. the seed files)
+    importer = NdjsonImporter(batch_size=batch_size, on_conflict=on_conflict)
+    for record in records:
+        importer.add(record)
+    return importer.finish()
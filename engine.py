@@ -0,0 +1,206 @@
+import time
+import threading
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeout
+from sqlalchemy.pool import QueuePool
+
+
+# --- Engine Profiles ---
+# Picks SQLALCHEMY_ENGINE_OPTIONS for the configured backend. Postgres gets a
+# small, pre-pinged, recycled pool with server-side timeouts so a restart
+# doesn't open a burst of connections or leave stuck ones behind. SQLite gets
+# WAL and friends (see sqlite_pragmas) so admin writes don't block readers.
+
+PROFILES = ('postgresql', 'sqlite', 'none')
+
+
+def detect_profile(uri):
+    backend = make_url(uri).get_backend_name()
+    return backend if backend in PROFILES else 'none'
+
+
+def _is_memory_sqlite(uri):
+    return make_url(uri).database in (None, '', ':memory:')
+
+
+def engine_options(config):
+    uri = config['SQLALCHEMY_DATABASE_URI']
+    profile = config.get('DB_PROFILE') or detect_profile(uri)
+    if profile not in PROFILES:
+        raise ValueError(f"Unknown DB_PROFILE {profile!r}; use one of {', '.join(PROFILES)}")
+
+    if profile == 'postgresql':
+        timeout_ms = config['DB_STATEMENT_TIMEOUT_MS']
+        return profile, {
+            'poolclass': TimedQueuePool,
+            'pool_size': config['DB_POOL_SIZE'],
+            'max_overflow': config['DB_MAX_OVERFLOW'],
+            'pool_timeout': config['DB_POOL_TIMEOUT'],
+            'pool_recycle': config['DB_POOL_RECYCLE'],
+            'pool_pre_ping': True,
+            # Reuse the most recent connection so idle extras can time out
+            'pool_use_lifo': True,
+            'connect_args': {
+                'connect_timeout': config['DB_CONNECT_TIMEOUT'],
+                'application_name': 'portfolio',
+                'options': (f'-c statement_timeout={timeout_ms} '
+                            f'-c idle_in_transaction_session_timeout={timeout_ms * 2}'),
+            },
+        }
+    if profile == 'sqlite' and not _is_memory_sqlite(uri):
+        return profile, {
+            'poolclass': TimedQueuePool,
+            'pool_size': config['DB_POOL_SIZE'],
+            'max_overflow': config['DB_MAX_OVERFLOW'],
+            'pool_timeout': config['DB_POOL_TIMEOUT'],
+            # Lock waits are handled by the busy_timeout pragma
+            'connect_args': {'check_same_thread': False},
+        }
+    return profile, {}
+
+
+def configure_engine(app):
+    # Call before db.init_app(); explicit SQLALCHEMY_ENGINE_OPTIONS win
+    profile, options = engine_options(app.config)
+    app.config['DB_PROFILE'] = profile
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {**options, **app.config.get('SQLALCHEMY_ENGINE_OPTIONS', {})}
+    return profile
+
+
+# --- Worker Profiles ---
+# gunicorn settings for WEB_WORKER_CLASS. A request holds one pooled
+# connection for as long as it uses the database, so a gthread worker gets
+# one thread per connection its pool can hand out (less the in-process job
+# threads): more threads would only queue on the pool for up to
+# DB_POOL_TIMEOUT. gevent greenlets spend most of their time on slow clients
+# and idle event streams, which hold no connection, so a gevent worker
+# accepts GEVENT_CONNECTIONS_PER_SLOT times as many and lets the pool queue
+# the rest cooperatively.
+
+WORKER_CLASSES = ('sync', 'gthread', 'gevent')
+GEVENT_CONNECTIONS_PER_SLOT = 10
+
+
+def pool_slots(config):
+    # Connections one worker process can give to requests at the same time
+    slots = config['DB_POOL_SIZE'] + config['DB_MAX_OVERFLOW']
+    if config.get('JOB_RUNNER', 'thread') == 'thread':
+        slots -= config.get('JOB_THREADS', 1)
+    return max(slots, 1)
+
+
+def worker_profile(config):
+    worker_class = config['WEB_WORKER_CLASS']
+    if worker_class not in WORKER_CLASSES:
+        raise ValueError(f"Unknown WEB_WORKER_CLASS {worker_class!r}; use one of {', '.join(WORKER_CLASSES)}")
+    slots = pool_slots(config)
+    profile = {'worker_class': worker_class, 'workers': config['WEB_CONCURRENCY'], 'threads': 1}
+    if worker_class == 'gthread':
+        profile['threads'] = config['WEB_THREADS'] or slots
+        if profile['threads'] > slots:
+            print(f"WEB_THREADS={profile['threads']} exceeds the {slots} pooled connections per worker; "
+                  f"extra requests will wait up to DB_POOL_TIMEOUT for one")
+    elif worker_class == 'gevent':
+        profile['worker_connections'] = (config['WEB_WORKER_CONNECTIONS']
+                                         or slots * GEVENT_CONNECTIONS_PER_SLOT)
+    return profile
+
+
+# --- SQLite Pragmas ---
+def sqlite_pragmas(config):
+    return (
+        ('journal_mode', 'WAL'),  # readers don't wait for the writer
+        ('synchronous', 'NORMAL'),  # durable at checkpoints, safe with WAL
+        ('busy_timeout', config['SQLITE_BUSY_TIMEOUT_MS']),
+        ('cache_size', -config['SQLITE_CACHE_SIZE_KB']),  # negative = KiB
+        ('mmap_size', config['SQLITE_MMAP_SIZE']),
+        ('temp_store', 'MEMORY'),
+    )
+
+def _install_sqlite_pragmas(engine, pragmas):
+    @event.listens_for(engine, 'connect')
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas:
+                cursor.execute(f'PRAGMA {name}={value}')
+        finally:
+            cursor.close()
+
+
+# --- Pool Statistics ---
+class TimedQueuePool(QueuePool):
+    # Records how long each checkout waited for a free (or new) connection
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeout:
+            pool_stats.record('timeouts')
+            raise
+        finally:
+            pool_stats.record_wait(time.perf_counter() - start)
+
+
+class PoolStats:
+    COUNTERS = ('connects', 'checkouts', 'checkins', 'invalidations', 'timeouts', 'waits')
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.engine = None
+        self.profile = None
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.counts = dict.fromkeys(self.COUNTERS, 0)
+            self.wait_total = 0.0
+            self.wait_max = 0.0
+
+    def init_app(self, app, db):
+        # Call after db.init_app(); hooks the engine's pool events
+        self.profile = app.config.get('DB_PROFILE')
+        with app.app_context():
+            self.engine = db.engine
+        if self.profile == 'sqlite' and not _is_memory_sqlite(str(self.engine.url)):
+            _install_sqlite_pragmas(self.engine, sqlite_pragmas(app.config))
+        event.listen(self.engine, 'connect', lambda *a: self.record('connects'))
+        event.listen(self.engine, 'checkout', lambda *a: self.record('checkouts'))
+        event.listen(self.engine, 'checkin', lambda *a: self.record('checkins'))
+        event.listen(self.engine, 'invalidate', lambda *a: self.record('invalidations'))
+        app.extensions['pool_stats'] = self
+
+    def after_fork(self):
+        # A forked worker must not reuse the parent's sockets: drop the
+        # inherited pool without closing the parent's connections
+        if self.engine is not None:
+            self.engine.dispose(close=False)
+        self.reset()
+
+    def record(self, counter):
+        with self._lock:
+            self.counts[counter] += 1
+
+    def record_wait(self, seconds):
+        with self._lock:
+            self.counts['waits'] += 1
+            self.wait_total += seconds
+            self.wait_max = max(self.wait_max, seconds)
+
+    def snapshot(self):
+        pool = self.engine.pool if self.engine is not None else None
+        with self._lock:
+            waited = self.counts['waits'] or 1
+            data = dict(self.counts)
+            data['wait_ms_avg'] = round(self.wait_total * 1000 / waited, 3)
+            data['wait_ms_max'] = round(self.wait_max * 1000, 3)
+        data['profile'] = self.profile
+        data['pool'] = type(pool).__name__ if pool is not None else None
+        if isinstance(pool, QueuePool):
+            data.update(size=pool.size(), checked_out=pool.checkedout(),
+                        idle=pool.checkedin(), overflow=max(pool.overflow(), 0))
+        return data
+
+
+pool_stats = PoolStats()
@@ -0,0 +1,129 @@
+import json
+import time
+from sqlalchemy import delete, func, or_
+from cache import VersionStamp
+from models import db, TodoEvent
+from jobs import utcnow
+
+
+# --- Live Todo Events ---
+# Every todo change is written to todo_event as a small JSON list of the rows
+# it touched (their new HTML, or a deletion), and the version stamp is bumped
+# so streams in every gunicorn worker notice with a stat() instead of polling
+# the table. /admin/todo/events replays them to open dashboards as
+# Server-Sent Events, resuming from Last-Event-ID after a reconnect. Only the
+# last `keep` events are stored; a client that fell further behind is told
+# to reload instead.
+#
+# A held stream ties up whatever serves it, so they are only held open on
+# threaded or async workers (wsgi.multithread). A sync worker answers with
+# whatever is pending and the browser reconnects after `retry` ms, which
+# turns the stream into cheap polling.
+#
+# Ids are handed out when an event is flushed but become visible when it
+# commits, and on Postgres a lower id can commit after a higher one. So a
+# stream remembers the ids it skipped over ("gaps") and looks for them again
+# on later polls, until they fall `gap_window` ids behind (rolled back). The
+# gaps travel in the SSE id ("<after>:<gap>,<gap>"), so a reconnect keeps
+# looking for them too.
+
+class TodoEventLog:
+    def __init__(self):
+        self.stamp = VersionStamp('todo_events')
+        self.keep = 500
+        self.hold_seconds = 55
+        self.poll_seconds = 0.5
+        self.heartbeat_seconds = 15
+        self.retry_ms = 3000
+        self.gap_window = 100
+
+    def init_app(self, app):
+        self.stamp.init_app(app)
+        self.keep = app.config.get('TODO_EVENTS_KEEP', self.keep)
+        self.hold_seconds = app.config.get('TODO_EVENTS_HOLD_SECONDS', self.hold_seconds)
+        self.retry_ms = app.config.get('TODO_EVENTS_RETRY_MS', self.retry_ms)
+        app.extensions['todo_events'] = self
+
+    # --- Producing ---
+    def publish(self, changes):
+        # Commits the current session
+        if not changes:
+            return None
+        event = TodoEvent(created_at=utcnow(), payload=json.dumps(changes))
+        db.session.add(event)
+        db.session.flush()
+        db.session.execute(delete(TodoEvent).where(TodoEvent.id <= event.id - self.keep))
+        db.session.commit()
+        self.stamp.bump()
+        return event.id
+
+    # --- Consuming ---
+    def latest_id(self):
+        return db.session.query(func.max(TodoEvent.id)).scalar() or 0
+
+    def since(self, after, gaps=()):
+        # [(id, payload)] after `after` plus any of the `gaps` that have
+        # committed since, or None when the client can't catch up: events
+        # after `after` were pruned, or the table was reset (reseed)
+        wanted = TodoEvent.id > after
+        if gaps:
+            wanted = or_(wanted, TodoEvent.id.in_(sorted(gaps)))
+        rows = (db.session.query(TodoEvent.id, TodoEvent.payload)
+                .filter(wanted).order_by(TodoEvent.id).all())
+        if any(row.id == after + 1 for row in rows):
+            return rows
+        # publish() keeps ids above newest - keep; anything missing above
+        # that is still in flight (or rolled back), not pruned
+        newest = db.session.query(func.max(TodoEvent.id)).scalar() or 0
+        if newest < after or after + 1 <= newest - self.keep:
+            return None
+        return rows
+
+    @staticmethod
+    def cursor(after, gaps):
+        return f"{after}:{','.join(map(str, sorted(gaps)))}" if gaps else str(after)
+
+    @staticmethod
+    def parse_cursor(value):
+        # (after, gaps) from an SSE id, or None when it isn't one of ours
+        after, _, gaps = (value or '').partition(':')
+        try:
+            return int(after), {int(gap) for gap in gaps.split(',') if gap}
+        except ValueError:
+            return None
+
+    def stream(self, after, hold, gaps=()):
+        # Yields SSE text. Each poll releases its connection, so an idle
+        # stream doesn't pin one of the pool's slots.
+        yield f'retry: {self.retry_ms}\n\n'
+        gaps = set(gaps)
+        deadline = time.monotonic() + (self.hold_seconds if hold else 0)
+        heartbeat = time.monotonic() + self.heartbeat_seconds
+        seen = None
+        while True:
+            version = self.stamp.read()
+            if version != seen:
+                seen = version
+                try:
+                    rows = self.since(after, gaps)
+                finally:
+                    db.session.remove()
+                if rows is None:
+                    yield 'event: reload\ndata: {}\n\n'
+                    return
+                for event_id, payload in rows:
+                    if event_id > after:
+                        gaps.update(range(after + 1, event_id))
+                        after = event_id
+                    gaps.discard(event_id)
+                    gaps = {gap for gap in gaps if gap > after - self.gap_window}
+                    yield f'id: {self.cursor(after, gaps)}\nevent: todo\ndata: {payload}\n\n'
+            if time.monotonic() >= deadline:
+                return
+            if time.monotonic() >= heartbeat:
+                heartbeat = time.monotonic() + self.heartbeat_seconds
+                yield ': keep-alive\n\n'
+            time.sleep(self.poll_seconds)
+
+
+todo_events = TodoEventLog()
@@ -0,0 +1,172 @@
+import os
+import re
+import glob
+import shutil
+
+
+# --- Self-Hosted Font Subsets ---
+# `flask build-fonts` cuts Inter down to the Latin range and Font Awesome
+# down to the icons the site actually uses, then writes the woff2 files to
+# static/fonts/ along with the matching fonts.css/icons.css (both pulled into
+# main.css via @import). Needs fontTools + brotli at build time only; the
+# generated files are committed, so the app itself has no new dependency.
+# Re-run it after using a new icon class anywhere (templates, JS, seed data
+# or a certificate's icon field).
+
+# Same range Google Fonts serves as the "latin" subset
+LATIN_RANGE = (
+    'U+0000-00FF, U+0131, U+0152-0153, U+02BB-02BC, U+02C6, U+02DA, U+02DC, '
+    'U+0304, U+0308, U+0329, U+2000-206F, U+2074, U+20AC, U+2122, U+2191, '
+    'U+2193, U+2212, U+2215, U+FEFF, U+FFFD'
+)
+# Weight -> file name stem in the Inter release (woff2 or ttf)
+INTER_WEIGHTS = {400: 'Inter-Regular', 500: 'Inter-Medium', 600: 'Inter-SemiBold', 700: 'Inter-Bold'}
+
+# Font Awesome style prefix -> (font file, CSS family, weight)
+FA_STYLES = {
+    'solid': ('fa-solid-900', 'Font Awesome 6 Free', 900),
+    'regular': ('fa-regular-400', 'Font Awesome 6 Free', 400),
+    'brands': ('fa-brands-400', 'Font Awesome 6 Brands', 400),
+}
+FA_PREFIXES = {
+    'fas': 'solid', 'fa-solid': 'solid',
+    'far': 'regular', 'fa-regular': 'regular',
+    'fab': 'brands', 'fa-brands': 'brands',
+}
+# Icons certificate providers commonly use, kept so that adding a
+# certificate in the admin panel doesn't need a font rebuild
+EXTRA_ICONS = (
+    'fab fa-google', 'fab fa-aws', 'fab fa-microsoft', 'fab fa-python',
+    'fab fa-linkedin', 'fab fa-github', 'fab fa-docker', 'fab fa-js',
+    'fas fa-certificate', 'fas fa-award', 'fas fa-database', 'fas fa-chart-line',
+)
+
+_ICON_RE = re.compile(r'\b(fas|far|fab|fa-solid|fa-regular|fa-brands)\s+fa-([a-z0-9-]+)')
+_GLYPH_RE = re.compile(r'\.fa-([a-z0-9-]+)::?before\s*\{\s*content:\s*"\\([0-9a-f]+)"')
+_SCAN_PATTERNS = ('templates/*.html', 'static/js/*.js', 'data/*.json')
+
+
+def find_icons(root, extra_sources=()):
+    # Returns {style: {icon name, ...}} for every "fas fa-x" style reference
+    texts = list(extra_sources) + list(EXTRA_ICONS)
+    for pattern in _SCAN_PATTERNS:
+        for path in glob.glob(os.path.join(root, pattern)):
+            with open(path, encoding='utf-8', errors='ignore') as f:
+                texts.append(f.read())
+    icons = {}
+    for text in texts:
+        for prefix, name in _ICON_RE.findall(text or ''):
+            icons.setdefault(FA_PREFIXES[prefix], set()).add(name)
+    return icons
+
+
+def _find_file(directory, stem):
+    for ext in ('.woff2', '.ttf', '.otf'):
+        matches = glob.glob(os.path.join(directory, '**', stem + ext), recursive=True)
+        if matches:
+            return matches[0]
+    raise FileNotFoundError(f"{stem}.woff2/.ttf not found under {directory}")
+
+
+def _subset(source, target, unicodes=None, text_range=None):
+    from fontTools import subset
+    options = subset.Options()
+    options.flavor = 'woff2'
+    options.layout_features = ['kern', 'liga', 'calt', 'tnum'] if text_range else []
+    options.name_IDs = [0, 1, 2]  # copyright and family names only
+    font = subset.load_font(source, options)
+    subsetter = subset.Subsetter(options)
+    if text_range:
+        unicodes = subset.parse_unicodes(text_range.replace('U+', '').replace(' ', ''))
+    subsetter.populate(unicodes=unicodes)
+    subsetter.subset(font)
+    subset.save_font(font, target, options)
+    return os.path.getsize(target)
+
+
+def _copy_license(source_dir, target):
+    for name in ('LICENSE.txt', 'LICENSE', 'OFL.txt', 'LICENSE.md'):
+        matches = glob.glob(os.path.join(source_dir, '**', name), recursive=True)
+        if matches:
+            shutil.copyfile(matches[0], target)
+            return
+
+
+def build_inter(inter_dir, static_dir):
+    fonts_dir = os.path.join(static_dir, 'fonts')
+    os.makedirs(fonts_dir, exist_ok=True)
+    rules = ['/* Generated by `flask build-fonts`; do not edit. */']
+    sizes = {}
+    for weight, stem in INTER_WEIGHTS.items():
+        name = f'inter-{weight}.woff2'
+        sizes[name] = _subset(_find_file(inter_dir, stem), os.path.join(fonts_dir, name), text_range=LATIN_RANGE)
+        rules.append(
+            '@font-face {\n'
+            "    font-family: 'Inter';\n"
+            '    font-style: normal;\n'
+            f'    font-weight: {weight};\n'
+            '    font-display: swap;\n'
+            f"    src: url('../fonts/{name}') format('woff2');\n"
+            f'    unicode-range: {LATIN_RANGE};\n'
+            '}'
+        )
+    with open(os.path.join(static_dir, 'css', 'fonts.css'), 'w') as f:
+        f.write('\n'.join(rules) + '\n')
+    _copy_license(inter_dir, os.path.join(fonts_dir, 'LICENSE-Inter.txt'))
+    return sizes
+
+
+def build_icons(fa_dir, static_dir, icons):
+    # `fa_dir` is a Font Awesome Free download (css/all.css + webfonts/)
+    with open(_find_file_named(fa_dir, 'all.css'), encoding='utf-8') as f:
+        codepoints = dict(_GLYPH_RE.findall(f.read()))
+
+    missing = sorted(name for names in icons.values() for name in names if name not in codepoints)
+    if missing:
+        raise ValueError(f"Unknown Font Awesome icon(s): {', '.join(missing)}")
+
+    fonts_dir = os.path.join(static_dir, 'fonts')
+    os.makedirs(fonts_dir, exist_ok=True)
+    rules = [
+        '/* Generated by `flask build-fonts`; do not edit. */',
+        '.fas, .far, .fab, .fa-solid, .fa-regular, .fa-brands {\n'
+        '    -moz-osx-font-smoothing: grayscale;\n'
+        '    -webkit-font-smoothing: antialiased;\n'
+        '    display: inline-block;\n'
+        '    font-style: normal;\n'
+        '    font-variant: normal;\n'
+        '    line-height: 1;\n'
+        '    text-rendering: auto;\n'
+        '}',
+    ]
+    sizes = {}
+    for style, names in sorted(icons.items()):
+        font_stem, family, weight = FA_STYLES[style]
+        name = f'{font_stem}.woff2'
+        unicodes = sorted({int(codepoints[n], 16) for n in names})
+        sizes[name] = _subset(_find_file(fa_dir, font_stem), os.path.join(fonts_dir, name), unicodes=unicodes)
+        selectors = ', '.join(f'.{p}' for p, s in FA_PREFIXES.items() if s == style)
+        rules.append(
+            '@font-face {\n'
+            f"    font-family: '{family}';\n"
+            '    font-style: normal;\n'
+            f'    font-weight: {weight};\n'
+            '    font-display: block;\n'
+            f"    src: url('../fonts/{name}') format('woff2');\n"
+            '}\n'
+            f"{selectors} {{ font-family: '{family}'; font-weight: {weight}; }}"
+        )
+    for name in sorted({n for names in icons.values() for n in names}):
+        rules.append(f'.fa-{name}::before {{ content: "\\{codepoints[name]}"; }}')
+
+    with open(os.path.join(static_dir, 'css', 'icons.css'), 'w') as f:
+        f.write('\n'.join(rules) + '\n')
+    _copy_license(fa_dir, os.path.join(fonts_dir, 'LICENSE-FontAwesome.txt'))
+    return sizes
+
+
+def _find_file_named(directory, name):
+    matches = glob.glob(os.path.join(directory, '**', name), recursive=True)
+    if not matches:
+        raise FileNotFoundError(f"{name} not found under {directory}")
+    return matches[0]
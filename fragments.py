@@ -0,0 +1,86 @@
+import os
+import threading
+from jinja2 import FileSystemBytecodeCache, nodes
+from jinja2.ext import Extension
+
+# Bump when the {% cache %} tag compiles differently: Jinja only checks the
+# template source, not the extensions, before reusing cached bytecode
+BYTECODE_TAG = 'frag1'
+
+
+# --- Template Fragment Cache ---
+# {% cache 'nav', request.path, session.logged_in %}...{% endcache %} renders
+# its body once per key and replays the HTML afterwards. Keys always include
+# the tag's position and the page template being rendered, plus the values
+# given. Fragments may only depend on those values, the asset manifest and
+# the templates themselves, none of which change during a worker's lifetime,
+# so entries never need invalidating; the cache is simply bounded.
+class FragmentCacheExtension(Extension):
+    tags = {'cache'}
+
+    def __init__(self, environment):
+        super().__init__(environment)
+        environment.extend(fragment_cache=None)
+
+    def parse(self, parser):
+        lineno = next(parser.stream).lineno
+        args = [parser.parse_expression()]
+        while parser.stream.skip_if('comma'):
+            args.append(parser.parse_expression())
+        body = parser.parse_statements(('name:endcache',), drop_needle=True)
+        site = nodes.Const(f'{parser.name}:{lineno}')
+        call = self.call_method('_render', [nodes.ContextReference(), site, nodes.List(args)])
+        return nodes.CallBlock(call, [], [], body).set_lineno(lineno)
+
+    def _render(self, context, site, parts, caller):
+        store = self.environment.fragment_cache
+        # auto_reload means templates may change under us (debug mode)
+        if store is None or not store.enabled or self.environment.auto_reload:
+            return caller()
+        key = (site, context.name, *parts)
+        html = store.get(key)
+        if html is None:
+            html = store.set(key, caller())
+        return html
+
+
+class FragmentCache:
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+        self.enabled = True
+        self.max_entries = 1024
+        self.bytecode_dir = None
+
+    def init_app(self, app):
+        self.enabled = app.config.get('FRAGMENT_CACHE_ENABLED', True)
+        self.max_entries = app.config.get('FRAGMENT_CACHE_MAX_ENTRIES', 1024)
+        # Compiled templates go to disk, so restarted or newly spawned
+        # workers load them instead of compiling every template again
+        self.bytecode_dir = (app.config.get('JINJA_BYTECODE_CACHE_DIR')
+                             or os.path.join(app.instance_path, 'jinja_cache'))
+        os.makedirs(self.bytecode_dir, exist_ok=True)
+        app.jinja_env.bytecode_cache = FileSystemBytecodeCache(
+            self.bytecode_dir, f'__jinja2_{BYTECODE_TAG}_%s.cache')
+        app.jinja_env.add_extension(FragmentCacheExtension)
+        app.jinja_env.fragment_cache = self
+        app.extensions['fragment_cache'] = self
+
+    def get(self, key):
+        return self._entries.get(key)
+
+    def set(self, key, html):
+        with self._lock:
+            # request.path is part of most keys, so unknown URLs (404s)
+            # would otherwise grow the cache without bound
+            while len(self._entries) >= self.max_entries:
+                self._entries.pop(next(iter(self._entries)))
+            self._entries[key] = html
+        return html
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+fragment_cache = FragmentCache()
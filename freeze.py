@@ -0,0 +1,170 @@
+import os
+import gzip
+import shutil
+from flask import url_for
+
+try:
+    import brotli
+except ImportError:  # Brotli is optional, gzip is always available
+    brotli = None
+
+
+# --- Static Site Export ---
+# Renders the public pages to plain files so nginx or a CDN can serve them
+# without touching Python. Flask is then only needed for /admin, /api and any
+# URL with a query string (filters, pagination). Example nginx setup:
+#
+#   location / {
+#       gzip_static on;
+#       brotli_static on;
+#       if ($args) { proxy_pass http://flask; }
+#       try_files $uri $uri/index.html @flask;
+#   }
+#   location = /download-resume {
+#       default_type application/pdf;
+#       add_header Content-Disposition 'attachment; filename="RayyanKauchali_Resume-1.pdf"';
+#   }
+#   location /resume/ {
+#       default_type application/pdf;
+#       add_header Cache-Control "public, max-age=31536000, immutable";
+#   }
+#   location /static/dist/ {
+#       gzip_static on;
+#       brotli_static on;
+#       add_header Cache-Control "public, max-age=31536000, immutable";
+#   }
+#   location ~ ^/(admin|api)/ { proxy_pass http://flask; }
+#   location @flask { proxy_pass http://flask; }
+
+PUBLIC_PAGES = ['/', '/about', '/projects', '/skills', '/certificates', '/contact']
+
+# Which exported files depend on which model. Project and skill counts show on
+# the home page; the sprite sheet is rebuilt whenever skills change.
+AFFECTED_PAGES = {
+    'project': ['/', '/projects'],
+    'skill': ['/', '/skills', 'sprite'],
+    'certificate': ['/certificates'],
+}
+
+COMPRESSIBLE = ('.html', '.css', '.js', '.svg', '.json', '.txt')
+
+
+def _target(out_dir, path):
+    if path == '/':
+        return os.path.join(out_dir, 'index.html')
+    return os.path.join(out_dir, path.strip('/'), 'index.html')
+
+
+def _write(target, body, compress=True):
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    with open(target, 'wb') as f:
+        f.write(body)
+    if compress:
+        with open(target + '.gz', 'wb') as f:
+            f.write(gzip.compress(body, compresslevel=9, mtime=0))
+        if brotli:
+            with open(target + '.br', 'wb') as f:
+                f.write(brotli.compress(body))
+
+
+def _fetch(client, path):
+    response = client.get(path, headers={'Accept-Encoding': 'identity'})
+    if response.status_code != 200:
+        raise RuntimeError(f'{path} returned {response.status_code}')
+    return response.get_data()
+
+
+def _export_sprite(app, client, out_dir):
+    from app import _skill_sprite_url
+    with app.test_request_context():
+        url = _skill_sprite_url()
+    _write(os.path.join(out_dir, url.lstrip('/')), _fetch(client, url))
+    return url
+
+
+def _export_static(app, out_dir):
+    static_out = os.path.join(out_dir, 'static')
+    if os.path.exists(static_out):
+        shutil.rmtree(static_out)
+    count = 0
+    for root, _, files in os.walk(app.static_folder):
+        for name in files:
+            source = os.path.join(root, name)
+            target = os.path.join(static_out, os.path.relpath(source, app.static_folder))
+            with open(source, 'rb') as f:
+                _write(target, f.read(), compress=name.endswith(COMPRESSIBLE))
+            count += 1
+    return count
+
+
+def _export_media(out_dir):
+    from media import media_store
+    media_out = os.path.join(out_dir, 'media')
+    os.makedirs(media_out, exist_ok=True)
+    count = 0
+    for folder in (media_store.originals_dir, media_store.variants_dir):
+        for name in os.listdir(folder):
+            target = os.path.join(media_out, name)
+            if not os.path.exists(target):
+                shutil.copyfile(os.path.join(folder, name), target)
+                count += 1
+    return count
+
+
+def _export_resume(app, out_dir):
+    # The current version at its hashed URL, and a copy at /download-resume
+    # since a static host can't redirect to it
+    from media import media_store
+    from resume import resumes
+    with app.test_request_context():
+        current = resumes.current()
+        if current is None:
+            print("Resume file not found, skipping.")
+            return
+        url = url_for('site.resume_file', name=current[0])
+    with open(os.path.join(media_store.documents_dir, current[0]), 'rb') as f:
+        body = f.read()
+    _write(os.path.join(out_dir, url.lstrip('/')), body, compress=False)
+    _write(os.path.join(out_dir, 'download-resume'), body, compress=False)
+
+
+def export_site(app, out_dir, changed=None):
+    # `changed` is a list of model names ('project', 'skill', 'certificate');
+    # when given only the pages that depend on them are re-rendered.
+    if changed:
+        unknown = set(changed) - set(AFFECTED_PAGES)
+        if unknown:
+            raise ValueError(f"Unknown model(s): {', '.join(sorted(unknown))}")
+        targets = []
+        for model in changed:
+            targets += [p for p in AFFECTED_PAGES[model] if p not in targets]
+    else:
+        targets = PUBLIC_PAGES + ['sprite']
+
+    # Fresh renders, and every listing on a single page since a static host
+    # can't answer ?after= pagination requests; both restored afterwards
+    from cache import page_cache
+    saved = (app.config['PAGE_CACHE_ENABLED'], app.config['LISTING_PAGE_SIZE'], page_cache.enabled)
+    app.config['PAGE_CACHE_ENABLED'] = False
+    app.config['LISTING_PAGE_SIZE'] = app.config.get('EXPORT_LISTING_PAGE_SIZE', 100000)
+    page_cache.enabled = False
+    try:
+        client = app.test_client()
+        for path in targets:
+            if path == 'sprite':
+                print(f"Exported {_export_sprite(app, client, out_dir)}")
+            else:
+                _write(_target(out_dir, path), _fetch(client, path))
+                print(f"Exported {path}")
+
+        if not changed:
+            print(f"Copied {_export_static(app, out_dir)} static files")
+        if not changed or 'project' in changed:
+            # Re-rendered project cards may point at new image variants; files
+            # already exported are skipped, as media names never change
+            print(f"Copied {_export_media(out_dir)} media files")
+        if not changed:
+            _export_resume(app, out_dir)
+    finally:
+        app.config['PAGE_CACHE_ENABLED'], app.config['LISTING_PAGE_SIZE'], page_cache.enabled = saved
+    return targets
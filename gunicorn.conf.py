@@ -0,0 +1,44 @@
+import gc
+import config as app_config
+
+# --- Gunicorn ---
+# Gunicorn reads this file from the working directory automatically. The app
+# is imported once in the master and workers are forked from it, so imports,
+# compiled templates and warm page caches are shared copy-on-write instead
+# of rebuilt per worker. Each worker drops the inherited DB pool after fork
+# (see _after_fork in app.py).
+preload_app = True
+
+# --- Worker Profile ---
+# Picked by WEB_WORKER_CLASS and sized to the DB pool (see engine.py).
+# gunicorn's gevent worker patches the standard library only after fork, but
+# preload_app has already imported the app, SQLAlchemy and logging in the
+# master by then, leaving their locks native ones shared between greenlets.
+# So patch before anything else is imported. psycopg2 talks to Postgres in C
+# and needs its own patch; SQLite calls still block the worker while they run.
+if app_config.WEB_WORKER_CLASS == 'gevent':
+    from gevent import monkey
+    monkey.patch_all()
+    if app_config.SQLALCHEMY_DATABASE_URI.startswith('postgresql'):
+        from psycogreen.gevent import patch_psycopg
+        patch_psycopg()
+
+from engine import worker_profile
+
+_profile = worker_profile(vars(app_config))
+worker_class = _profile['worker_class']
+workers = _profile['workers']
+threads = _profile['threads']
+worker_connections = _profile.get('worker_connections', 1000)
+
+
+def when_ready(server):
+    # Runs in the master after the app is loaded, before workers are forked
+    from app import warm_up
+    warm_up()
+    # Keep the GC from touching (and so un-sharing) everything loaded so far
+    gc.collect()
+    gc.freeze()
+    cfg = server.cfg
+    print(f"--- WORKERS: {cfg.workers} x {cfg.worker_class_str} "
+          f"(threads={cfg.threads}, connections={cfg.worker_connections}) ---")
@@ -0,0 +1,201 @@
+import json
+import threading
+import traceback
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import update
+from models import db, Job
+
+
+# --- Background Job Queue ---
+# Slow follow-up work (reseeding, image variants, cache warming) is stored as
+# a row in the job table and picked up by worker threads, so admin requests
+# return as soon as the row is written. Workers run inside each gunicorn
+# worker (JOB_RUNNER=thread, started on the first request, i.e. after fork)
+# and/or as a separate process (`flask run-jobs`, see Procfile). Claiming a
+# job is a conditional UPDATE, so any number of workers can share the table.
+
+def utcnow():
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class JobContext:
+    # Handed to each handler for progress reporting
+    def __init__(self, job):
+        self.id = job.id
+        self.attempt = job.attempts
+
+    def progress(self, percent, message=None):
+        values = {'progress': max(0, min(100, int(percent)))}
+        if message is not None:
+            values['message'] = message[:200]
+        db.session.execute(update(Job).where(Job.id == self.id).values(**values))
+        db.session.commit()
+
+
+class JobQueue:
+    def __init__(self):
+        self.app = None
+        self.autostart = True
+        self.handlers = {}
+        self.threads = 1
+        self.poll_seconds = 2.0
+        self.max_attempts = 3
+        self.stale_after = timedelta(minutes=15)
+        self.keep_finished = timedelta(days=7)
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._workers = []
+        self._lock = threading.Lock()
+        self._last_maintenance = None
+
+    def init_app(self, app):
+        self.app = app
+        self.threads = app.config.get('JOB_THREADS', self.threads)
+        self.poll_seconds = app.config.get('JOB_POLL_SECONDS', self.poll_seconds)
+        self.max_attempts = app.config.get('JOB_MAX_ATTEMPTS', self.max_attempts)
+        if app.config.get('JOB_RUNNER', 'thread') == 'thread':
+            app.before_request(self._start_once)
+        app.extensions['jobs'] = self
+
+    def task(self, name):
+        def register(fn):
+            self.handlers[name] = fn
+            return fn
+        return register
+
+    # --- Producing ---
+    def enqueue(self, name, dedupe=True, delay=0, **payload):
+        # Commits the current session. With `dedupe`, an identical job that
+        # is still waiting to run is reused instead of queueing another, so a
+        # `delay` turns a burst of writes into a single run.
+        if name not in self.handlers:
+            raise LookupError(f"No handler registered for job {name!r}")
+        body = json.dumps(payload, sort_keys=True)
+        if dedupe:
+            waiting = Job.query.filter_by(name=name, payload=body, status='queued').first()
+            if waiting is not None:
+                return waiting
+        now = utcnow()
+        job = Job(name=name, payload=body, status='queued', created_at=now,
+                  run_after=now + timedelta(seconds=delay))
+        db.session.add(job)
+        db.session.commit()
+        if not delay:
+            self._wake.set()
+        return job
+
+    # --- Consuming ---
+    def _claim(self):
+        for _ in range(5):
+            now = utcnow()
+            job = (Job.query.filter(Job.status == 'queued', Job.run_after <= now)
+                   .order_by(Job.id).first())
+            if job is None:
+                return None
+            claimed = db.session.execute(
+                update(Job)
+                .where(Job.id == job.id, Job.status == 'queued')
+                .values(status='running', started_at=now, attempts=Job.attempts + 1, error=None)
+            ).rowcount
+            db.session.commit()
+            if claimed:
+                db.session.refresh(job)
+                return job
+            # Another worker got there first; try the next one
+        return None
+
+    def run_next(self):
+        # Runs one job if any is due. Returns True when a job was run.
+        job = self._claim()
+        if job is None:
+            return False
+        handler = self.handlers.get(job.name)
+        try:
+            if handler is None:
+                raise LookupError(f"No handler registered for job {job.name!r}")
+            handler(JobContext(job), **json.loads(job.payload or '{}'))
+            db.session.execute(update(Job).where(Job.id == job.id).values(
+                status='done', progress=100, finished_at=utcnow()))
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            retry = job.attempts < self.max_attempts and handler is not None
+            print(f"Job {job.id} ({job.name}) failed on attempt {job.attempts}: {e}")
+            values = {'error': traceback.format_exc()[-4000:], 'message': str(e)[:200]}
+            if retry:
+                backoff = timedelta(seconds=5 * 2 ** job.attempts)
+                values.update(status='queued', run_after=utcnow() + backoff)
+            else:
+                values.update(status='failed', finished_at=utcnow())
+            db.session.execute(update(Job).where(Job.id == job.id).values(**values))
+            db.session.commit()
+        return True
+
+    def run_pending(self):
+        # Drain everything that is due right now (used by `run-jobs --once`)
+        count = 0
+        while True:
+            with self.app.app_context():
+                if not self.run_next():
+                    return count
+            count += 1
+
+    def _maintenance(self):
+        # Re-queue jobs whose worker died mid-run and prune old history
+        now = utcnow()
+        if self._last_maintenance and now - self._last_maintenance < timedelta(minutes=1):
+            return
+        self._last_maintenance = now
+        db.session.execute(
+            update(Job)
+            .where(Job.status == 'running', Job.started_at < now - self.stale_after)
+            .values(status='queued', run_after=now, message='Re-queued after the worker stopped responding')
+        )
+        Job.query.filter(Job.status.in_(('done', 'failed')),
+                         Job.finished_at < now - self.keep_finished).delete(synchronize_session=False)
+        db.session.commit()
+
+    # --- Worker Threads ---
+    def _work(self):
+        while not self._stop.is_set():
+            ran = False
+            try:
+                with self.app.app_context():
+                    self._maintenance()
+                    ran = self.run_next()
+            except Exception as e:
+                # e.g. the job table doesn't exist yet on a fresh database
+                print(f"Job worker error: {e}")
+            if not ran:
+                self._wake.wait(self.poll_seconds)
+                self._wake.clear()
+
+    def start(self, threads=None):
+        with self._lock:
+            if self._workers:
+                return
+            self._stop.clear()
+            for i in range(threads or self.threads):
+                worker = threading.Thread(target=self._work, name=f'job-worker-{i}', daemon=True)
+                worker.start()
+                self._workers.append(worker)
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        self._wake.set()
+        for worker in self._workers:
+            worker.join(timeout)
+        self._workers = []
+
+    def after_fork(self):
+        # Threads don't survive fork(); let the child start its own
+        self._workers = []
+        self._wake = threading.Event()
+        self._lock = threading.Lock()
+
+    def _start_once(self):
+        if self.autostart and not self._workers:
+            self.start()
+
+
+job_queue = JobQueue()
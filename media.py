@@ -0,0 +1,187 @@
+import os
+import hashlib
+import mimetypes
+from flask import Response, send_from_directory
+
+_pillow = []
+
+def _image_module():
+    # Pillow is only needed on the admin upload and job paths, so it is
+    # imported on first use instead of at startup
+    if not _pillow:
+        try:
+            from PIL import Image
+        except ImportError:  # Without Pillow uploads still work, just without variants
+            Image = None
+        _pillow.append(Image)
+    return _pillow[0]
+
+
+# --- Local Media Store ---
+# Uploaded project images and resume PDFs are stored under a name derived
+# from their content (sha256), so a URL never changes meaning and can be
+# cached forever. Resized WebP/AVIF image variants are produced in the
+# background after upload.
+
+ALLOWED_EXTENSIONS = {'jpg', 'jpeg', 'png', 'webp', 'gif', 'avif'}
+VARIANT_WIDTHS = (320, 640, 960, 1280)
+# (file extension, Pillow format, MIME type, save options)
+VARIANT_FORMATS = (
+    ('avif', 'AVIF', 'image/avif', {'quality': 50}),
+    ('webp', 'WEBP', 'image/webp', {'quality': 80, 'method': 6}),
+)
+# Documents (the resume) are checked by their leading bytes, not the name
+DOCUMENT_SIGNATURES = {'pdf': b'%PDF-'}
+IMMUTABLE = 'public, max-age=31536000, immutable'
+
+
+class MediaStore:
+    def __init__(self):
+        self.root = None
+        self.max_bytes = 8 * 1024 * 1024
+        self.accel_prefix = None
+
+    def init_app(self, app):
+        self.root = app.config.get('MEDIA_DIR') or os.path.join(app.instance_path, 'media')
+        self.max_bytes = app.config.get('MEDIA_MAX_BYTES', self.max_bytes)
+        self.accel_prefix = app.config.get('MEDIA_ACCEL_REDIRECT')
+        os.makedirs(self.originals_dir, exist_ok=True)
+        os.makedirs(self.variants_dir, exist_ok=True)
+        os.makedirs(self.documents_dir, exist_ok=True)
+        app.extensions['media'] = self
+
+    @property
+    def originals_dir(self):
+        return os.path.join(self.root, 'originals')
+
+    @property
+    def variants_dir(self):
+        return os.path.join(self.root, 'variants')
+
+    @property
+    def documents_dir(self):
+        return os.path.join(self.root, 'documents')
+
+    @staticmethod
+    def _write_once(folder, filename, data):
+        # Content-addressed, so an existing file already has these bytes
+        path = os.path.join(folder, filename)
+        if not os.path.exists(path):
+            tmp_path = f'{path}.{os.getpid()}.tmp'
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+
+    # --- Uploads ---
+    def save_upload(self, file_storage):
+        # Returns (filename, width, height) for the stored original
+        ext = os.path.splitext(file_storage.filename or '')[1].lower().lstrip('.')
+        if ext not in ALLOWED_EXTENSIONS:
+            raise ValueError(f"Unsupported image type '.{ext}'. Use one of: {', '.join(sorted(ALLOWED_EXTENSIONS))}")
+        data = file_storage.read(self.max_bytes + 1)
+        if len(data) > self.max_bytes:
+            raise ValueError(f"Image is larger than {self.max_bytes // (1024 * 1024)} MB")
+
+        width = height = None
+        Image = _image_module()
+        if Image is not None:
+            from io import BytesIO
+            try:
+                with Image.open(BytesIO(data)) as img:
+                    width, height = img.size
+                    img.verify()
+            except Exception:
+                raise ValueError("Uploaded file is not a valid image")
+
+        filename = f"{hashlib.sha256(data).hexdigest()[:32]}.{'jpg' if ext == 'jpeg' else ext}"
+        self._write_once(self.originals_dir, filename, data)
+        return filename, width, height
+
+    def save_document(self, data, ext='pdf'):
+        # Returns the stored name ("<sha256>.pdf") for a document's bytes
+        signature = DOCUMENT_SIGNATURES.get(ext)
+        if signature is None:
+            raise ValueError(f"Unsupported document type '.{ext}'. Use one of: {', '.join(sorted(DOCUMENT_SIGNATURES))}")
+        if len(data) > self.max_bytes:
+            raise ValueError(f"Document is larger than {self.max_bytes // (1024 * 1024)} MB")
+        if not data.startswith(signature):
+            raise ValueError(f"Uploaded file is not a valid .{ext} document")
+        filename = f"{hashlib.sha256(data).hexdigest()[:32]}.{ext}"
+        self._write_once(self.documents_dir, filename, data)
+        return filename
+
+    # --- Variants ---
+    @staticmethod
+    def variant_name(filename, width, ext):
+        return f"{os.path.splitext(filename)[0]}-{width}.{ext}"
+
+    def generate_variants(self, filename):
+        # Returns the "formats@widths" string stored on the project, e.g.
+        # "avif,webp@320,640", or None if nothing could be produced
+        Image = _image_module()
+        if Image is None:
+            return None
+        with Image.open(os.path.join(self.originals_dir, filename)) as img:
+            img.load()
+            widths = [w for w in VARIANT_WIDTHS if w < img.width] or [img.width]
+            if img.mode not in ('RGB', 'RGBA'):
+                img = img.convert('RGBA' if 'A' in img.getbands() else 'RGB')
+            formats = []
+            for ext, pil_format, _, options in VARIANT_FORMATS:
+                try:
+                    for width in widths:
+                        target = os.path.join(self.variants_dir, self.variant_name(filename, width, ext))
+                        if os.path.exists(target):
+                            continue
+                        height = round(img.height * width / img.width)
+                        resized = img if width == img.width else img.resize((width, height), Image.LANCZOS)
+                        tmp_path = f'{target}.{os.getpid()}.tmp'
+                        resized.save(tmp_path, pil_format, **options)
+                        os.replace(tmp_path, target)
+                    formats.append(ext)
+                except (KeyError, OSError) as e:
+                    # This Pillow build can't encode the format; skip it
+                    print(f"Could not create {ext} variants for {filename}: {e}")
+        if not formats:
+            return None
+        return f"{','.join(formats)}@{','.join(str(w) for w in widths)}"
+
+    def find(self, name):
+        # Variants first (the common case), then originals
+        for folder in (self.variants_dir, self.originals_dir):
+            if os.path.exists(os.path.join(folder, name)):
+                return folder
+        return None
+
+    # --- Serving ---
+    def send(self, folder, name, download_name=None):
+        # Names are content hashes, so a URL's bytes never change: the hash
+        # is a strong ETag and the response can be cached forever. Flask
+        # answers Range and If-None-Match requests and hands full files to
+        # the server as a file wrapper (gunicorn sends those with
+        # sendfile()). With MEDIA_ACCEL_REDIRECT set, nginx sends the file
+        # from that internal location instead of the worker.
+        etag = os.path.splitext(name)[0]
+        if self.accel_prefix:
+            response = Response(mimetype=mimetypes.guess_type(name)[0])
+            relative = os.path.relpath(os.path.join(folder, name), self.root).replace(os.sep, '/')
+            response.headers['X-Accel-Redirect'] = f"{self.accel_prefix.rstrip('/')}/{relative}"
+            if download_name:
+                response.headers.set('Content-Disposition', 'attachment', filename=download_name)
+            response.set_etag(etag)
+        else:
+            response = send_from_directory(folder, name, as_attachment=bool(download_name),
+                                           download_name=download_name, etag=etag, max_age=31536000)
+        response.headers['Cache-Control'] = IMMUTABLE
+        return response
+
+
+def parse_variants(value):
+    # "avif,webp@320,640" -> (['avif', 'webp'], [320, 640])
+    if not value or '@' not in value:
+        return [], []
+    formats, widths = value.split('@', 1)
+    return formats.split(','), [int(w) for w in widths.split(',') if w]
+
+
+media_store = MediaStore()
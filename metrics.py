@@ -0,0 +1,263 @@
+import os
+import json
+import time
+import threading
+from bisect import bisect_left
+from flask import g, request, has_request_context, before_render_template, template_rendered
+from sqlalchemy import event
+
+
+# --- Request Metrics ---
+# Per-endpoint latency, SQL count/time, template time and response size,
+# exposed in the Prometheus text format at /metrics. Each gunicorn worker
+# keeps its own numbers and periodically writes them to
+# instance/metrics/<pid>.json; /metrics adds up the files of all live
+# workers, so it doesn't matter which worker a scrape lands on.
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+SIZE_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576)
+
+
+class Histogram:
+    kind = 'histogram'
+
+    def __init__(self, name, help_text, buckets):
+        self.name = name
+        self.help = help_text
+        self.buckets = buckets
+        self.values = {}  # labels -> [count per bucket..., count for +Inf, sum]
+
+    def observe(self, labels, value):
+        row = self.values.get(labels)
+        if row is None:
+            row = self.values[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        row[bisect_left(self.buckets, value)] += 1
+        row[-1] += value
+
+    def render(self, values):
+        for labels, row in sorted(values.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + ('+Inf',), row[:-1]):
+                cumulative += count
+                yield f'{self.name}_bucket{_labels(labels, le=bound)} {cumulative}'
+            yield f'{self.name}_sum{_labels(labels)} {round(row[-1], 6)}'
+            yield f'{self.name}_count{_labels(labels)} {cumulative}'
+
+
+class Counter:
+    kind = 'counter'
+
+    def __init__(self, name, help_text):
+        self.name = name
+        self.help = help_text
+        self.values = {}  # labels -> [value]
+
+    def inc(self, labels, amount=1):
+        row = self.values.setdefault(labels, [0])
+        row[0] += amount
+
+    def render(self, values):
+        for labels, row in sorted(values.items()):
+            yield f'{self.name}{_labels(labels)} {round(row[0], 6)}'
+
+
+def _labels(labels, **extra):
+    pairs = list(labels) + [(k, v) for k, v in extra.items()]
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{k}="{v}"' for k, v in pairs) + '}'
+
+
+class RequestMetrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self.slow_request_ms = 500
+        self.slow_query_ms = 100
+        self.flush_seconds = 5
+        self.directory = None
+        self._last_flush = 0.0
+        self.metrics = [
+            Histogram('http_request_duration_seconds', 'Time spent handling the request.', LATENCY_BUCKETS),
+            Counter('http_requests_total', 'Requests handled, by status code.'),
+            Histogram('http_request_sql_queries', 'SQL statements issued per request.', QUERY_COUNT_BUCKETS),
+            Histogram('http_request_sql_duration_seconds', 'Time spent in SQL per request.', LATENCY_BUCKETS),
+            Histogram('http_request_template_duration_seconds', 'Time spent rendering templates per request.', LATENCY_BUCKETS),
+            Histogram('http_response_size_bytes', 'Response body size (when known up front).', SIZE_BUCKETS),
+            Counter('sql_queries_outside_request_total', 'SQL statements from CLI commands and background threads.'),
+            Counter('db_pool_events_total', 'Connection pool events.'),
+            Counter('db_pool_wait_seconds_total', 'Time spent waiting for a pooled connection.'),
+            Histogram('app_startup_phase_seconds', 'Time to first response per process, by startup phase.', LATENCY_BUCKETS),
+        ]
+        self.by_name = {m.name: m for m in self.metrics}
+
+    def init_app(self, app, engine, pool_stats=None):
+        self.slow_request_ms = app.config.get('SLOW_REQUEST_MS', self.slow_request_ms)
+        self.slow_query_ms = app.config.get('SLOW_QUERY_MS', self.slow_query_ms)
+        self.flush_seconds = app.config.get('METRICS_FLUSH_SECONDS', self.flush_seconds)
+        self.directory = os.path.join(app.instance_path, 'metrics')
+        os.makedirs(self.directory, exist_ok=True)
+        self.pool_stats = pool_stats
+
+        app.before_request(self._start_request)
+        app.after_request(self._finish_request)
+        before_render_template.connect(self._start_template, app)
+        template_rendered.connect(self._finish_template, app)
+        event.listen(engine, 'before_cursor_execute', self._start_query)
+        event.listen(engine, 'after_cursor_execute', self._finish_query)
+        app.extensions['metrics'] = self
+
+    # --- Hooks ---
+    def _start_request(self):
+        g._metrics = {'start': time.perf_counter(), 'sql_count': 0, 'sql_time': 0.0,
+                      'template_time': 0.0, 'template_starts': []}
+
+    def _start_template(self, sender, template, context, **extra):
+        if has_request_context() and '_metrics' in g:
+            g._metrics['template_starts'].append(time.perf_counter())
+
+    def _finish_template(self, sender, template, context, **extra):
+        if has_request_context() and '_metrics' in g and g._metrics['template_starts']:
+            started = g._metrics['template_starts'].pop()
+            if not g._metrics['template_starts']:  # don't double count nested renders
+                g._metrics['template_time'] += time.perf_counter() - started
+
+    def _start_query(self, conn, cursor, statement, parameters, context, executemany):
+        # Kept on the statement's context, so a statement that raises leaves nothing behind
+        context._query_start = time.perf_counter()
+
+    def _finish_query(self, conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, '_query_start', None)
+        if started is None:
+            return
+        elapsed = time.perf_counter() - started
+        in_request = has_request_context() and '_metrics' in g
+        if in_request:
+            g._metrics['sql_count'] += 1
+            g._metrics['sql_time'] += elapsed
+        else:
+            with self._lock:
+                self.by_name['sql_queries_outside_request_total'].inc(())
+        if elapsed * 1000 >= self.slow_query_ms:
+            where = request.endpoint if in_request else 'outside request'
+            print(f"SLOW QUERY {elapsed * 1000:.1f} ms ({where}): {' '.join(statement.split())[:300]}")
+
+    def _finish_request(self, response):
+        state = g.pop('_metrics', None)
+        if state is None:
+            return response
+        elapsed = time.perf_counter() - state['start']
+        endpoint = request.endpoint or 'none'
+        labels = (('endpoint', endpoint), ('method', request.method))
+        with self._lock:
+            self.by_name['http_request_duration_seconds'].observe(labels, elapsed)
+            self.by_name['http_requests_total'].inc(labels + (('status', response.status_code),))
+            self.by_name['http_request_sql_queries'].observe(labels, state['sql_count'])
+            self.by_name['http_request_sql_duration_seconds'].observe(labels, state['sql_time'])
+            self.by_name['http_request_template_duration_seconds'].observe(labels, state['template_time'])
+            if response.content_length is not None:
+                self.by_name['http_response_size_bytes'].observe(labels, response.content_length)
+        if elapsed * 1000 >= self.slow_request_ms:
+            print(f"SLOW REQUEST {elapsed * 1000:.1f} ms {request.method} {request.full_path} "
+                  f"[{endpoint}] sql={state['sql_count']} ({state['sql_time'] * 1000:.1f} ms) "
+                  f"templates={state['template_time'] * 1000:.1f} ms status={response.status_code}")
+        if time.monotonic() - self._last_flush >= self.flush_seconds:
+            self.flush(wait=False)
+        return response
+
+    def record_startup(self, phases):
+        with self._lock:
+            for phase, seconds in phases:
+                self.by_name['app_startup_phase_seconds'].observe((('phase', phase),), seconds)
+
+    def reset(self):
+        # Forget this process's numbers, e.g. a preloading master's warm-up
+        # requests, or what a forked worker inherited from it
+        with self._lock:
+            for metric in self.metrics:
+                metric.values = {}
+        if self.directory:
+            try:
+                os.remove(os.path.join(self.directory, f'{os.getpid()}.json'))
+            except OSError:
+                pass
+
+    # --- Cross-Worker Aggregation ---
+    def _snapshot(self):
+        with self._lock:
+            data = {m.name: {json.dumps(labels): list(row) for labels, row in m.values.items()}
+                    for m in self.metrics}
+        if self.pool_stats is not None:
+            stats = self.pool_stats
+            with stats._lock:
+                data['db_pool_events_total'] = {
+                    json.dumps([['event', name]]): [count] for name, count in stats.counts.items()
+                }
+                data['db_pool_wait_seconds_total'] = {json.dumps([]): [stats.wait_total]}
+        return data
+
+    def flush(self, wait=True):
+        # Threads of one worker share the .tmp file; with wait=False a
+        # request leaves the write to whichever thread is already doing it
+        if not self._flush_lock.acquire(blocking=wait):
+            return
+        try:
+            self._last_flush = time.monotonic()
+            path = os.path.join(self.directory, f'{os.getpid()}.json')
+            with open(path + '.tmp', 'w') as f:
+                json.dump(self._snapshot(), f)
+            os.replace(path + '.tmp', path)
+        except OSError as e:
+            print(f"Could not write metrics: {e}")
+        finally:
+            self._flush_lock.release()
+
+    def _collect(self):
+        self.flush()
+        totals = {}
+        for name in os.listdir(self.directory):
+            if not name.endswith('.json'):
+                continue
+            path = os.path.join(self.directory, name)
+            pid = int(name[:-len('.json')])
+            if pid != os.getpid() and not _alive(pid):
+                os.remove(path)  # a worker that exited
+                continue
+            try:
+                with open(path) as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                continue
+            for metric, values in data.items():
+                merged = totals.setdefault(metric, {})
+                for key, row in values.items():
+                    if key in merged:
+                        merged[key] = [a + b for a, b in zip(merged[key], row)]
+                    else:
+                        merged[key] = row
+        return totals
+
+    def render(self):
+        totals = self._collect()
+        lines = []
+        for metric in self.metrics:
+            values = {tuple(tuple(pair) for pair in json.loads(key)): row
+                      for key, row in totals.get(metric.name, {}).items()}
+            lines.append(f'# HELP {metric.name} {metric.help}')
+            lines.append(f'# TYPE {metric.name} {metric.kind}')
+            lines.extend(metric.render(values))
+        return '\n'.join(lines) + '\n'
+
+
+def _alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+request_metrics = RequestMetrics()
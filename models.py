@@ -1,15 +1,96 @@
+import json
+import math
+import re
+import threading
+from collections import Counter, defaultdict
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import DDL, delete, event, insert, inspect, text
+from sqlalchemy.orm import Session, object_session
+from cache import VersionStamp
+from svg_sprite import minify_svg
 
 db = SQLAlchemy()
 
+# Bump this whenever the models change so existing databases get upgraded
+SCHEMA_VERSION = 11
+
+
+def tag_slug(name):
+    # "Power BI" -> "power-bi", "C++" -> "c++"
+    return re.sub(r'[^a-z0-9+#.]+', '-', (name or '').strip().lower()).strip('-')
+
+def split_tech(tech):
+    return [t.strip() for t in (tech or '').split(',') if t.strip()]
+
+# --- Project <-> Tag association ---
+project_tags = db.Table(
+    'project_tags',
+    db.Column('project_id', db.Integer, db.ForeignKey('project.id', ondelete='CASCADE'), primary_key=True),
+    db.Column('tag_id', db.Integer, db.ForeignKey('tag.id', ondelete='CASCADE'), primary_key=True),
+    # The primary key covers project -> tags; this covers tag -> projects
+    db.Index('ix_project_tags_tag_project', 'tag_id', 'project_id'),
+)
+
+class Tag(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), nullable=False)
+    slug = db.Column(db.String(100), nullable=False, unique=True, index=True)
+
+    @classmethod
+    def for_names(cls, names):
+        # Resolve display names to Tag rows, creating any that don't exist yet
+        wanted = {}
+        for name in names:
+            slug = tag_slug(name)
+            if slug and slug not in wanted:
+                wanted[slug] = name
+        if not wanted:
+            return []
+        existing = {t.slug: t for t in cls.query.filter(cls.slug.in_(wanted)).all()}
+        tags = []
+        for slug, name in wanted.items():
+            tag = existing.get(slug)
+            if tag is None:
+                tag = cls(name=name, slug=slug)
+                db.session.add(tag)
+            tags.append(tag)
+        return tags
+
+    def __repr__(self):
+        return f'<Tag {self.slug}>'
+
 class Project(db.Model):
-    # ... (existing code, no changes)
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(200), nullable=False)
-    role = db.Column(db.String(100), nullable=False)
-    tech = db.Column(db.String(300), nullable=True) # Comma-separated string
+    role = db.Column(db.String(100), nullable=False, index=True)
+    tech = db.Column(db.String(300), nullable=True) # Comma-separated string, kept for display order
     description = db.Column(db.Text, nullable=False)
-    image = db.Column(db.String(300), nullable=True)
+    image = db.Column(db.String(300), nullable=True) # External URL
+    # Uploaded image in the local media store (takes precedence over `image`)
+    image_file = db.Column(db.String(80), nullable=True) # "<sha256>.<ext>"
+    image_width = db.Column(db.Integer, nullable=True)
+    image_height = db.Column(db.Integer, nullable=True)
+    image_variants = db.Column(db.String(100), nullable=True) # e.g. "avif,webp@320,640"
+    tags = db.relationship('Tag', secondary=project_tags)
+
+    @property
+    def tech_list(self):
+        return split_tech(self.tech)
+
+    def set_tech(self, tech):
+        # Keep the display string and the normalized tag index in sync
+        self.tech = tech
+        self.tags = Tag.for_names(split_tech(tech))
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'title': self.title,
+            'role': self.role,
+            'tech': self.tech_list,
+            'description': self.description,
+            'image': self.image,
+        }
 
     def __repr__(self):
         return f'<Project {self.title}>'
@@ -24,18 +105,65 @@ class Certificate(db.Model):
     def __repr__(self):
         return f'<Certificate {self.title}>'
 
+# --- De-duplicated skill icons (one row per unique minified SVG) ---
+class SvgIcon(db.Model):
+    __tablename__ = 'svg_icon'
+    id = db.Column(db.String(16), primary_key=True) # Content hash
+    symbol = db.Column(db.Text, nullable=False) # Minified <symbol> markup
+
+    @classmethod
+    def from_markup(cls, markup):
+        icon_id, symbol = minify_svg(markup)
+        icon = db.session.get(cls, icon_id)
+        if icon is None:
+            icon = cls(id=icon_id, symbol=symbol)
+            db.session.add(icon)
+        return icon
+
+    def __repr__(self):
+        return f'<SvgIcon {self.id}>'
+
 class Skill(db.Model):
-    # ... (existing code, no changes)
+    __table_args__ = (
+        # Admin list, ordered and keyset-paged by (category, id)
+        db.Index('ix_skill_category_id', 'category', 'id'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     category = db.Column(db.String(100), nullable=False)
     name = db.Column(db.String(100), nullable=False)
-    svg = db.Column(db.Text, nullable=True) # Storing the full SVG string
+    svg = db.Column(db.Text, nullable=True) # Legacy: raw SVG, moved into svg_icon on save
+    icon_id = db.Column(db.String(16), db.ForeignKey('svg_icon.id'), nullable=True)
+    icon = db.relationship('SvgIcon')
+
+    def set_svg(self, markup):
+        # Store the icon once in svg_icon and keep only its hash on the row
+        if markup and markup.strip():
+            self.icon = SvgIcon.from_markup(markup)
+            self.icon_id = self.icon.id
+        else:
+            self.icon = None
+            self.icon_id = None
+        self.svg = None
 
     def __repr__(self):
         return f'<Skill {self.name}>'
 
 # --- NEW MODEL ---
 class Todo(db.Model):
+    __table_args__ = (
+        # Queue lookups: "all Pending by id", "the Active one", ...
+        db.Index('ix_todo_status_id', 'status', 'id'),
+        # Newest Done first: dashboard and "load more" pages
+        db.Index('ix_todo_status_completed_at', 'status', 'completed_at', 'id'),
+        # At most one Active task, enforced where partial indexes exist
+        db.Index(
+            'uq_todo_single_active', 'status', unique=True,
+            sqlite_where=text("status = 'Active'"),
+            postgresql_where=text("status = 'Active'"),
+        ).ddl_if(dialect=('sqlite', 'postgresql')),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     task = db.Column(db.Text, nullable=False)
     category = db.Column(db.String(100), nullable=True, default="General")
@@ -45,4 +173,364 @@ class Todo(db.Model):
     completed_at = db.Column(db.DateTime, nullable=True)
 
     def __repr__(self):
-        return f'<Todo {self.task[:30]}>'
\ No newline at end of file
+        return f'<Todo {self.task[:30]}>'
+
+# --- Roadmap Velocity Rollups ---
+# One row per (completion day, category): how many tasks were completed and a
+# histogram of how long they took. Completing, reopening, re-categorising or
+# deleting a Done task adjusts its row in the same transaction, so the stats
+# page reads at most days x categories rows however long the todo history gets.
+# Histogram buckets are half-octaves of minutes: 0 is under a minute, bucket
+# b >= 1 starts at 60 * 2**((b - 1) / 2) seconds (~41% wide); the last takes
+# ~500 days and up.
+TTC_BUCKETS = 40
+
+def ttc_bucket(created_at, completed_at):
+    if created_at is None:
+        return None  # counted as completed, left out of the histogram
+    minutes = max((completed_at - created_at).total_seconds(), 0) / 60
+    if minutes < 1:
+        return 0
+    return min(1 + int(2 * math.log2(minutes)), TTC_BUCKETS)
+
+def ttc_bucket_bounds(bucket):
+    # (low, high) seconds covered by a bucket; the last one is open-ended
+    if bucket <= 0:
+        return 0.0, 60.0
+    high = 60 * 2 ** (bucket / 2) if bucket < TTC_BUCKETS else None
+    return 60 * 2 ** ((bucket - 1) / 2), high
+
+class TodoDailyStat(db.Model):
+    __tablename__ = 'todo_daily_stat'
+
+    day = db.Column(db.Date, primary_key=True)
+    category = db.Column(db.String(100), primary_key=True)
+    completed = db.Column(db.Integer, nullable=False, default=0)
+    ttc_histogram = db.Column(db.Text, nullable=False, default='{}') # JSON {bucket: count}
+
+    @property
+    def histogram(self):
+        return {int(bucket): n for bucket, n in json.loads(self.ttc_histogram or '{}').items()}
+
+    def _add(self, bucket, sign):
+        self.completed = (self.completed or 0) + sign
+        if bucket is not None:
+            histogram = self.histogram
+            histogram[bucket] = histogram.get(bucket, 0) + sign
+            self.ttc_histogram = json.dumps({b: n for b, n in sorted(histogram.items()) if n})
+
+    @classmethod
+    def record(cls, task_ids, sign=1):
+        # Count (sign=1) or uncount (sign=-1) the given tasks, as they are
+        # stored right now, if they are Done. Call it after the UPDATE that
+        # completes a task and before the one that reopens or deletes it.
+        rows = db.session.query(Todo.category, Todo.created_at, Todo.completed_at).filter(
+            Todo.id.in_(list(task_ids)), Todo.status == 'Done', Todo.completed_at.isnot(None)
+        ).all()
+        for category, created_at, completed_at in rows:
+            key = {'day': completed_at.date(), 'category': category or 'General'}
+            stat = cls.query.filter_by(**key).with_for_update().first()
+            if stat is None:
+                if sign < 0:
+                    continue
+                # A concurrent first insert for this day fails the primary
+                # key and the caller's transaction retries
+                stat = cls(completed=0, ttc_histogram='{}', **key)
+                db.session.add(stat)
+            stat._add(ttc_bucket(created_at, completed_at), sign)
+            if stat.completed <= 0:
+                db.session.delete(stat)
+        db.session.flush()
+        return len(rows)
+
+    @classmethod
+    def rebuild(cls, batch_size=1000):
+        # Recount everything from the todo table (backfill, imports, reseeds)
+        completed = Counter()
+        histograms = defaultdict(Counter)
+        done = db.session.query(Todo.category, Todo.created_at, Todo.completed_at).filter(
+            Todo.status == 'Done', Todo.completed_at.isnot(None))
+        for category, created_at, completed_at in done.yield_per(batch_size):
+            key = (completed_at.date(), category or 'General')
+            completed[key] += 1
+            bucket = ttc_bucket(created_at, completed_at)
+            if bucket is not None:
+                histograms[key][bucket] += 1
+        db.session.execute(delete(cls))
+        if completed:
+            db.session.execute(insert(cls), [
+                {'day': day, 'category': category, 'completed': n,
+                 'ttc_histogram': json.dumps(dict(sorted(histograms[(day, category)].items())))}
+                for (day, category), n in completed.items()
+            ])
+        return sum(completed.values())
+
+    def __repr__(self):
+        return f'<TodoDailyStat {self.day} {self.category}: {self.completed}>'
+
+# --- Full-Text Search ---
+# One row per searchable record (see search.py for what goes in it). The text
+# index lives next to it: an external-content FTS5 table kept in step by
+# triggers on SQLite, a GIN index over a weighted tsvector on Postgres.
+SEARCH_TSVECTOR = ("(setweight(to_tsvector('english', title), 'A') || "
+                   "setweight(to_tsvector('english', body), 'B'))")
+
+class SearchDocument(db.Model):
+    __tablename__ = 'search_document'
+    __table_args__ = (
+        db.UniqueConstraint('kind', 'ref_id', name='uq_search_document_ref'),
+        db.Index('ix_search_document_tsv', text(SEARCH_TSVECTOR), postgresql_using='gin')
+        .ddl_if(dialect='postgresql'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(20), nullable=False) # "project", "skill", "certificate", "todo"
+    ref_id = db.Column(db.Integer, nullable=False)
+    title = db.Column(db.Text, nullable=False, default='')
+    body = db.Column(db.Text, nullable=False, default='')
+
+    def __repr__(self):
+        return f'<SearchDocument {self.kind} {self.ref_id}>'
+
+_SEARCH_FTS_DDL = (
+    "CREATE VIRTUAL TABLE search_fts USING fts5(title, body, content='search_document', "
+    "content_rowid='id', tokenize='porter unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER search_document_ai AFTER INSERT ON search_document BEGIN "
+    "INSERT INTO search_fts(rowid, title, body) VALUES (new.id, new.title, new.body); END",
+    "CREATE TRIGGER search_document_ad AFTER DELETE ON search_document BEGIN "
+    "INSERT INTO search_fts(search_fts, rowid, title, body) VALUES ('delete', old.id, old.title, old.body); END",
+    "CREATE TRIGGER search_document_au AFTER UPDATE ON search_document BEGIN "
+    "INSERT INTO search_fts(search_fts, rowid, title, body) VALUES ('delete', old.id, old.title, old.body); "
+    "INSERT INTO search_fts(rowid, title, body) VALUES (new.id, new.title, new.body); END",
+)
+for _statement in _SEARCH_FTS_DDL:
+    event.listen(SearchDocument.__table__, 'after_create', DDL(_statement).execute_if(dialect='sqlite'))
+event.listen(SearchDocument.__table__, 'before_drop',
+             DDL('DROP TABLE IF EXISTS search_fts').execute_if(dialect='sqlite'))
+
+# --- Live Dashboard Updates ---
+class TodoEvent(db.Model):
+    # Recent todo changes, replayed to open dashboards by /admin/todo/events
+    __tablename__ = 'todo_event'
+    id = db.Column(db.Integer, primary_key=True)
+    created_at = db.Column(db.DateTime, nullable=False)
+    payload = db.Column(db.Text, nullable=False) # JSON list of changed rows
+
+    def __repr__(self):
+        return f'<TodoEvent {self.id}>'
+
+# --- Resume Versions ---
+class Resume(db.Model):
+    # Uploaded resume PDFs; the most recently uploaded is the current one
+    id = db.Column(db.Integer, primary_key=True)
+    filename = db.Column(db.String(80), unique=True, nullable=False) # "<sha256>.pdf" in the media store
+    download_name = db.Column(db.String(200), nullable=False)
+    size = db.Column(db.Integer, nullable=False)
+    uploaded_at = db.Column(db.DateTime, nullable=False)
+
+    def __repr__(self):
+        return f'<Resume {self.filename}>'
+
+# --- Background Jobs ---
+class Job(db.Model):
+    __table_args__ = (
+        # The worker's "next runnable job" lookup
+        db.Index('ix_job_status_run_after', 'status', 'run_after'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(50), nullable=False)
+    payload = db.Column(db.Text, nullable=False, default='{}') # JSON keyword arguments
+    # Statuses: "queued", "running", "done", "failed"
+    status = db.Column(db.String(20), nullable=False, default='queued')
+    progress = db.Column(db.Integer, nullable=False, default=0) # 0-100
+    message = db.Column(db.String(200), nullable=True)
+    error = db.Column(db.Text, nullable=True)
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    # All times are naive UTC, set by the app so every backend agrees
+    created_at = db.Column(db.DateTime, nullable=False)
+    run_after = db.Column(db.DateTime, nullable=False)
+    started_at = db.Column(db.DateTime, nullable=True)
+    finished_at = db.Column(db.DateTime, nullable=True)
+
+    def to_dict(self):
+        iso = lambda value: value.isoformat() if value else None
+        return {
+            'id': self.id, 'name': self.name, 'status': self.status,
+            'progress': self.progress, 'message': self.message, 'error': self.error,
+            'attempts': self.attempts, 'created_at': iso(self.created_at),
+            'started_at': iso(self.started_at), 'finished_at': iso(self.finished_at),
+        }
+
+    def __repr__(self):
+        return f'<Job {self.id} {self.name} {self.status}>'
+
+# --- Schema Bookkeeping ---
+class SchemaInfo(db.Model):
+    __tablename__ = 'schema_info'
+    id = db.Column(db.Integer, primary_key=True)
+    version = db.Column(db.Integer, nullable=False)
+
+    @classmethod
+    def stamp(cls, version=SCHEMA_VERSION):
+        info = db.session.get(cls, 1)
+        if info is None:
+            db.session.add(cls(id=1, version=version))
+        else:
+            info.version = version
+
+    def __repr__(self):
+        return f'<SchemaInfo v{self.version}>'
+
+
+def _backfill_project_tags():
+    for project in Project.query.all():
+        project.set_tech(project.tech)
+
+def _add_column(table, column, ddl):
+    # create_all() never alters existing tables, so new columns go in by hand
+    columns = {c['name'] for c in inspect(db.engine).get_columns(table)}
+    if column not in columns:
+        db.session.execute(text(f'ALTER TABLE {table} ADD COLUMN {column} {ddl}'))
+        db.session.commit()
+
+# Columns added to models after their table already existed. They go in
+# right after create_all(), before any upgrade step loads rows through the
+# models (which select every mapped column).
+ADDED_COLUMNS = (
+    ('skill', 'icon_id', 'VARCHAR(16) REFERENCES svg_icon (id)'),  # v3
+    ('project', 'image_file', 'VARCHAR(80)'),  # v5
+    ('project', 'image_width', 'INTEGER'),
+    ('project', 'image_height', 'INTEGER'),
+    ('project', 'image_variants', 'VARCHAR(100)'),
+)
+
+def _add_missing_columns():
+    for table, column, ddl in ADDED_COLUMNS:
+        _add_column(table, column, ddl)
+
+def _move_skill_svgs_to_icons():
+    for skill in Skill.query.filter(Skill.svg.isnot(None)).all():
+        skill.set_svg(skill.svg)
+
+def _create_missing_indexes():
+    # Indexes added to models after their table already existed
+    connection = db.session.connection()
+    for table in db.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(connection, checkfirst=True)
+
+def _single_active_todo():
+    # Older code could leave several Active tasks; keep the oldest one
+    active_ids = [t.id for t in Todo.query.filter_by(status='Active').order_by(Todo.id).all()]
+    if len(active_ids) > 1:
+        Todo.query.filter(Todo.id.in_(active_ids[1:])).update({'status': 'Pending'}, synchronize_session=False)
+    _create_missing_indexes()
+
+def _backfill_todo_daily_stats():
+    # The rollup table is new; count the existing history into it
+    TodoDailyStat.rebuild()
+
+def _build_search_index():
+    # search_document (and its FTS table) came from create_all(); fill it
+    from search import rebuild_search_index
+    rebuild_search_index()
+
+# Data fix-ups run (in order) when an existing database is upgraded
+SCHEMA_UPGRADES = {
+    2: _backfill_project_tags,
+    3: _move_skill_svgs_to_icons,
+    4: _single_active_todo,
+    # 5: project image columns, added by _add_missing_columns()
+    # 6: job table, created by create_all()
+    7: _backfill_todo_daily_stats,
+    8: _build_search_index,
+    9: _create_missing_indexes,
+    # 10: todo_event table, created by create_all()
+    # 11: resume table, created by create_all()
+}
+
+
+def bootstrap_schema():
+    # One cheap SELECT when the database is already current; otherwise a
+    # full create_all() reflection pass followed by recording the version.
+    try:
+        info = db.session.get(SchemaInfo, 1)
+        current = info.version if info else None
+    except Exception:
+        db.session.rollback()
+        current = None
+
+    if current == SCHEMA_VERSION:
+        return current
+
+    print(f"--- UPGRADING DATABASE SCHEMA ({current} -> {SCHEMA_VERSION}) ---")
+    db.create_all()
+    _add_missing_columns()
+    # Databases created before versioning existed count as version 1
+    for version in range((current or 1) + 1, SCHEMA_VERSION + 1):
+        upgrade = SCHEMA_UPGRADES.get(version)
+        if upgrade:
+            print(f"Applying schema upgrade v{version}...")
+            upgrade()
+    SchemaInfo.stamp()
+    db.session.commit()
+    return SCHEMA_VERSION
+
+
+# --- Cached Row Counts ---
+# The hero stats show how many projects and skills exist. Instead of running
+# COUNT(*) on every render, each worker keeps the numbers in memory and only
+# re-counts after a commit that inserted or deleted one of the counted models
+# (in any worker, via the shared stamp file).
+class RowCounts:
+    def __init__(self, *models):
+        self.models = models
+        self.stamp = VersionStamp('row_counts')
+        self._lock = threading.Lock()
+        self._counts = None
+
+    def init_app(self, app):
+        self.stamp.init_app(app)
+
+    def get(self):
+        stale = self.stamp.changed()
+        counts = self._counts
+        if stale or counts is None:
+            generation = self.stamp.generation
+            counts = {
+                model.__name__: db.session.query(model).count()
+                for model in self.models
+            }
+            with self._lock:
+                # Counted before a concurrent invalidate(): use, don't keep
+                if generation == self.stamp.generation:
+                    self._counts = counts
+        return counts
+
+    def invalidate(self):
+        with self._lock:
+            self._counts = None
+            self.stamp.bump()
+
+
+row_counts = RowCounts(Project, Skill)
+
+
+def _mark_counts_dirty(mapper, connection, target):
+    session = object_session(target)
+    if session is not None:
+        session.info['row_counts_dirty'] = True
+
+for _model in row_counts.models:
+    event.listen(_model, 'after_insert', _mark_counts_dirty)
+    event.listen(_model, 'after_delete', _mark_counts_dirty)
+
+@event.listens_for(Session, 'after_commit')
+def _refresh_counts_after_commit(session):
+    if session.info.pop('row_counts_dirty', False):
+        row_counts.invalidate()
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_counts_flag(session):
+    session.info.pop('row_counts_dirty', None)
@@ -0,0 +1,94 @@
+import re
+from sqlalchemy import event, text
+from models import db
+
+# --- Query Plan Checks ---
+# Builders for the queries behind the busiest pages register themselves with
+# @hot_query, giving sample arguments. `flask check-query-plans` EXPLAINs
+# each one against the configured database and fails when a plan reads a
+# whole table or sorts rows itself instead of walking an index, so a dropped
+# or mismatched index is caught before it reaches production.
+#
+# SQLite's planner doesn't look at table sizes here, so an empty database
+# gives the same plans as a full one. Postgres would happily seq-scan small
+# tables, so sequential scans and sorts are switched off for the check: one
+# still showing up means no index can serve the query at all.
+
+HOT_QUERIES = {}
+
+# "SCAN todo" reads the table in rowid order; "SCAN todo USING INDEX ..." is
+# an ordered index walk and fine for LIMITed pages
+_SQLITE_FULL_SCAN = re.compile(r'^SCAN (\w+)$')
+_SQLITE_SORT = re.compile(r'USE TEMP B-TREE FOR (RIGHT PART OF )?ORDER BY')
+_POSTGRES_FULL_SCAN = re.compile(r'Seq Scan on (\w+)')
+_POSTGRES_SORT = re.compile(r'->\s+Sort\b|^Sort\b')
+_SQLITE_SEEK = re.compile(r'^SEARCH \w+ USING .*INDEX \w+ \(.*[<>]\?\)')
+_POSTGRES_SEEK = re.compile(r'Index Cond: .*[<>]')
+
+
+def hot_query(name, seek=False, **sample_args):
+    # Stack several to check one builder with different arguments. `seek`
+    # queries (keyset "next page") must also start from an index range
+    # instead of walking the index from its first entry.
+    def decorator(builder):
+        HOT_QUERIES[name] = (builder, seek, sample_args)
+        return builder
+    return decorator
+
+
+def explain(query):
+    # Plan lines for an ORM query or select(), run with its real bind values
+    connection = db.session.connection()
+    dialect = connection.dialect.name
+    prefix = 'EXPLAIN QUERY PLAN ' if dialect == 'sqlite' else 'EXPLAIN '
+
+    def add_prefix(conn, cursor, statement, parameters, context, executemany):
+        return prefix + statement, parameters
+
+    if dialect == 'sqlite':
+        # EXPLAIN never reads the database, so a pooled connection would plan
+        # against the schema it cached before indexes were added; a real read
+        # makes it check the schema cookie and reload
+        connection.execute(text('SELECT count(*) FROM sqlite_master'))
+    elif dialect == 'postgresql':
+        connection.execute(text('SET LOCAL enable_seqscan = off'))
+        connection.execute(text('SET LOCAL enable_sort = off'))
+    event.listen(connection, 'before_cursor_execute', add_prefix, retval=True)
+    try:
+        result = connection.execute(getattr(query, 'statement', query))
+        rows = result.cursor.fetchall()
+    finally:
+        event.remove(connection, 'before_cursor_execute', add_prefix)
+        if dialect == 'postgresql':
+            db.session.rollback()  # undo the SET LOCALs
+    # SQLite: (id, parent, notused, detail); Postgres: one text column
+    return [row[-1] for row in rows]
+
+
+def plan_problems(plan, dialect, seek=False):
+    tables = set(db.metadata.tables)
+    full_scan, sort, seek_pattern = (
+        (_SQLITE_FULL_SCAN, _SQLITE_SORT, _SQLITE_SEEK) if dialect == 'sqlite'
+        else (_POSTGRES_FULL_SCAN, _POSTGRES_SORT, _POSTGRES_SEEK)
+    )
+    problems = []
+    for line in plan:
+        line = line.strip()
+        scan = full_scan.search(line)
+        if scan and scan.group(1) in tables:
+            problems.append(f'full scan of {scan.group(1)}')
+        elif sort.search(line):
+            problems.append('sorts rows instead of reading an index in order')
+    if seek and not any(seek_pattern.search(line.strip()) for line in plan):
+        problems.append('walks the index from the start instead of seeking to the cursor')
+    return problems
+
+
+def check_query_plans():
+    # {name: (plan lines, problems)} for every registered query
+    dialect = db.session.get_bind().dialect.name
+    report = {}
+    for name, (builder, seek, sample_args) in HOT_QUERIES.items():
+        plan = explain(builder(**sample_args))
+        report[name] = (plan, plan_problems(plan, dialect, seek))
+    return report
@@ -0,0 +1,83 @@
+import os
+import threading
+from sqlalchemy.exc import IntegrityError
+from cache import VersionStamp
+from jobs import utcnow
+from media import media_store
+from models import db, Resume
+
+BUNDLED_RESUME = 'RayyanKauchali_Resume-1.pdf'
+
+
+# --- Resume Versions ---
+# Uploaded resumes are stored in the media store under their content hash.
+# /download-resume (the link that gets shared) redirects to the current
+# version's /resume/<hash>.pdf, which never changes and is cached forever by
+# browsers and proxies. Each worker keeps the list of versions in memory, so
+# neither URL queries the database; an upload bumps the shared stamp. Until
+# the first upload, the PDF bundled in data/ is stored the same way.
+class ResumeLibrary:
+    def __init__(self):
+        self.stamp = VersionStamp('resume')
+        self._lock = threading.Lock()
+        self._versions = None  # [(filename, download_name)], newest first
+        self.bundled_path = None
+
+    def init_app(self, app):
+        self.stamp.init_app(app)
+        self.bundled_path = os.path.join(app.config['DATA_DIR'], BUNDLED_RESUME)
+        app.extensions['resumes'] = self
+
+    def _load(self):
+        rows = (db.session.query(Resume.filename, Resume.download_name)
+                .order_by(Resume.uploaded_at.desc(), Resume.id.desc()).all())
+        if not rows and os.path.exists(self.bundled_path):
+            try:
+                with open(self.bundled_path, 'rb') as f:
+                    resume = self.store(f.read(), BUNDLED_RESUME)
+                rows = [(resume.filename, resume.download_name)]
+            except IntegrityError:
+                db.session.rollback()  # another worker stored it first
+                return self._load()
+        return [tuple(row) for row in rows]
+
+    def versions(self):
+        stale = self.stamp.changed()
+        versions = self._versions
+        if stale or versions is None:
+            generation = self.stamp.generation
+            versions = self._load()
+            with self._lock:
+                if generation == self.stamp.generation:
+                    self._versions = versions
+        return versions
+
+    def current(self):
+        # (filename, download_name) of the newest version, or None
+        versions = self.versions()
+        return versions[0] if versions else None
+
+    def download_name(self, filename):
+        for name, download_name in self.versions():
+            if name == filename:
+                return download_name
+        return None
+
+    def store(self, data, download_name):
+        # Makes `data` the current version; commits the session
+        filename = media_store.save_document(data)
+        resume = Resume.query.filter_by(filename=filename).first()
+        if resume is None:
+            resume = Resume(filename=filename, size=len(data))
+            db.session.add(resume)
+        # Re-uploading an older version makes it current again
+        resume.download_name = download_name
+        resume.uploaded_at = utcnow()
+        db.session.commit()
+        with self._lock:
+            self._versions = None
+            self.stamp.bump()
+        return resume
+
+
+resumes = ResumeLibrary()
@@ -0,0 +1,89 @@
+import json
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta, timezone
+from models import db, TodoDailyStat, ttc_bucket_bounds
+
+
+# --- Roadmap Velocity Stats ---
+# /admin/roadmap/stats only ever reads todo_daily_stat: one primary-key range
+# scan over the window, at most days x categories rows, whatever the size of
+# the todo table. Time-to-complete percentiles are estimated from the
+# bucket histogram, interpolating geometrically inside the bucket they fall in.
+
+STATS_WINDOWS = (7, 30, 90, 365)
+PERCENTILES = (50, 75, 90)
+
+
+def ttc_percentile(histogram, percent):
+    # histogram: {bucket: count}; returns seconds, or None without data
+    total = sum(n for n in histogram.values() if n > 0)
+    if not total:
+        return None
+    rank = percent / 100 * total
+    seen = 0
+    for bucket in sorted(histogram):
+        n = histogram[bucket]
+        if n <= 0:
+            continue
+        if seen + n >= rank:
+            low, high = ttc_bucket_bounds(bucket)
+            fraction = (rank - seen) / n
+            if high is None:
+                return low
+            if low == 0:
+                return high * fraction
+            return low * (high / low) ** fraction
+        seen += n
+    return ttc_bucket_bounds(max(histogram))[0]
+
+def _percentiles(histogram):
+    return {f'p{p}': ttc_percentile(histogram, p) for p in PERCENTILES}
+
+def velocity_stats(days=30, today=None):
+    today = today or datetime.now(timezone.utc).date()
+    since = today - timedelta(days=days - 1)
+    rows = db.session.query(
+        TodoDailyStat.day, TodoDailyStat.category, TodoDailyStat.completed, TodoDailyStat.ttc_histogram
+    ).filter(TodoDailyStat.day >= since, TodoDailyStat.day <= today).all()
+
+    per_day = Counter()
+    per_category = Counter()
+    category_histograms = defaultdict(Counter)
+    for day, category, completed, ttc_histogram in rows:
+        per_day[day] += completed
+        per_category[category] += completed
+        category_histograms[category].update(json.loads(ttc_histogram))
+    category_histograms = {
+        category: {int(bucket): n for bucket, n in counts.items()}
+        for category, counts in category_histograms.items()
+    }
+    histogram = Counter()
+    for counts in category_histograms.values():
+        histogram.update(counts)
+
+    return {
+        'days': days,
+        'since': since.isoformat(),
+        'until': today.isoformat(),
+        'completed': sum(per_day.values()),
+        'per_day': [
+            {'day': (since + timedelta(days=i)).isoformat(), 'completed': per_day[since + timedelta(days=i)]}
+            for i in range(days)
+        ],
+        'categories': [
+            {'category': category, 'completed': n, 'ttc_seconds': _percentiles(category_histograms[category])}
+            for category, n in per_category.most_common()
+        ],
+        'ttc_seconds': _percentiles(histogram),
+        'rollup_rows': len(rows),
+    }
+
+def format_duration(seconds):
+    # 95 -> "2m", 5400 -> "1.5h", 200000 -> "2.3d"
+    if seconds is None:
+        return '–'
+    if seconds < 3600:
+        return f'{max(seconds / 60, 1):.0f}m'
+    if seconds < 86400:
+        return f'{seconds / 3600:.1f}h'
+    return f'{seconds / 86400:.1f}d'
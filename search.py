@@ -0,0 +1,183 @@
+import re
+from markupsafe import Markup, escape
+from sqlalchemy import and_, column, event, func, literal_column, or_, select, table, text
+from sqlalchemy.orm import Session
+from models import db, Project, Skill, Certificate, Todo, SearchDocument, SEARCH_TSVECTOR
+
+
+# --- Full-Text Search ---
+# Every project, skill, certificate and todo has a row in search_document
+# (title + body text). ORM writes keep it current from an after_flush hook,
+# bulk imports reindex the rows they touch, and `flask reindex-search`
+# rebuilds it from scratch. Queries go to FTS5 on SQLite and to a weighted
+# tsvector/GIN index on Postgres; other databases fall back to LIKE.
+
+# kind -> (model, fields): the first field is the title, the rest the body
+SEARCHABLE = {
+    'project': (Project, ('title', 'description', 'tech', 'role')),
+    'skill': (Skill, ('name', 'category')),
+    'certificate': (Certificate, ('title', 'provider')),
+    'todo': (Todo, ('task', 'category')),
+}
+PUBLIC_KINDS = ('project', 'skill', 'certificate')
+_KIND_OF = {model: kind for kind, (model, _) in SEARCHABLE.items()}
+
+MAX_TERMS = 8
+# Highlight markers: control characters can't occur in the escaped output,
+# so they are swapped for <mark> after escaping
+_START, _STOP = '\x02', '\x03'
+
+documents = SearchDocument.__table__
+search_fts = table('search_fts', column('rowid'))  # SQLite only, see models.py
+
+
+# --- Keeping the index in sync ---
+def _document_rows(kind, objects):
+    # `objects` can be model instances or rows from _field_query()
+    title_field, *body_fields = SEARCHABLE[kind][1]
+    return [
+        {'kind': kind, 'ref_id': obj.id, 'title': getattr(obj, title_field) or '',
+         'body': ' '.join(filter(None, (getattr(obj, field) for field in body_fields)))}
+        for obj in objects
+    ]
+
+def _field_query(kind):
+    # Just the indexed columns; much cheaper than loading entities in bulk
+    model, fields = SEARCHABLE[kind]
+    return db.session.query(model.id, *(getattr(model, field) for field in fields))
+
+def reindex(connection, kind, ids, objects=()):
+    # Replace the documents for `ids`; `objects` are the live rows to index
+    ids = list(ids)
+    if not ids:
+        return
+    connection.execute(documents.delete().where(documents.c.kind == kind, documents.c.ref_id.in_(ids)))
+    rows = _document_rows(kind, objects)
+    if rows:
+        connection.execute(documents.insert(), rows)
+
+@event.listens_for(Session, 'after_flush')
+def _sync_search_documents(session, flush_context):
+    changed = {}
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        kind = _KIND_OF.get(type(obj))
+        if kind is None or (obj in session.dirty and not session.is_modified(obj)):
+            continue
+        ids, live = changed.setdefault(kind, (set(), []))
+        ids.add(obj.id)
+        if obj not in session.deleted:
+            live.append(obj)
+    for kind, (ids, live) in changed.items():
+        reindex(session.connection(), kind, ids, live)
+
+def reindex_ids(kind, ids, batch_size=1000):
+    # For bulk writes that bypass the ORM (imports)
+    model, _ = SEARCHABLE[kind]
+    ids = list(ids)
+    for start in range(0, len(ids), batch_size):
+        chunk = ids[start:start + batch_size]
+        reindex(db.session.connection(), kind, chunk, _field_query(kind).filter(model.id.in_(chunk)).all())
+
+def rebuild_search_index(kinds=None, batch_size=1000):
+    connection = db.session.connection()
+    total = 0
+    for kind in kinds or SEARCHABLE:
+        model, _ = SEARCHABLE[kind]
+        connection.execute(documents.delete().where(documents.c.kind == kind))
+        batch = []
+        for obj in _field_query(kind).order_by(model.id).yield_per(batch_size):
+            batch.append(obj)
+            if len(batch) >= batch_size:
+                connection.execute(documents.insert(), _document_rows(kind, batch))
+                total += len(batch)
+                batch = []
+        if batch:
+            connection.execute(documents.insert(), _document_rows(kind, batch))
+            total += len(batch)
+    return total
+
+
+# --- Querying ---
+def search_terms(query):
+    return re.findall(r'\w+', (query or '').lower())[:MAX_TERMS]
+
+def _dialect():
+    return db.session.get_bind().dialect.name
+
+def _fts5_query(terms):
+    # Every term must match, each as a prefix: "dat"* "sci"*
+    return ' '.join(f'"{term}"*' for term in terms)
+
+def _tsquery(terms):
+    return ' & '.join(f'{term}:*' for term in terms)
+
+def _fts5_match(terms):
+    return literal_column('search_fts').op('MATCH')(_fts5_query(terms))
+
+def _match(terms):
+    # (FROM clause, WHERE clause, rank ordering, highlighted title, body) for a query
+    dialect = _dialect()
+    if dialect == 'sqlite':
+        fts = literal_column('search_fts')
+        return (
+            documents.join(search_fts, search_fts.c.rowid == documents.c.id),
+            _fts5_match(terms),
+            func.bm25(fts, 10.0, 1.0),  # title hits weigh 10x
+            func.highlight(fts, 0, _START, _STOP),
+            func.snippet(fts, 1, _START, _STOP, '…', 16),
+        )
+    if dialect == 'postgresql':
+        tsquery = func.to_tsquery('english', _tsquery(terms))
+        vector = text(SEARCH_TSVECTOR)
+        headline = f'StartSel={_START}, StopSel={_STOP}'
+        return (
+            documents,
+            vector.op('@@')(tsquery),
+            func.ts_rank(vector, tsquery).desc(),
+            func.ts_headline('english', documents.c.title, tsquery, 'HighlightAll=true, ' + headline),
+            func.ts_headline('english', documents.c.body, tsquery, 'MaxWords=24, MinWords=12, ' + headline),
+        )
+    return (
+        documents,
+        and_(*(or_(documents.c.title.ilike(f'%{term}%'), documents.c.body.ilike(f'%{term}%')) for term in terms)),
+        documents.c.id.desc(),
+        documents.c.title,
+        func.substr(documents.c.body, 1, 160),
+    )
+
+def matching_ids(kind, query):
+    # Ids of `kind` rows matching `query`, for .in_() filters; None without terms
+    terms = search_terms(query)
+    if not terms:
+        return None
+    if _dialect() == 'sqlite':
+        # Let FTS5 produce the matching rowids once; as a join SQLite may
+        # instead probe the FTS table once per document of this kind
+        matched = select(search_fts.c.rowid).where(_fts5_match(terms))
+        return select(documents.c.ref_id).where(documents.c.kind == kind, documents.c.id.in_(matched))
+    from_clause, condition, _, _, _ = _match(terms)
+    return select(documents.c.ref_id).select_from(from_clause).where(condition, documents.c.kind == kind)
+
+def highlighted(value):
+    return Markup(str(escape(value or '')).replace(_START, '<mark>').replace(_STOP, '</mark>'))
+
+def search(query, kinds=PUBLIC_KINDS, limit=20):
+    # Yields ranked hits as they come off the cursor
+    terms = search_terms(query)
+    if not terms:
+        return
+    from_clause, condition, rank, title, body = _match(terms)
+    result = db.session.execute(
+        select(documents.c.kind, documents.c.ref_id, title.label('title'), body.label('body'))
+        .select_from(from_clause)
+        .where(condition, documents.c.kind.in_(list(kinds)))
+        .order_by(rank)
+        .limit(limit)
+    )
+    for row in result:
+        yield {
+            'kind': row.kind,
+            'id': row.ref_id,
+            'title': highlighted(row.title),
+            'snippet': highlighted(row.body),
+        }
@@ -0,0 +1,55 @@
+import os
+import json
+from models import db, SchemaInfo, Todo
+from data_io import import_records
+
+
+# --- Seed Data ---
+# Only the setup job and init_db.py need this, so app.py imports it lazily.
+
+def load_seed(root, filename):
+    with open(os.path.join(root, 'data', filename), 'r') as f:
+        return json.load(f)
+
+def seed_records(root):
+    # --- Seed Projects ---
+    try:
+        projects_seed = load_seed(root, 'projects.json')
+        print(f"Seeding {len(projects_seed)} projects...")
+        for p in projects_seed:
+            yield dict(p, type='project')
+    except Exception as e:
+        print(f"Could not seed projects: {e}")
+
+    # --- Seed Skills ---
+    try:
+        skills_seed = load_seed(root, 'skills.json')
+        print(f"Seeding skills...")
+        for category in skills_seed:
+            for skill in category.get('skills', []):
+                yield dict(skill, type='skill', category=category.get('category'))
+    except Exception as e:
+        print(f"Could not seed skills: {e}")
+
+    # --- Seed Default Tasks ---
+    try:
+        default_tasks = load_seed(root, 'default_tasks.json')
+        print(f"Seeding {len(default_tasks)} default tasks...")
+        # Only start the first task if nothing is active yet
+        has_active = Todo.query.filter_by(status='Active').first() is not None
+        for i, task_data in enumerate(default_tasks):
+            yield dict(task_data, type='todo', status="Active" if i == 0 and not has_active else "Pending")
+    except Exception as e:
+        print(f"Could not seed default tasks: {e}")
+
+def seed_database(root, reset=False):
+    # Seeds are upserted on their natural keys, so this is safe to re-run on
+    # a live database: content is refreshed and todo history is kept.
+    if reset:
+        print("Dropping all tables...")
+        db.drop_all()
+    print("Creating all tables...")
+    db.create_all()
+    SchemaInfo.stamp()
+    db.session.commit()
+    return import_records(seed_records(root), on_conflict={'todo': 'skip'})
@@ -0,0 +1,79 @@
+import os
+import time
+
+
+# --- Startup Timing ---
+# Splits time-to-first-response into phases (interpreter boot, imports,
+# route registration, create_app, preload warm-up, the first request itself)
+# and prints them once per process when the first response goes out,
+# flagging startups over STARTUP_BUDGET_MS. With `gunicorn --preload` the phases up to the
+# warm-up are paid once in the master; workers inherit them and only add
+# their own first request.
+
+def _process_age():
+    # Seconds since this process was exec'd (Linux only), so interpreter and
+    # gunicorn boot count too; None elsewhere
+    try:
+        with open('/proc/self/stat') as f:
+            start_ticks = int(f.read().rsplit(')', 1)[1].split()[19])
+        with open('/proc/uptime') as f:
+            uptime = float(f.read().split()[0])
+        return max(uptime - start_ticks / os.sysconf('SC_CLK_TCK'), 0.0)
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class StartupTimer:
+    def __init__(self):
+        self.phases = []
+        self._last = time.perf_counter()
+        age = _process_age()
+        if age is not None:
+            self.phases.append(('boot', age))
+        self.budget_ms = 1500
+        self.metrics = None
+        self.forked = False
+        self.reported = False
+
+    def init_app(self, app, metrics=None):
+        self.budget_ms = app.config.get('STARTUP_BUDGET_MS', self.budget_ms)
+        self.metrics = metrics
+        app.before_request(self._first_request)
+        app.after_request(self._first_response)
+        app.extensions['startup'] = self
+
+    def mark(self, phase):
+        now = time.perf_counter()
+        self.phases.append((phase, now - self._last))
+        self._last = now
+
+    def after_fork(self):
+        # The inherited phases were paid once by the preloading master
+        self.forked = True
+        self.reported = False
+
+    def _first_request(self):
+        # Idle time until traffic arrives isn't startup cost
+        if not self.reported:
+            self._last = time.perf_counter()
+
+    def _first_response(self, response):
+        if not self.reported:
+            self.reported = True
+            self.mark('first request')
+            self.report()
+        return response
+
+    def report(self):
+        total_ms = sum(seconds for _, seconds in self.phases) * 1000
+        phases = ', '.join(f'{name} {seconds * 1000:.0f} ms' for name, seconds in self.phases)
+        where = 'preloaded worker' if self.forked else 'process'
+        print(f"--- STARTUP ({where} {os.getpid()}): {phases} = {total_ms:.0f} ms "
+              f"(budget {self.budget_ms} ms) ---")
+        if total_ms > self.budget_ms:
+            print(f"--- STARTUP OVER BUDGET by {total_ms - self.budget_ms:.0f} ms ---")
+        if self.metrics is not None:
+            self.metrics.record_startup(self.phases)
+
+
+startup_timer = StartupTimer()
@@ -0,0 +1,66 @@
+document.addEventListener('DOMContentLoaded', () => {
+
+    // --- Live admin updates ---
+    // Forms marked data-admin-action post in the background. The JSON answer
+    // carries a message and the rows that changed, which are patched into
+    // the lists on this page instead of reloading the whole dashboard.
+    function showMessage(message, category, form) {
+        let box = document.getElementById('admin-message');
+        if (!box) {
+            box = document.createElement('div');
+            box.id = 'admin-message';
+            (document.querySelector('.admin-tabs') || form).before(box);
+        }
+        box.className = `flash-message ${category}`;
+        box.textContent = message;
+    }
+
+    function applyChanges(changes) {
+        for (const change of changes) {
+            const old = document.querySelector(`[data-admin-row="${change.list}-${change.id}"]`);
+            if (old) old.remove();  // an edit can move it within the list
+            const list = document.querySelector(`[data-admin-list="${change.list}"]`);
+            // Lists fetched on demand pick the row up when they load
+            if (change.deleted || !list || (list.dataset.section && !list.dataset.loaded)) continue;
+            const template = document.createElement('template');
+            template.innerHTML = change.html.trim();
+            const row = template.content.firstElementChild;
+            if (change.before !== null) {
+                // Rows after it that aren't loaded yet come with "Load more"
+                const next = list.querySelector(`[data-admin-row="${change.list}-${change.before}"]`);
+                if (next) next.before(row);
+            } else if (!list.querySelector(':scope > [data-section-more]')) {
+                list.insertBefore(row, list.querySelector(':scope > [data-admin-empty]'));
+            }
+        }
+        document.querySelectorAll('[data-admin-list]').forEach(list => {
+            const empty = list.querySelector(':scope > [data-admin-empty]');
+            if (empty) empty.hidden = Boolean(list.querySelector(':scope > [data-admin-row]'));
+        });
+    }
+
+    document.addEventListener('submit', async (e) => {
+        const form = e.target.closest('form[data-admin-action]');
+        if (!form || e.defaultPrevented) return;  // e.g. a cancelled confirm()
+        e.preventDefault();
+        const button = form.querySelector('[type="submit"]');
+        if (button) button.disabled = true;
+        try {
+            const response = await fetch(form.action, {
+                method: 'POST', body: new FormData(form), headers: { 'Accept': 'application/json' }
+            });
+            if (response.redirected) {  // session expired: back to the login page
+                window.location.href = response.url;
+                return;
+            }
+            const data = await response.json();
+            applyChanges(data.changes || []);
+            showMessage(data.message, data.category, form);
+            if (response.ok && form.dataset.adminAction === 'reset') form.reset();
+        } catch (err) {
+            showMessage('Could not save the change. Reload the page and try again.', 'danger', form);
+        } finally {
+            if (button) button.disabled = false;
+        }
+    });
+});
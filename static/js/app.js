@@ -111,109 +111,254 @@ document.addEventListener('DOMContentLoaded', () => {
 
 
     // --- Project Page Filtering Logic ---
-    // (This code remains unchanged, it just runs when on the /projects page)
+    // Filtering runs on the server (/api/projects). We send the current
+    // filters, then swap in the returned cards and facet counts.
     const projectGrid = document.getElementById('project-grid');
+    const filterForm = document.getElementById('project-filter-form');
     const searchFilter = document.getElementById('search-filter');
     const roleFilter = document.getElementById('role-filter');
     const techFilter = document.getElementById('tech-filter');
-    
-    const allProjectCards = projectGrid ? Array.from(projectGrid.getElementsByClassName('project-card')) : [];
-    
-    let currentFilters = {
-        search: '',
-        role: 'All',
-        tech: 'All'
-    };
-
-    function applyProjectFilters() {
-        if (!projectGrid) return; // Exit if not on project page
-
-        let visibleCount = 0;
-
-        allProjectCards.forEach(card => {
-            const title = card.querySelector('h4').textContent.toLowerCase();
-            const description = card.querySelector('.project-card-desc').textContent.toLowerCase();
-            const cardRole = card.dataset.role;
-            const cardTechs = card.dataset.tech.toLowerCase();
-
-            // 1. Check Search Filter
-            const searchMatch = (
-                title.includes(currentFilters.search) || 
-                description.includes(currentFilters.search)
-            );
-
-            // 2. Check Role Filter
-            const roleMatch = (
-                currentFilters.role === 'All' || 
-                cardRole === currentFilters.role
-            );
-            
-            // 3. Check Tech Filter
-            const techMatch = (
-                currentFilters.tech === 'All' || 
-                cardTechs.includes(currentFilters.tech.toLowerCase())
-            );
-
-            // Show or hide the card
-            if (searchMatch && roleMatch && techMatch) {
-                card.style.display = 'flex';
-                visibleCount++;
-            } else {
-                card.style.display = 'none';
-            }
+    const techInput = document.getElementById('tech-input');
+
+    let searchTimer = null;
+    let pendingRequest = null;
+
+    function currentProjectParams() {
+        const params = new URLSearchParams();
+        const checkedRole = roleFilter.querySelector('input[name="role"]:checked');
+        if (searchFilter.value.trim()) params.set('q', searchFilter.value.trim());
+        if (checkedRole && checkedRole.value) params.set('role', checkedRole.value);
+        if (techInput.value) params.set('tech', techInput.value);
+        return params;
+    }
+
+    function makeCount(count) {
+        const span = document.createElement('span');
+        span.className = 'filter-count';
+        span.textContent = count;
+        return span;
+    }
+
+    function renderFacets(facets, params) {
+        // Role radios
+        const activeRole = params.get('role') || '';
+        roleFilter.innerHTML = '';
+        const roles = [{ name: '', label: 'All Roles' }].concat(
+            facets.role.map(r => ({ name: r.name, label: r.name, count: r.count }))
+        );
+        if (activeRole && !facets.role.some(r => r.name === activeRole)) {
+            roles.push({ name: activeRole, label: activeRole, count: 0 });
+        }
+        roles.forEach(role => {
+            const label = document.createElement('label');
+            const input = document.createElement('input');
+            input.type = 'radio';
+            input.name = 'role';
+            input.value = role.name;
+            input.checked = role.name === activeRole;
+            label.append(input, ' ' + role.label);
+            if (role.count !== undefined) label.append(' ', makeCount(role.count));
+            roleFilter.appendChild(label);
+        });
+
+        // Tech chips
+        const activeTech = params.get('tech') || '';
+        techFilter.innerHTML = '';
+        const tags = [{ slug: '', name: 'All' }].concat(facets.tech);
+        tags.forEach(tag => {
+            const chipParams = new URLSearchParams(params);
+            if (tag.slug) chipParams.set('tech', tag.slug); else chipParams.delete('tech');
+            const chip = document.createElement('a');
+            chip.className = 'filter-tag' + (tag.slug === activeTech ? ' active' : '');
+            chip.dataset.tech = tag.slug;
+            chip.href = filterForm.action + (chipParams.toString() ? '?' + chipParams : '');
+            chip.textContent = tag.name;
+            if (tag.count !== undefined) chip.append(' ', makeCount(tag.count));
+            techFilter.appendChild(chip);
         });
+    }
+
+    async function loadProjects() {
+        const params = currentProjectParams();
+        const query = params.toString();
+        history.replaceState(null, '', filterForm.action + (query ? '?' + query : ''));
+
+        // Only the latest request matters
+        if (pendingRequest) pendingRequest.abort();
+        pendingRequest = new AbortController();
 
-        // Show 'no results' message
-        let noResultsMessage = document.getElementById('project-grid-message');
-        if (!noResultsMessage && allProjectCards.length > 0) {
-            noResultsMessage = document.createElement('p');
-            noResultsMessage.id = 'project-grid-message';
-            noResultsMessage.className = 'text-secondary';
-            noResultsMessage.style.textAlign = 'center';
-            projectGrid.appendChild(noResultsMessage);
+        const apiParams = new URLSearchParams(params);
+        apiParams.set('fragment', '1');
+        try {
+            const response = await fetch(`${filterForm.dataset.api}?${apiParams}`, { signal: pendingRequest.signal });
+            if (!response.ok) return;
+            const data = await response.json();
+            projectGrid.innerHTML = data.html;
+            renderFacets(data.facets, params);
+            updateLoadMore(document.querySelector('[data-load-more="project-grid"]'), data);
+        } catch (err) {
+            if (err.name !== 'AbortError') console.error('Could not load projects:', err);
         }
-        
-        if (noResultsMessage) {
-            if (visibleCount === 0) {
-                noResultsMessage.textContent = 'No projects match your filters.';
-                noResultsMessage.style.display = 'block';
-            } else {
-                noResultsMessage.style.display = 'none';
+    }
+
+    // --- Infinite Scroll for Paged Listings ---
+    // Each "Load more" link carries the API URL of the next page. When it
+    // scrolls into view we fetch that page's cards and append them.
+    let pageObserver = null;
+
+    function updateLoadMore(link, data) {
+        if (!link) return;
+        link.href = data.next_url || '#';
+        link.dataset.api = data.next_api || '';
+        link.hidden = !data.next_url;
+    }
+
+    async function loadNextPage(link) {
+        if (!link.dataset.api || link.dataset.loading) return;
+        const grid = document.getElementById(link.dataset.loadMore);
+        link.dataset.loading = '1';
+        try {
+            const response = await fetch(link.dataset.api);
+            if (!response.ok) return;
+            const data = await response.json();
+            grid.insertAdjacentHTML('beforeend', data.html);
+            updateLoadMore(link, data);
+        } catch (err) {
+            console.error('Could not load the next page:', err);
+        } finally {
+            delete link.dataset.loading;
+            // Re-observe so a link that is still on screen triggers again
+            if (pageObserver) {
+                pageObserver.unobserve(link);
+                pageObserver.observe(link);
             }
         }
     }
 
-    // Add Event Listeners to filters
-    if (searchFilter) {
-        searchFilter.addEventListener('keyup', (e) => {
-            currentFilters.search = e.target.value.toLowerCase();
-            applyProjectFilters();
+    const loadMoreLinks = document.querySelectorAll('[data-load-more]');
+    if (loadMoreLinks.length > 0) {
+        pageObserver = new IntersectionObserver((entries) => {
+            entries.forEach(entry => {
+                if (entry.isIntersecting) loadNextPage(entry.target);
+            });
+        }, { rootMargin: '400px' });
+
+        loadMoreLinks.forEach(link => {
+            pageObserver.observe(link);
+            link.addEventListener('click', (e) => {
+                e.preventDefault();
+                loadNextPage(link);
+            });
         });
     }
 
-    if (roleFilter) {
+    if (projectGrid && filterForm) {
+        filterForm.addEventListener('submit', (e) => {
+            e.preventDefault();
+            loadProjects();
+        });
+
+        searchFilter.addEventListener('input', () => {
+            clearTimeout(searchTimer);
+            searchTimer = setTimeout(loadProjects, 250);
+        });
+
         roleFilter.addEventListener('change', (e) => {
-            if (e.target.name === 'role') {
-                currentFilters.role = e.target.value;
-                applyProjectFilters();
-            }
+            if (e.target.name === 'role') loadProjects();
         });
-    }
 
-    if (techFilter) {
         techFilter.addEventListener('click', (e) => {
-            if (e.target.classList.contains('filter-tag')) {
-                techFilter.querySelectorAll('.filter-tag').forEach(tag => tag.classList.remove('active'));
-                e.target.classList.add('active');
-                
-                currentFilters.tech = e.target.dataset.tech;
-                applyProjectFilters();
-            }
+            const chip = e.target.closest('.filter-tag');
+            if (!chip) return;
+            e.preventDefault();
+            techInput.value = chip.dataset.tech;
+            loadProjects();
         });
     }
 
-    // Trigger filter logic on load ONLY if we are on the projects page
-    if (projectGrid) {
-        applyProjectFilters();
+    // --- Site Search ---
+    // Debounced as you type; results are streamed from /api/search as
+    // NDJSON and each hit is rendered as soon as its line arrives.
+    const searchForm = document.getElementById('search-form');
+    const searchInput = document.getElementById('search-input');
+    const searchResults = document.getElementById('search-results');
+
+    let searchDebounce = null;
+    let pendingSearch = null;
+
+    function renderSearchHit(hit) {
+        // title and snippet arrive escaped, with matches wrapped in <mark>
+        const link = document.createElement('a');
+        link.className = 'search-result';
+        link.href = hit.url;
+        const kind = document.createElement('span');
+        kind.className = 'search-kind';
+        kind.textContent = hit.kind;
+        const title = document.createElement('strong');
+        title.innerHTML = hit.title;
+        link.append(kind, title);
+        if (hit.snippet) {
+            const snippet = document.createElement('p');
+            snippet.className = 'text-secondary';
+            snippet.innerHTML = hit.snippet;
+            link.append(snippet);
+        }
+        searchResults.appendChild(link);
+    }
+
+    function showSearchMessage(text) {
+        const message = document.createElement('p');
+        message.className = 'text-secondary';
+        message.textContent = text;
+        searchResults.replaceChildren(message);
+    }
+
+    async function runSearch() {
+        const query = searchInput.value.trim();
+        const params = new URLSearchParams(query ? { q: query } : {});
+        history.replaceState(null, '', searchForm.action + (query ? '?' + params : ''));
+
+        if (pendingSearch) pendingSearch.abort();
+        if (!query) {
+            searchResults.replaceChildren();
+            return;
+        }
+        pendingSearch = new AbortController();
+
+        try {
+            const response = await fetch(`${searchForm.dataset.api}?${params}`, { signal: pendingSearch.signal });
+            if (!response.ok) return;
+            const reader = response.body.getReader();
+            const decoder = new TextDecoder();
+            let buffered = '';
+            let count = 0;
+            searchResults.replaceChildren();
+            while (true) {
+                const { done, value } = await reader.read();
+                if (done) break;
+                buffered += decoder.decode(value, { stream: true });
+                const lines = buffered.split('\n');
+                buffered = lines.pop();
+                lines.filter(Boolean).forEach(line => {
+                    renderSearchHit(JSON.parse(line));
+                    count++;
+                });
+            }
+            if (!count) showSearchMessage(`Nothing matches “${query}”.`);
+        } catch (err) {
+            if (err.name !== 'AbortError') console.error('Search failed:', err);
+        }
+    }
+
+    if (searchForm && searchInput && searchResults) {
+        searchForm.addEventListener('submit', (e) => {
+            e.preventDefault();
+            clearTimeout(searchDebounce);
+            runSearch();
+        });
+        searchInput.addEventListener('input', () => {
+            clearTimeout(searchDebounce);
+            searchDebounce = setTimeout(runSearch, 200);
+        });
     }
 });
\ No newline at end of file
@@ -0,0 +1,116 @@
+import re
+import hashlib
+import threading
+from cache import VersionStamp
+
+
+# --- SVG Minification ---
+# Skill icons are pasted into the admin panel as full <svg> documents. We
+# strip them down to a <symbol> that can live in one shared sprite sheet and
+# key it by a hash of its content, so identical icons are stored once.
+
+_STRIP_PATTERNS = [
+    re.compile(r'<\?xml.*?\?>', re.S),
+    re.compile(r'<!DOCTYPE.*?>', re.S | re.I),
+    re.compile(r'<!--.*?-->', re.S),
+    re.compile(r'<(title|desc|metadata)\b.*?</\1>', re.S | re.I),
+]
+_ROOT_RE = re.compile(r'<svg\b([^>]*)>(.*)</svg>', re.S | re.I)
+_ATTR_RE = re.compile(r'([\w:-]+)\s*=\s*(?:"([^"]*)"|\'([^\']*)\')')
+_ID_RE = re.compile(r'\bid="([^"]+)"')
+
+# Root attributes that only matter for a standalone document. `fill` is
+# dropped because the page CSS always overrides it on the outer <svg>, and the
+# symbol needs to inherit that value through <use>.
+_DROP_ROOT_ATTRS = {
+    'xmlns', 'xmlns:xlink', 'version', 'role', 'class', 'id', 'x', 'y',
+    'width', 'height', 'fill', 'aria-hidden', 'aria-label', 'focusable',
+}
+
+
+def _root_attrs(raw):
+    attrs = {}
+    for name, dq, sq in _ATTR_RE.findall(raw):
+        attrs[name] = dq if dq or not sq else sq
+    return attrs
+
+
+def minify_svg(markup):
+    # Returns (icon_id, symbol_body). The body is a <symbol> without an id;
+    # icon_id is a content hash, so identical icons collapse to one row.
+    text = markup or ''
+    for pattern in _STRIP_PATTERNS:
+        text = pattern.sub('', text)
+    match = _ROOT_RE.search(text)
+    if not match:
+        raise ValueError('SVG markup must contain an <svg>...</svg> element')
+
+    attrs = _root_attrs(match.group(1))
+    inner = re.sub(r'>\s+<', '><', match.group(2).strip())
+    inner = re.sub(r'\s{2,}', ' ', inner)
+
+    if 'viewBox' not in attrs and attrs.get('width') and attrs.get('height'):
+        w = re.sub(r'[^\d.]', '', attrs['width'])
+        h = re.sub(r'[^\d.]', '', attrs['height'])
+        attrs['viewBox'] = f'0 0 {w} {h}'
+
+    kept = []
+    styles = [attrs['style'].strip().rstrip(';')] if attrs.get('style') else []
+    for name, value in attrs.items():
+        if name in _DROP_ROOT_ATTRS or name == 'style':
+            continue
+        if 'var(' in value:
+            # CSS variables are not valid in presentation attributes
+            # inside a <use> shadow tree, but they are in style=""
+            styles.append(f'{name}:{value}')
+        else:
+            kept.append(f'{name}="{value}"')
+    if styles:
+        kept.append(f'style="{";".join(styles)}"')
+
+    body_attrs = ' '.join(sorted(kept))
+    digest = hashlib.sha256(f'{body_attrs}|{inner}'.encode('utf-8')).hexdigest()[:16]
+
+    # Namespace internal ids (gradients, clip paths) so icons can't collide
+    for old_id in set(_ID_RE.findall(inner)):
+        new_id = f'{digest}-{old_id}'
+        inner = inner.replace(f'id="{old_id}"', f'id="{new_id}"')
+        inner = inner.replace(f'url(#{old_id})', f'url(#{new_id})')
+        inner = inner.replace(f'href="#{old_id}"', f'href="#{new_id}"')
+
+    return digest, f'<symbol {body_attrs}>{inner}</symbol>'
+
+
+def symbol_markup(icon_id, symbol_body):
+    return symbol_body.replace('<symbol ', f'<symbol id="i-{icon_id}" ', 1)
+
+
+# --- Sprite Sheet ---
+class SpriteSheet:
+    def __init__(self, name):
+        self.name = name
+        self.stamp = VersionStamp(f'{name}_sprite')
+        self._lock = threading.Lock()
+        self._built = None
+
+    def init_app(self, app):
+        self.stamp.init_app(app)
+
+    def get(self, load_icons):
+        # `load_icons` returns [(icon_id, symbol_body), ...]; only called when
+        # this worker's copy is missing or another worker invalidated it
+        stale = self.stamp.changed()
+        with self._lock:
+            if stale or self._built is None:
+                symbols = ''.join(symbol_markup(i, body) for i, body in load_icons())
+                body = f'<svg xmlns="http://www.w3.org/2000/svg">{symbols}</svg>'.encode('utf-8')
+                fingerprint = hashlib.sha256(body).hexdigest()[:12]
+                self._built = (fingerprint, body)
+            return self._built
+
+    def invalidate(self):
+        self._built = None
+        self.stamp.bump()
+
+
+skill_sprite = SpriteSheet('skills')
@@ -0,0 +1,38 @@
+import os
+import sys
+import tempfile
+import pytest
+
+# config.py reads the environment at import time, so point it at a scratch
+# database before the app is imported
+_tmp = tempfile.mkdtemp(prefix='portfolio-tests-')
+os.environ.update(
+    DATABASE_URL=f"sqlite:///{os.path.join(_tmp, 'portfolio.db')}",
+    MEDIA_DIR=os.path.join(_tmp, 'media'),
+    JOB_RUNNER='none',
+    ADMIN_PASSWORD='test-password',
+    TODO_EVENTS_HOLD_SECONDS='0',
+)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app as portfolio  # noqa: E402
+
+
+@pytest.fixture(scope='session')
+def app():
+    portfolio.app.config['TESTING'] = True
+    with portfolio.app.app_context():
+        portfolio.ensure_schema()
+    return portfolio.app
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def admin(app):
+    client = app.test_client()
+    client.post('/admin/login', data={'password': 'test-password'})
+    return client
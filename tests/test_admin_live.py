@@ -0,0 +1,47 @@
+from models import db, Skill
+
+JSON = {'Accept': 'application/json'}
+
+
+def test_add_and_delete_certificate_return_only_the_changed_row(admin):
+    r = admin.post('/admin/add/certificate', headers=JSON,
+                   data={'title': 'Live Cert', 'provider': 'Test', 'icon': 'fa-solid fa-award'})
+    assert r.status_code == 200
+    change, = r.get_json()['changes']
+    assert change['list'] == 'certificates' and change['before'] is None
+    assert f'data-admin-row="certificates-{change["id"]}"' in change['html']
+
+    r = admin.post(f'/admin/delete/certificate/{change["id"]}', headers=JSON)
+    assert r.get_json()['changes'] == [{'list': 'certificates', 'id': change['id'], 'deleted': True}]
+
+
+def test_added_skill_is_placed_in_list_order(app, admin):
+    with app.app_context():
+        Skill.query.delete()
+        later = Skill(category='Zeta', name='Later')
+        db.session.add(later)
+        db.session.commit()
+        later_id = later.id
+
+    r = admin.post('/admin/add/skill', headers=JSON, data={'category': 'Alpha', 'name': 'Earlier', 'svg': ''})
+    change, = r.get_json()['changes']
+    assert change['before'] == later_id
+
+
+def test_edit_pages_render_and_save_in_place(app, admin):
+    r = admin.post('/admin/add/project', headers=JSON,
+                   data={'title': 'Live Project', 'role': 'Dev', 'tech': 'Python', 'description': 'x'})
+    project_id = r.get_json()['changes'][0]['id']
+
+    assert admin.get(f'/admin/edit/project/{project_id}').status_code == 200
+    r = admin.post(f'/admin/edit/project/{project_id}', headers=JSON,
+                   data={'title': 'Live Project 2', 'role': 'Dev', 'tech': 'Python', 'description': 'y'})
+    assert r.status_code == 200
+    assert 'Live Project 2' in r.get_json()['changes'][0]['html']
+
+
+def test_plain_form_posts_still_redirect(admin):
+    r = admin.post('/admin/add/certificate', data={'title': 'Plain Cert', 'provider': 'Test'})
+    assert r.status_code == 302 and r.headers['Location'].endswith('#certificates')
+    r = admin.post('/admin/add/certificate', headers=JSON, data={'title': 'No Provider'})
+    assert r.status_code == 400 and r.get_json()['category'] == 'danger'
@@ -0,0 +1,67 @@
+import html
+import re
+from datetime import datetime, timedelta
+from models import db, Todo, TodoDailyStat
+
+TODO_ID = re.compile(r'data-todo-id="(\d+)"')
+MORE = re.compile(r'data-section-more="([^"]+)"')
+
+
+def _done_history(admin, url):
+    # Follows "Show older" from `url`, returning every task id in page order
+    ids = []
+    while url:
+        r = admin.get(url)
+        assert r.status_code == 200
+        page = r.get_data(as_text=True)
+        ids += [int(i) for i in TODO_ID.findall(page)]
+        more = MORE.search(page)
+        url = html.unescape(more.group(1)) if more else None
+    return ids
+
+
+def test_done_history_pages_through_undated_rows(app, admin, monkeypatch):
+    monkeypatch.setitem(app.config, 'ADMIN_PAGE_SIZE', 2)
+    start = datetime(2025, 1, 1)
+    with app.app_context():
+        TodoDailyStat.query.delete()
+        Todo.query.delete()
+        dated = [Todo(task=f'Dated {i}', status='Done', completed_at=start + timedelta(days=i)) for i in range(3)]
+        undated = [Todo(task=f'Undated {i}', status='Done') for i in range(3)]
+        db.session.add_all(dated + undated)
+        db.session.commit()
+        expected = [t.id for t in reversed(dated)] + [t.id for t in reversed(undated)]
+
+    assert _done_history(admin, '/admin/section/done') == expected
+
+
+def test_done_history_rejects_a_malformed_cursor(admin):
+    assert admin.get('/admin/section/done?after=5&after_done=bad').status_code == 400
+
+
+def test_dashboard_links_to_undated_done_rows(app, admin):
+    with app.app_context():
+        TodoDailyStat.query.delete()
+        Todo.query.delete()
+        db.session.add_all([Todo(task='Dated', status='Done', completed_at=datetime(2025, 1, 1)),
+                            Todo(task='Undated', status='Done')])
+        db.session.commit()
+
+    more = MORE.search(admin.get('/admin').get_data(as_text=True))
+    assert more and 'undated=1' in more.group(1)
+
+
+def test_dashboard_lists_each_bucket_in_order(app, admin):
+    with app.app_context():
+        TodoDailyStat.query.delete()
+        Todo.query.delete()
+        pending = [Todo(task=f'Pending {i}') for i in range(4)]
+        done = [Todo(task=f'Done {i}', status='Done', completed_at=datetime(2025, 1, 1 + i % 2)) for i in range(4)]
+        db.session.add_all(pending + done)
+        db.session.commit()
+        pending_ids = [t.id for t in pending]
+        done_ids = [t.id for t in sorted(done, key=lambda t: (t.completed_at, t.id), reverse=True)]
+
+    ids = [int(i) for i in TODO_ID.findall(admin.get('/admin').get_data(as_text=True))]
+    assert [i for i in ids if i in pending_ids] == pending_ids
+    assert [i for i in ids if i in done_ids] == done_ids
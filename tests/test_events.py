@@ -0,0 +1,50 @@
+import re
+from models import db, TodoEvent
+from events import todo_events
+from jobs import utcnow
+
+EVENT_ID = re.compile(r'^id: (.+)$', re.MULTILINE)
+
+
+def _add_event(event_id, payload):
+    db.session.add(TodoEvent(id=event_id, created_at=utcnow(), payload=payload))
+    db.session.commit()
+
+
+def _ids(after, gaps=()):
+    text = ''.join(todo_events.stream(after, hold=False, gaps=gaps))
+    return EVENT_ID.findall(text), text
+
+
+def test_event_committed_out_of_order_is_still_delivered(app):
+    with app.app_context():
+        start = todo_events.latest_id()
+        # start + 1 was handed out first but commits after start + 2
+        _add_event(start + 2, '["second"]')
+        ids, text = _ids(start)
+        assert ids == [f'{start + 2}:{start + 1}']
+        assert '["second"]' in text
+
+        _add_event(start + 1, '["first"]')
+        after, gaps = todo_events.parse_cursor(ids[-1])
+        ids, text = _ids(after, gaps)
+        assert ids == [f'{start + 2}']
+        assert '["first"]' in text and '["second"]' not in text
+
+
+def test_gaps_are_given_up_after_the_window(app):
+    with app.app_context():
+        start = todo_events.latest_id()
+        _add_event(start + 2, '[]')
+        _add_event(start + 2 + todo_events.gap_window, '[]')
+        ids, _ = _ids(start)
+        after, gaps = todo_events.parse_cursor(ids[-1])
+        assert after == start + 2 + todo_events.gap_window
+        assert min(gaps) == start + 3  # start + 1 is too far behind to wait for
+
+
+def test_cursor_parsing():
+    assert todo_events.parse_cursor('12') == (12, set())
+    assert todo_events.parse_cursor('12:10,11') == (12, {10, 11})
+    assert todo_events.parse_cursor('') is None
+    assert todo_events.parse_cursor('abc') is None
@@ -0,0 +1,19 @@
+import os
+from cache import page_cache
+from freeze import export_site
+from media import media_store
+
+
+def test_project_export_copies_new_media(app, tmp_path):
+    settings = (app.config['PAGE_CACHE_ENABLED'], app.config['LISTING_PAGE_SIZE'], page_cache.enabled)
+    name = 'feedfacefeedfacefeedfacefeedface-320.webp'
+    with open(os.path.join(media_store.variants_dir, name), 'wb') as f:
+        f.write(b'RIFF0000WEBP')
+
+    export_site(app, str(tmp_path), ['project'])
+
+    assert (tmp_path / 'media' / name).read_bytes() == b'RIFF0000WEBP'
+    assert (tmp_path / 'projects' / 'index.html').exists()
+    # Caching and page size are only switched off for the export
+    assert (app.config['PAGE_CACHE_ENABLED'], app.config['LISTING_PAGE_SIZE'],
+            page_cache.enabled) == settings
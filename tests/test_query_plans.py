@@ -0,0 +1,14 @@
+from models import db
+from query_plans import HOT_QUERIES, check_query_plans
+from seed import seed_database
+
+
+def test_hot_queries_use_indexes_on_seeded_data(app):
+    with app.app_context():
+        seed_database(app.root_path)
+        report = check_query_plans()
+        db.session.rollback()
+
+    assert set(report) == set(HOT_QUERIES)
+    problems = {name: found for name, (plan, found) in report.items() if found}
+    assert problems == {}
@@ -0,0 +1,47 @@
+import re
+from contextlib import contextmanager
+from sqlalchemy import event
+from cache import page_cache
+from models import db, bootstrap_schema, SCHEMA_VERSION
+
+SCHEMA_STATEMENT = re.compile(r'^\s*(PRAGMA\s+(main\.)?table_|CREATE\s|ALTER\s|DROP\s)|sqlite_master|information_schema|pg_catalog',
+                              re.IGNORECASE)
+WARM_PATHS = ('/', '/projects', '/skills', '/certificates', '/about', '/search?q=data')
+
+
+@contextmanager
+def _statements(app):
+    seen = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        seen.append(statement)
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, 'before_cursor_execute', record)
+    try:
+        yield seen
+    finally:
+        event.remove(engine, 'before_cursor_execute', record)
+
+
+def test_warm_requests_issue_no_schema_queries(app, client, monkeypatch):
+    # Rendered pages would come from the page cache without any SQL at all
+    monkeypatch.setattr(page_cache, 'enabled', False)
+    for path in WARM_PATHS:
+        client.get(path)
+
+    with _statements(app) as seen:
+        for _ in range(3):
+            for path in WARM_PATHS:
+                assert client.get(path).status_code == 200
+
+    assert seen, 'the pages should still query their content'
+    assert [s for s in seen if SCHEMA_STATEMENT.search(s)] == []
+
+
+def test_current_schema_is_checked_with_one_select(app):
+    with app.app_context():
+        with _statements(app) as seen:
+            assert bootstrap_schema() == SCHEMA_VERSION
+    assert len(seen) == 1 and 'schema_info' in seen[0]
@@ -0,0 +1,42 @@
+import json
+from models import db, Certificate
+from search import rebuild_search_index, search
+
+JSON = {'Accept': 'application/json'}
+
+
+def test_api_search_limit_is_clamped(app, client):
+    with app.app_context():
+        db.session.add_all(Certificate(title=f'Quokka course {i}', provider='Test') for i in range(60))
+        db.session.commit()
+        rebuild_search_index()
+        db.session.commit()
+
+    def count(limit):
+        r = client.get(f'/api/search?q=quokka&limit={limit}')
+        return len([json.loads(line) for line in r.data.splitlines() if line.strip()])
+
+    assert count(5) == 5
+    assert count(500) == 50
+    assert count(-1) == 1
+    assert count(0) == 1
+
+
+def test_admin_project_changes_reach_the_index_without_a_rebuild(app, admin):
+    # The after_flush hook keeps search_document current on every ORM write
+    def found(query):
+        with app.app_context():
+            return [hit['id'] for hit in search(query, kinds=('project',))]
+
+    r = admin.post('/admin/add/project', headers=JSON,
+                   data={'title': 'Wombat tracker', 'role': 'Dev', 'tech': 'Python', 'description': 'x'})
+    project_id = r.get_json()['changes'][0]['id']
+    assert found('wombat') == [project_id]
+
+    admin.post(f'/admin/edit/project/{project_id}', headers=JSON,
+               data={'title': 'Numbat tracker', 'role': 'Dev', 'tech': 'Python', 'description': 'x'})
+    assert found('wombat') == []
+    assert found('numbat') == [project_id]
+
+    admin.post(f'/admin/delete/project/{project_id}', headers=JSON)
+    assert found('numbat') == []
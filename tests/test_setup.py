@@ -0,0 +1,12 @@
+import app as portfolio
+
+
+def test_create_app_builds_a_separate_app_with_every_route(app):
+    other = portfolio.create_app()
+
+    assert other is not app
+    rules = {(rule.rule, rule.endpoint) for rule in app.url_map.iter_rules()}
+    assert {(rule.rule, rule.endpoint) for rule in other.url_map.iter_rules()} == rules
+    assert 'import-data' in other.cli.commands
+    assert 'duration' in other.jinja_env.filters
+    assert other.test_client().get('/admin/login').status_code == 200
@@ -0,0 +1,96 @@
+import random
+import threading
+import time
+from models import db, Todo, TodoDailyStat
+
+JSON = {'Accept': 'application/json'}
+
+
+def _reset_todos(app, count):
+    with app.app_context():
+        TodoDailyStat.query.delete()
+        Todo.query.delete()
+        db.session.add_all(Todo(task=f'Task {i}', category='Test') for i in range(count))
+        db.session.commit()
+        first = Todo.query.order_by(Todo.id).first()
+        first.status = 'Active'
+        db.session.commit()
+        return [t.id for t in Todo.query.order_by(Todo.id)]
+
+
+def _statuses(app):
+    with app.app_context():
+        return dict(db.session.query(Todo.id, Todo.status).all())
+
+
+def test_concurrent_transitions_leave_one_active_task(app):
+    ids = _reset_todos(app, 200)
+    threads, steps = 8, 25
+    errors, seen_active = [], []
+    done = threading.Event()
+
+    def worker(seed):
+        rng = random.Random(seed)
+        client = app.test_client()
+        client.post('/admin/login', data={'password': 'test-password'})
+        for _ in range(steps):
+            action = rng.choice(('activate', 'complete', 'bulk'))
+            if action == 'activate':
+                r = client.post(f'/admin/todo/set_active/{rng.choice(ids)}', headers=JSON)
+            elif action == 'complete':
+                r = client.post(f'/admin/todo/set_complete/{rng.choice(ids)}', headers=JSON)
+            else:
+                r = client.post('/admin/todo/bulk', json={'transitions': [
+                    {'id': rng.choice(ids), 'action': 'activate'},
+                    {'id': rng.choice(ids), 'action': 'complete'},
+                ]})
+            if r.status_code >= 500:
+                errors.append((action, r.status_code))
+
+    def watcher():
+        # The Active slot must never hold two tasks, even mid-run
+        while not done.is_set():
+            seen_active.append(sum(s == 'Active' for s in _statuses(app).values()))
+            time.sleep(0.01)
+
+    workers = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+    check = threading.Thread(target=watcher)
+    check.start()
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    done.set()
+    check.join()
+
+    statuses = _statuses(app)
+    assert not errors
+    assert max(seen_active) <= 1
+    assert list(statuses.values()).count('Active') == 1
+
+
+def test_activating_a_done_task_from_the_edit_form_reopens_it(app, admin):
+    ids = _reset_todos(app, 3)
+    admin.post(f'/admin/todo/set_complete/{ids[1]}', headers=JSON)
+    assert _statuses(app)[ids[1]] == 'Done'
+
+    r = admin.post(f'/admin/edit/todo/{ids[1]}', headers=JSON,
+                   data={'task': 'Task 1', 'category': 'Test', 'status': 'Active'})
+
+    assert r.status_code == 200
+    statuses = _statuses(app)
+    assert statuses[ids[1]] == 'Active'
+    assert list(statuses.values()).count('Active') == 1
+    with app.app_context():
+        assert db.session.get(Todo, ids[1]).completed_at is None
+
+
+def test_activating_a_done_task_demotes_nothing(app, admin):
+    ids = _reset_todos(app, 3)
+    admin.post(f'/admin/todo/set_complete/{ids[0]}', headers=JSON)
+    active = [i for i, s in _statuses(app).items() if s == 'Active']
+
+    r = admin.post('/admin/todo/bulk', json={'transitions': [{'id': ids[0], 'action': 'activate'}]})
+
+    assert r.get_json()['results'][0]['applied'] is False
+    assert [i for i, s in _statuses(app).items() if s == 'Active'] == active